@@ -1,11 +1,15 @@
 """Analytics modules for financial data analysis."""
 
-from src.analytics.cash_flow import CashFlowAnalytics
-from src.analytics.categories import CategoryAnalytics
-from src.analytics.goals import GoalAnalytics
-from src.analytics.institutions import InstitutionAnalytics
-from src.analytics.network import NetworkAnalytics
-from src.analytics.health_score import HealthScoreAnalytics
+import importlib
+
+_EXPORTS = {
+    'CashFlowAnalytics': '.cash_flow',
+    'CategoryAnalytics': '.categories',
+    'GoalAnalytics': '.goals',
+    'InstitutionAnalytics': '.institutions',
+    'NetworkAnalytics': '.network',
+    'HealthScoreAnalytics': '.health_score',
+}
 
 __all__ = [
     'CashFlowAnalytics',
@@ -15,3 +19,16 @@ __all__ = [
     'NetworkAnalytics',
     'HealthScoreAnalytics',
 ]
+
+
+def __getattr__(name):
+    # Import submodules on first access so loading one does not pull in the rest
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value  # Later lookups bypass __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
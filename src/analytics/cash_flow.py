@@ -7,7 +7,8 @@ net cash flow, burn rate, savings rate, and trend analysis.
 import logging
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-from collections import defaultdict
+from itertools import groupby
+from operator import attrgetter
 
 from ..data.dynamodb_client import DynamoDBClient
 from ..data.data_models import Transaction, Institution
@@ -72,15 +73,16 @@ class CashFlowAnalytics:
         deposits = [t.amount for t in transactions if t.is_deposit]
         withdrawals = [t.amount for t in transactions if t.is_withdrawal]
         
-        # Overall metrics
-        net_flow = calculations.calculate_net_flow(deposits, withdrawals)
+        # Overall metrics, derived from one sum per side rather than re-summing
+        # the lists in calculate_net_flow/calculate_savings_rate/calculate_burn_rate
         total_deposits = sum(deposits)
         total_withdrawals = sum(withdrawals)
-        savings_rate = calculations.calculate_savings_rate(deposits, withdrawals)
+        net_flow = total_deposits - total_withdrawals
+        savings_rate = (net_flow / total_deposits) * 100 if total_deposits else 0.0
         
         # Time-based metrics
         days = date_utils.get_days_between(start_ts, end_ts)
-        burn_rate = calculations.calculate_burn_rate(withdrawals, days) if days > 0 else 0
+        burn_rate = total_withdrawals / days if days > 0 else 0
         
         # Group transactions by period
         grouped_data = self._group_transactions_by_period(transactions, group_by)
@@ -147,33 +149,36 @@ class CashFlowAnalytics:
         Returns:
             Dictionary mapping period keys to transaction data
         """
-        grouped = defaultdict(lambda: {'deposits': [], 'withdrawals': []})
-        
-        for txn in transactions:
-            # Determine period key
-            if period == 'day':
-                key = date_utils.format_date(txn.transaction_date, '%Y-%m-%d')
-            elif period == 'week':
-                key = date_utils.format_date(txn.transaction_date, '%Y-W%U')
-            else:  # month
-                key = date_utils.format_date(txn.transaction_date, '%Y-%m')
-            
-            # Add to appropriate list
-            if txn.is_deposit:
-                grouped[key]['deposits'].append(txn.amount)
-            else:
-                grouped[key]['withdrawals'].append(txn.amount)
+        if period == 'day':
+            key_format = '%Y-%m-%d'
+        elif period == 'week':
+            key_format = '%Y-W%U'
+        else:  # month
+            key_format = '%Y-%m'
+        
+        # Period keys increase monotonically with the date, so after one sort every
+        # period is a contiguous run that groupby can split without hashing each txn.
+        ordered = sorted(transactions, key=attrgetter('transaction_date'))
         
-        # Calculate totals for each period
         result = {}
-        for period_key, data in sorted(grouped.items()):
-            deposits = data['deposits']
-            withdrawals = data['withdrawals']
+        for period_key, period_txns in groupby(
+            ordered,
+            key=lambda txn: date_utils.format_date(txn.transaction_date, key_format)
+        ):
+            deposits = []
+            withdrawals = []
+            for txn in period_txns:
+                if txn.is_deposit:
+                    deposits.append(txn.amount)
+                else:
+                    withdrawals.append(txn.amount)
             
+            total_deposits = sum(deposits)
+            total_withdrawals = sum(withdrawals)
             result[period_key] = {
-                'total_deposits': sum(deposits),
-                'total_withdrawals': sum(withdrawals),
-                'net_flow': calculations.calculate_net_flow(deposits, withdrawals),
+                'total_deposits': total_deposits,
+                'total_withdrawals': total_withdrawals,
+                'net_flow': total_deposits - total_withdrawals,
                 'transaction_count': len(deposits) + len(withdrawals),
                 'deposit_count': len(deposits),
                 'withdrawal_count': len(withdrawals)
@@ -10,7 +10,7 @@ from collections import defaultdict
 
 from ..data.dynamodb_client import DynamoDBClient
 from ..data.data_models import Transaction
-from ..utils import date_utils, calculations, constants
+from ..utils import date_utils, constants
 
 
 logger = logging.getLogger(__name__)
@@ -71,13 +71,8 @@ class CategoryAnalytics:
             logger.warning(f"Insufficient transactions for analysis: {len(transactions)}")
             return self._generate_empty_response(start_date, end_date)
         
-        # Group transactions by category
-        category_groups = self._group_by_categories(transactions)
-        
-        # Calculate category metrics
-        category_totals = self._calculate_category_totals(category_groups)
-        category_counts = self._calculate_category_counts(category_groups)
-        category_averages = self._calculate_category_averages(category_groups)
+        # Calculate category metrics in one pass (no per-category transaction lists)
+        category_totals, category_counts, category_averages = self._summarize_categories(transactions)
         
         # Find top categories
         top_categories = self._get_top_categories(category_totals, category_counts, limit=constants.MAX_CATEGORIES_DISPLAY)
@@ -124,46 +119,33 @@ class CategoryAnalytics:
         logger.info(f"Category analysis complete: {len(category_totals)} unique categories found")
         return result
     
-    def _group_by_categories(self, transactions: List[Transaction]) -> Dict[str, List[Transaction]]:
+    def _summarize_categories(
+        self,
+        transactions: List[Transaction]
+    ) -> Tuple[Dict[str, float], Dict[str, int], Dict[str, float]]:
         """
-        Group transactions by their tags/categories.
+        Total, count and average transaction amounts per tag in a single pass.
+        
+        Untagged transactions count towards 'uncategorized'; a transaction
+        with several tags counts towards each of them.
         
         Args:
             transactions: List of transactions
             
         Returns:
-            Dictionary mapping category names to transaction lists
+            Tuple of (totals, counts, averages) keyed by category
         """
-        grouped = defaultdict(list)
+        totals = defaultdict(float)
+        counts = defaultdict(int)
         
         for txn in transactions:
-            if not txn.tags or len(txn.tags) == 0:
-                grouped['uncategorized'].append(txn)
-            else:
-                for tag in txn.tags:
-                    grouped[tag].append(txn)
+            amount = txn.amount
+            for tag in txn.tags or ('uncategorized',):
+                totals[tag] += amount
+                counts[tag] += 1
         
-        return dict(grouped)
-    
-    def _calculate_category_totals(self, category_groups: Dict[str, List[Transaction]]) -> Dict[str, float]:
-        """Calculate total amount per category."""
-        totals = {}
-        for category, transactions in category_groups.items():
-            totals[category] = sum(t.amount for t in transactions)
-        return totals
-    
-    def _calculate_category_counts(self, category_groups: Dict[str, List[Transaction]]) -> Dict[str, int]:
-        """Calculate transaction count per category."""
-        return {category: len(transactions) for category, transactions in category_groups.items()}
-    
-    def _calculate_category_averages(self, category_groups: Dict[str, List[Transaction]]) -> Dict[str, float]:
-        """Calculate average transaction amount per category."""
-        averages = {}
-        for category, transactions in category_groups.items():
-            if transactions:
-                amounts = [t.amount for t in transactions]
-                averages[category] = calculations.calculate_average(amounts)
-        return averages
+        averages = {category: total / counts[category] for category, total in totals.items()}
+        return dict(totals), dict(counts), averages
     
     def _get_top_categories(self, category_totals: Dict[str, float], category_counts: Dict[str, int] = None, limit: int = 10) -> List[Dict]:
         """
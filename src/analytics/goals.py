@@ -5,6 +5,7 @@ and provides insights on goal achievement strategies.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -40,9 +41,11 @@ class GoalAnalytics:
         """
         logger.info(f"Analyzing goals for user {user_id}")
         
-        # Fetch goals and institutions
-        goals = self.db_client.get_goals(user_id)
-        institutions = self.db_client.get_institutions(user_id)
+        # Fetch goals and institutions; the queries are independent, so overlap them
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            institutions_future = executor.submit(self.db_client.get_institutions, user_id)
+            goals = self.db_client.get_goals(user_id)
+            institutions = institutions_future.result()
         
         if not goals:
             logger.warning(f"No goals found for user {user_id}")
@@ -11,6 +11,7 @@ Computes a composite financial health score (0-100) based on multiple dimensions
 Designed to work with raw data via shared utility calculations.
 """
 
+from collections import defaultdict
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import statistics
@@ -20,11 +21,7 @@ from src.utils.constants import (
     HEALTH_SCORE_GOOD,
     HEALTH_SCORE_FAIR,
     HEALTH_SCORE_POOR,
-    HEALTH_WEIGHT_SAVINGS_RATE,
-    HEALTH_WEIGHT_GOAL_PROGRESS,
-    HEALTH_WEIGHT_SPENDING_DIVERSITY,
-    HEALTH_WEIGHT_ACCOUNT_UTILIZATION,
-    HEALTH_WEIGHT_TRANSACTION_REGULARITY,
+    HEALTH_WEIGHTS,
 )
 from src.utils import calculations
 from src.data.data_models import Transaction, Institution, Goal
@@ -61,13 +58,9 @@ class HealthScoreAnalytics:
         utilization_score = self._calculate_utilization_score(institutions, transactions)
         regularity_score = self._calculate_regularity_score(transactions, period_days)
 
-        composite_score = (
-            savings_score * HEALTH_WEIGHT_SAVINGS_RATE +
-            goal_score * HEALTH_WEIGHT_GOAL_PROGRESS +
-            diversity_score * HEALTH_WEIGHT_SPENDING_DIVERSITY +
-            utilization_score * HEALTH_WEIGHT_ACCOUNT_UTILIZATION +
-            regularity_score * HEALTH_WEIGHT_TRANSACTION_REGULARITY
-        )
+        # Scores in HEALTH_WEIGHTS field order
+        scores = (savings_score, goal_score, diversity_score, utilization_score, regularity_score)
+        composite_score = sum(score * weight for score, weight in zip(scores, HEALTH_WEIGHTS))
 
         rating = self._get_health_rating(composite_score)
 
@@ -75,31 +68,12 @@ class HealthScoreAnalytics:
             'overall_score': round(composite_score, 2),
             'rating': rating,
             'components': {
-                'savings_rate': {
-                    'score': round(savings_score, 2),
-                    'weight': HEALTH_WEIGHT_SAVINGS_RATE,
-                    'contribution': round(savings_score * HEALTH_WEIGHT_SAVINGS_RATE, 2)
-                },
-                'goal_progress': {
-                    'score': round(goal_score, 2),
-                    'weight': HEALTH_WEIGHT_GOAL_PROGRESS,
-                    'contribution': round(goal_score * HEALTH_WEIGHT_GOAL_PROGRESS, 2)
-                },
-                'spending_diversity': {
-                    'score': round(diversity_score, 2),
-                    'weight': HEALTH_WEIGHT_SPENDING_DIVERSITY,
-                    'contribution': round(diversity_score * HEALTH_WEIGHT_SPENDING_DIVERSITY, 2)
-                },
-                'account_utilization': {
-                    'score': round(utilization_score, 2),
-                    'weight': HEALTH_WEIGHT_ACCOUNT_UTILIZATION,
-                    'contribution': round(utilization_score * HEALTH_WEIGHT_ACCOUNT_UTILIZATION, 2)
-                },
-                'transaction_regularity': {
-                    'score': round(regularity_score, 2),
-                    'weight': HEALTH_WEIGHT_TRANSACTION_REGULARITY,
-                    'contribution': round(regularity_score * HEALTH_WEIGHT_TRANSACTION_REGULARITY, 2)
+                name: {
+                    'score': round(score, 2),
+                    'weight': weight,
+                    'contribution': round(score * weight, 2)
                 }
+                for name, score, weight in zip(HEALTH_WEIGHTS._fields, scores, HEALTH_WEIGHTS)
             },
             'period_days': period_days,
             'computed_at': datetime.now().isoformat()
@@ -233,10 +207,9 @@ class HealthScoreAnalytics:
 
         # Count transactions per day bucket (UNIX timestamp / seconds per day)
         SECONDS_PER_DAY = 86400
-        daily_counts: Dict[int, int] = {}
+        daily_counts: Dict[int, int] = defaultdict(int)
         for txn in sorted_txns:
-            day_key = txn.transaction_date // SECONDS_PER_DAY
-            daily_counts[day_key] = daily_counts.get(day_key, 0) + 1
+            daily_counts[txn.transaction_date // SECONDS_PER_DAY] += 1
 
         counts = list(daily_counts.values())
         if len(counts) < 2:
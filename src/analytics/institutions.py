@@ -4,13 +4,20 @@ Analyzes performance and utilization of financial institutions,
 comparing balances, growth rates, and transaction activity.
 """
 
+import copy
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
+from operator import itemgetter
+
+import numpy as np
 
 from ..data.dynamodb_client import DynamoDBClient
 from ..data.data_models import Institution, Transaction, Goal
 from ..utils import date_utils, calculations, constants
+from ..utils.cache import TTLCache
 
 
 logger = logging.getLogger(__name__)
@@ -27,36 +34,54 @@ class InstitutionAnalytics:
             db_client: DynamoDB client instance
         """
         self.db_client = db_client
+        self._analysis_cache = TTLCache(ttl=constants.INSTITUTION_ANALYSIS_CACHE_TTL_SECONDS)
+        # Instances are shared across concurrent requests, and TTLCache is not thread-safe
+        self._cache_lock = threading.Lock()
     
     def analyze(
         self,
         user_id: str,
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        include_goal_names: bool = True
     ) -> Dict:
         """
         Perform comprehensive institution analysis.
         
+        Results are cached for INSTITUTION_ANALYSIS_CACHE_TTL_SECONDS, or until
+        DynamoDBClient.invalidate_user() is called for the user.
+        
         Args:
             user_id: User ID from Cognito
             start_date: Start date for transaction analysis (optional)
             end_date: End date for transaction analysis (optional)
+            include_goal_names: Include each institution's linked goal names (default True).
+                Callers that only need counts and rankings can skip building them.
             
         Returns:
             Dictionary containing institution metrics and comparisons
         """
+        # Keyed on the user's data version so invalidate_user() expires results at once
+        data_version = self.db_client.user_data_version(user_id)
+        cache_key = (user_id, data_version, start_date, end_date, include_goal_names)
+        with self._cache_lock:
+            cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Returning cached institution analysis for user {user_id}")
+            return copy.deepcopy(cached)
+        
         logger.info(f"Analyzing institutions for user {user_id}")
         
-        # Fetch institutions
-        institutions = self.db_client.get_institutions(user_id)
+        # Fetch institutions, overlapping the goals query used for allocation analysis
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            goals_future = executor.submit(self.db_client.get_goals, user_id)
+            institutions = self.db_client.get_institutions(user_id)
+            goals = goals_future.result()
         
         if not institutions:
             logger.warning(f"No institutions found for user {user_id}")
             return self._generate_empty_response()
         
-        # Fetch goals for allocation analysis
-        goals = self.db_client.get_goals(user_id)
-        
         # Convert dates if provided
         start_ts = date_utils.iso_to_timestamp(start_date) if start_date else None
         end_ts = date_utils.iso_to_timestamp(end_date) if end_date else None
@@ -71,21 +96,26 @@ class InstitutionAnalytics:
                 inst, 
                 goals, 
                 start_ts, 
-                end_ts
+                end_ts,
+                include_goal_names=include_goal_names
             )
             institution_details.append(details)
             total_balance += inst.current_balance
             total_starting_balance += inst.starting_balance
         
-        # Calculate rankings
-        rankings = self._calculate_rankings(institution_details)
+        if len(institutions) == 1:
+            # Single-institution portfolios have trivial rankings and concentration
+            rankings, portfolio = self._single_institution_metrics(institutions[0], institution_details[0])
+        else:
+            # Calculate rankings
+            rankings = self._calculate_rankings(institution_details)
+            
+            # Calculate portfolio metrics
+            portfolio = self._calculate_portfolio_metrics(institutions, institution_details)
         
         # Identify underutilized institutions
         underutilized = self._identify_underutilized(institution_details)
         
-        # Calculate portfolio metrics
-        portfolio = self._calculate_portfolio_metrics(institutions, institution_details)
-        
         result = {
             'user_id': user_id,
             'analysis_period': {
@@ -106,14 +136,23 @@ class InstitutionAnalytics:
         }
         
         logger.info(f"Institution analysis complete: {len(institutions)} institutions analyzed")
+        snapshot = copy.deepcopy(result)
+        with self._cache_lock:
+            self._analysis_cache.set(cache_key, snapshot)
         return result
     
+    def clear_cache(self) -> None:
+        """Discard cached analyze() results, e.g. after the user's data changes."""
+        with self._cache_lock:
+            self._analysis_cache.clear()
+    
     def _analyze_single_institution(
         self,
         institution: Institution,
         goals: List[Goal],
         start_ts: Optional[int] = None,
-        end_ts: Optional[int] = None
+        end_ts: Optional[int] = None,
+        include_goal_names: bool = True
     ) -> Dict:
         """
         Analyze a single institution in detail.
@@ -123,57 +162,81 @@ class InstitutionAnalytics:
             goals: List of all goals
             start_ts: Start timestamp for transactions (optional)
             end_ts: End timestamp for transactions (optional)
+            include_goal_names: Include 'linked_goal_names' in the goals section
             
         Returns:
             Dictionary with institution analysis
         """
-        # Fetch transactions for this institution
-        transactions = self.db_client.get_transactions(
-            institution_id=institution.institution_id,
+        institution_id = institution.institution_id
+        
+        # Fetch this institution's transactions as columns; only type, amount
+        # and date are read, so no Transaction objects are built
+        columns = self.db_client.get_transaction_columns(
+            institution_id=institution_id,
             start_date=start_ts,
             end_date=end_ts
         )
+        types = columns['type']
+        amounts = columns['amount']
+        dates = columns['transaction_date']
+        transaction_count = len(amounts)
+        
+        # Calculate transaction metrics and date bounds over whole columns
+        is_deposit = types == constants.TRANSACTION_DEPOSIT
+        is_withdrawal = types == constants.TRANSACTION_WITHDRAWAL
+        deposit_count = int(np.count_nonzero(is_deposit))
+        withdrawal_count = int(np.count_nonzero(is_withdrawal))
+        total_deposits = float(amounts[is_deposit].sum())
+        total_withdrawals = float(amounts[is_withdrawal].sum())
         
-        # Calculate transaction metrics
-        deposits = [t for t in transactions if t.is_deposit]
-        withdrawals = [t for t in transactions if t.is_withdrawal]
-        
-        total_deposits = sum(t.amount for t in deposits)
-        total_withdrawals = sum(t.amount for t in withdrawals)
         net_flow = total_deposits - total_withdrawals
         
         # Calculate transaction frequency
-        if transactions:
-            first_txn_date = min(t.transaction_date for t in transactions)
-            last_txn_date = max(t.transaction_date for t in transactions)
-            days_span = date_utils.get_days_between(first_txn_date, last_txn_date)
-            avg_transactions_per_month = (len(transactions) / max(days_span, 1)) * 30 if days_span > 0 else 0
+        if transaction_count:
+            first_txn_date = int(dates.min())
+            last_txn_date = int(dates.max())
+            # transaction_date is already a UNIX timestamp, so the span is plain integer arithmetic
+            days_span = (last_txn_date - first_txn_date) // constants.SECONDS_PER_DAY
+            avg_transactions_per_month = (transaction_count / days_span) * 30 if days_span > 0 else 0
         else:
-            avg_transactions_per_month = 0
             first_txn_date = None
             last_txn_date = None
+            avg_transactions_per_month = 0
         
         # Calculate growth metrics
         balance_change = institution.balance_change
         growth_rate = institution.growth_rate
         
         # Calculate goal allocation
-        linked_goals = [g for g in goals if institution.institution_id in g.linked_institutions]
-        total_allocated_to_goals = sum(
-            g.linked_institutions.get(institution.institution_id, 0)
-            for g in linked_goals
-        )
+        # Each linked goal is guaranteed to hold institution_id, so read its percent directly
+        linked_goal_count = 0
+        linked_goal_names = [] if include_goal_names else None
+        total_allocated_to_goals = 0
+        for g in goals:
+            linked = g.linked_institutions
+            if institution_id in linked:
+                linked_goal_count += 1
+                total_allocated_to_goals += linked[institution_id]
+                if linked_goal_names is not None:
+                    linked_goal_names.append(g.name)
         
         # Calculate utilization score (0-100)
         utilization_score = self._calculate_utilization_score(
             institution,
-            len(transactions),
+            transaction_count,
             total_allocated_to_goals,
-            len(linked_goals)
+            linked_goal_count
         )
         
+        goals_section = {
+            'linked_count': linked_goal_count,
+            'total_allocated_percent': total_allocated_to_goals
+        }
+        if linked_goal_names is not None:
+            goals_section['linked_goal_names'] = linked_goal_names
+        
         return {
-            'institution_id': institution.institution_id,
+            'institution_id': institution_id,
             'institution_name': institution.institution_name,
             'balances': {
                 'starting': round(institution.starting_balance, 2),
@@ -182,9 +245,9 @@ class InstitutionAnalytics:
                 'growth_rate': round(growth_rate, 2)
             },
             'transactions': {
-                'total_count': len(transactions),
-                'deposit_count': len(deposits),
-                'withdrawal_count': len(withdrawals),
+                'total_count': transaction_count,
+                'deposit_count': deposit_count,
+                'withdrawal_count': withdrawal_count,
                 'total_deposits': round(total_deposits, 2),
                 'total_withdrawals': round(total_withdrawals, 2),
                 'net_flow': round(net_flow, 2),
@@ -192,11 +255,7 @@ class InstitutionAnalytics:
                 'first_transaction_date': date_utils.timestamp_to_iso(first_txn_date) if first_txn_date else None,
                 'last_transaction_date': date_utils.timestamp_to_iso(last_txn_date) if last_txn_date else None
             },
-            'goals': {
-                'linked_count': len(linked_goals),
-                'total_allocated_percent': total_allocated_to_goals,
-                'linked_goal_names': [g.name for g in linked_goals]
-            },
+            'goals': goals_section,
             'metrics': {
                 'utilization_score': utilization_score,
                 'activity_level': self._categorize_activity_level(avg_transactions_per_month)
@@ -262,67 +321,34 @@ class InstitutionAnalytics:
         Returns:
             Dictionary with ranked lists
         """
-        # Sort by balance
-        by_balance = sorted(
-            institution_details,
-            key=lambda x: x['balances']['current'],
-            reverse=True
-        )
-        
-        # Sort by growth rate
-        by_growth = sorted(
-            institution_details,
-            key=lambda x: x['balances']['growth_rate'],
-            reverse=True
-        )
-        
-        # Sort by transaction volume
-        by_activity = sorted(
-            institution_details,
-            key=lambda x: x['transactions']['total_count'],
-            reverse=True
-        )
-        
-        # Sort by utilization
-        by_utilization = sorted(
-            institution_details,
-            key=lambda x: x['metrics']['utilization_score'],
-            reverse=True
-        )
+        # Flatten the nested metrics once so each sort can use a C-level key
+        metric_rows = [
+            (
+                inst['institution_name'],
+                inst['balances']['current'],
+                inst['balances']['growth_rate'],
+                inst['transactions']['total_count'],
+                inst['metrics']['utilization_score']
+            )
+            for inst in institution_details
+        ]
         
-        return {
-            'by_balance': [
-                {
-                    'rank': i + 1,
-                    'institution_name': inst['institution_name'],
-                    'value': inst['balances']['current']
-                }
-                for i, inst in enumerate(by_balance)
-            ],
-            'by_growth_rate': [
-                {
-                    'rank': i + 1,
-                    'institution_name': inst['institution_name'],
-                    'value': inst['balances']['growth_rate']
-                }
-                for i, inst in enumerate(by_growth)
-            ],
-            'by_activity': [
+        def ranked(column: int) -> List[Dict]:
+            ordered = sorted(metric_rows, key=itemgetter(column), reverse=True)
+            return [
                 {
                     'rank': i + 1,
-                    'institution_name': inst['institution_name'],
-                    'value': inst['transactions']['total_count']
+                    'institution_name': row[0],
+                    'value': row[column]
                 }
-                for i, inst in enumerate(by_activity)
-            ],
-            'by_utilization': [
-                {
-                    'rank': i + 1,
-                    'institution_name': inst['institution_name'],
-                    'value': inst['metrics']['utilization_score']
-                }
-                for i, inst in enumerate(by_utilization)
+                for i, row in enumerate(ordered)
             ]
+        
+        return {
+            'by_balance': ranked(1),
+            'by_growth_rate': ranked(2),
+            'by_activity': ranked(3),
+            'by_utilization': ranked(4)
         }
     
     def _identify_underutilized(self, institution_details: List[Dict]) -> List[Dict]:
@@ -366,7 +392,7 @@ class InstitutionAnalytics:
                 })
         
         # Sort by utilization score (lowest first)
-        underutilized.sort(key=lambda x: x['utilization_score'])
+        underutilized.sort(key=itemgetter('utilization_score'))
         
         return underutilized
     
@@ -428,10 +454,66 @@ class InstitutionAnalytics:
             },
             'performance': {
                 'average_growth_rate': round(avg_growth_rate, 2),
-                'best_performer': max(institution_details, key=lambda x: x['balances']['growth_rate'])['institution_name'] if institution_details else None,
-                'worst_performer': min(institution_details, key=lambda x: x['balances']['growth_rate'])['institution_name'] if institution_details else None
+                'best_performer': institution_details[growth_rates.index(max(growth_rates))]['institution_name'] if institution_details else None,
+                'worst_performer': institution_details[growth_rates.index(min(growth_rates))]['institution_name'] if institution_details else None
+            }
+        }
+    
+    def _single_institution_metrics(self, institution: Institution, details: Dict) -> Tuple[Dict, Dict]:
+        """
+        Build rankings and portfolio metrics for a user with exactly one institution.
+        
+        Produces the same output as _calculate_rankings and
+        _calculate_portfolio_metrics without sorting or scanning.
+        
+        Args:
+            institution: The user's only Institution object
+            details: Institution detail dictionary for that institution
+            
+        Returns:
+            Tuple of (rankings, portfolio)
+        """
+        name = details['institution_name']
+        growth_rate = details['balances']['growth_rate']
+        
+        rankings = {
+            key: [{'rank': 1, 'institution_name': name, 'value': value}]
+            for key, value in (
+                ('by_balance', details['balances']['current']),
+                ('by_growth_rate', growth_rate),
+                ('by_activity', details['transactions']['total_count']),
+                ('by_utilization', details['metrics']['utilization_score'])
+            )
+        }
+        
+        if institution.current_balance > 0:
+            percent = 100.0
+            hhi = 1.0
+            concentration_level = 'Highly concentrated'
+        else:
+            percent = 0
+            hhi = 0
+            concentration_level = 'No balance'
+        
+        portfolio = {
+            'distribution': [{
+                'institution_name': institution.institution_name,
+                'balance': round(institution.current_balance, 2),
+                'percent': round(percent, 2)
+            }],
+            'concentration': {
+                'hhi': round(hhi, 4),
+                'level': concentration_level,
+                'recommendation': 'Consider diversifying' if hhi > 0.5 else 'Well diversified'
+            },
+            'performance': {
+                'average_growth_rate': round(growth_rate, 2),
+                'best_performer': name,
+                'worst_performer': name
             }
         }
+        
+        return rankings, portfolio
     
     def compare_institutions(
         self,
@@ -1,25 +1,97 @@
-"""Network analysis module using NetworkX for relationship analytics."""
+"""Network analysis module using NetworkX for relationship analytics.
 
-from typing import List, Dict, Any, Tuple, Set
+Graphs are always built with NetworkX. Centrality and community metrics can
+optionally be computed by python-igraph (C core) by setting
+``NETWORK_BACKEND=igraph``; NetworkX is used when igraph is not installed.
+"""
+
+import copy
+import hashlib
+import heapq
+import logging
+import os
+import random
+import threading
+from typing import List, Dict, Any, Callable, Optional, Tuple, Set
 from datetime import datetime
 import networkx as nx
-from collections import defaultdict
+from networkx.utils import UnionFind
+from collections import Counter, defaultdict
+from itertools import combinations
+from operator import itemgetter
+
+try:
+    import igraph
+except ImportError:  # Optional compiled backend
+    igraph = None
 
 from ..data.data_models import Transaction, Institution, Goal
-from ..utils import date_utils
+from ..utils import date_utils, constants
+from ..utils.cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+# Sort key for (node, value) pairs
+_NODE_VALUE = itemgetter(1)
+
+# igraph's random number generator is process-wide; held while it is seeded
+_IGRAPH_RNG_LOCK = threading.Lock()
+
+# analyze() payload for a graph with no nodes (user_id/graph_type/period added per call)
+_EMPTY_GRAPH_RESULT = {
+    'graph_stats': {
+        'nodes': 0,
+        'edges': 0,
+        'density': 0.0,
+        'is_connected': False,
+        'num_components': 0
+    },
+    'nodes': [],
+    'edges': [],
+    'centrality': {
+        'degree_centrality': {},
+        'betweenness_centrality': {},
+        'closeness_centrality': {},
+        'pagerank': {}
+    },
+    'communities': {
+        'num_communities': 0,
+        'communities': [],
+        'modularity': 0.0
+    }
+}
+
+
+def _get_network_backend() -> str:
+    """Get the configured graph metrics backend from env variable."""
+    return os.environ.get('NETWORK_BACKEND', constants.NETWORK_BACKEND_NETWORKX).lower()
 
 
 class NetworkAnalytics:
     """Analyze relationships between financial entities using graph theory."""
     
-    def __init__(self, db_client):
+    def __init__(self, db_client, backend: Optional[str] = None):
         """
         Initialize network analytics.
         
         Args:
             db_client: DynamoDB client for data access
+            backend: Metrics backend ('networkx' or 'igraph'). Defaults to the
+                NETWORK_BACKEND environment variable, then 'networkx'.
         """
         self.db_client = db_client
+        
+        backend = (backend or _get_network_backend()).lower()
+        if backend not in constants.NETWORK_BACKENDS:
+            raise ValueError(f"Unknown network backend: {backend}")
+        if backend == constants.NETWORK_BACKEND_IGRAPH and igraph is None:
+            logger.warning("NETWORK_BACKEND=igraph requested but python-igraph is not installed; using networkx")
+            backend = constants.NETWORK_BACKEND_NETWORKX
+        self.backend = backend
+        self._metrics_cache = TTLCache()
+        # One instance serves concurrent requests, and TTLCache is not thread-safe
+        self._metrics_lock = threading.Lock()
     
     def analyze(
         self,
@@ -48,46 +120,60 @@ class NetworkAnalytics:
         Returns:
             Dictionary containing graph analysis results
         """
-        institutions = self.db_client.get_institutions(user_id)
-        goals = self.db_client.get_goals(user_id)
-
         if graph_type == 'goal_institution':
             # Fetch ALL transactions — no date filter — so inactive goals whose
             # completion transactions fall outside any requested window are still
             # linked to their institutions.
-            all_transactions = self.db_client.get_all_user_transactions(user_id)
-            graph = self.build_goal_institution_graph(institutions, goals, all_transactions)
+            start_ts = end_ts = None
         elif graph_type in ('financial_flow', 'tag_network'):
             start_ts = date_utils.iso_to_timestamp(start_date)
             end_ts = date_utils.iso_to_timestamp(end_date)
-            transactions = self.db_client.get_all_user_transactions(
-                user_id, start_ts, end_ts
-            )
-            if graph_type == 'financial_flow':
-                graph = self.build_financial_flow_graph(transactions, institutions, goals)
-            else:
-                graph = self.build_tag_network(transactions)
         else:
             raise ValueError(f"Unknown graph_type: {graph_type}")
 
-        # Calculate metrics
-        centrality = self.calculate_centrality_metrics(graph)
-        communities = self.detect_communities(graph)
+        # One call overlaps the reads without querying the Institutions table twice
+        institutions, transactions, goals = self.db_client.get_user_financials(user_id, start_ts, end_ts)
 
-        result = {
-            'user_id': user_id,
-            'graph_type': graph_type,
-            'graph_stats': {
-                'nodes': graph.number_of_nodes(),
-                'edges': graph.number_of_edges(),
-                'density': nx.density(graph) if graph.number_of_nodes() > 1 else 0.0,
-                'is_connected': nx.is_connected(graph.to_undirected()) if graph.number_of_nodes() > 0 else False
-            },
-            'nodes': self._serialize_nodes(graph),
-            'edges': self._serialize_edges(graph),
-            'centrality': centrality,
-            'communities': communities,
-        }
+        if graph_type == 'goal_institution':
+            graph = self.build_goal_institution_graph(
+                institutions, goals, transactions, self._inactive_goals(goals)
+            )
+        elif graph_type == 'financial_flow':
+            graph = self.build_financial_flow_graph(
+                transactions, institutions, goals, self._inactive_goals(goals)
+            )
+        else:
+            graph = self.build_tag_network(transactions)
+
+        if graph.number_of_nodes() == 0:
+            # New user or empty period: nothing to measure or serialize
+            result = {
+                'user_id': user_id,
+                'graph_type': graph_type,
+                **copy.deepcopy(_EMPTY_GRAPH_RESULT)
+            }
+        else:
+            # Calculate metrics, sharing one zero-copy undirected view of the graph
+            undirected = self._as_undirected(graph)
+            centrality = self.calculate_centrality_metrics(graph, undirected)
+            communities = self.detect_communities(graph, undirected)
+            num_components = self._count_components(graph)
+
+            result = {
+                'user_id': user_id,
+                'graph_type': graph_type,
+                'graph_stats': {
+                    'nodes': graph.number_of_nodes(),
+                    'edges': graph.number_of_edges(),
+                    'density': nx.density(graph) if graph.number_of_nodes() > 1 else 0.0,
+                    'is_connected': num_components == 1,
+                    'num_components': num_components
+                },
+                'nodes': self._serialize_nodes(graph),
+                'edges': self._serialize_edges(graph),
+                'centrality': centrality,
+                'communities': communities,
+            }
         # Only include period when dates were actually applied
         if graph_type != 'goal_institution' and start_date and end_date:
             result['period'] = {'start': start_date, 'end': end_date}
@@ -97,7 +183,8 @@ class NetworkAnalytics:
         self,
         transactions: List[Transaction],
         institutions: List[Institution],
-        goals: List[Goal]
+        goals: List[Goal],
+        inactive_goals: Optional[List[Goal]] = None
     ) -> nx.DiGraph:
         """
         Build a directed graph showing money flow between entities.
@@ -109,80 +196,99 @@ class NetworkAnalytics:
             transactions: List of transactions
             institutions: List of institutions
             goals: List of goals
+            inactive_goals: Inactive goals with linked transactions, if already
+                filtered by the caller
         
         Returns:
             NetworkX DiGraph
         """
         G = nx.DiGraph()
+        if inactive_goals is None:
+            inactive_goals = self._inactive_goals(goals)
         
-        # Add institution nodes
-        for inst in institutions:
-            G.add_node(
+        # Institution balances, looked up once for every goal's current amount
+        balances = {inst.institution_id: inst.current_balance for inst in institutions}
+        
+        # Add institution and goal nodes in one bulk call
+        G.add_nodes_from(
+            (
                 f"inst_{inst.institution_id}",
-                type='institution',
-                name=inst.institution_name,
-                balance=inst.current_balance
+                {'type': 'institution', 'name': inst.institution_name, 'balance': inst.current_balance}
             )
-        
-        # Add goal nodes
-        for goal in goals:
-            # Calculate current amount based on linked institutions
-            current_amount = goal.calculate_current_amount(institutions) if institutions else 0.0
-            G.add_node(
+            for inst in institutions
+        )
+        G.add_nodes_from(
+            (
                 f"goal_{goal.goal_id}",
-                type='goal',
-                name=goal.name,
-                target=goal.target_amount,
-                current=current_amount
+                {
+                    'type': 'goal',
+                    'name': goal.name,
+                    'target': goal.target_amount,
+                    # Calculate current amount based on linked institutions
+                    'current': goal.calculate_current_amount(institutions, balances) if institutions else 0.0
+                }
             )
+            for goal in goals
+        )
         
-        # Add category nodes and edges from transactions
-        institution_category_flows = defaultdict(lambda: defaultdict(float))
+        # Single pass over transactions: collect category nodes, institution ->
+        # category flows, and the transactions inactive goals link to
+        category_nodes: Dict[str, Dict[str, str]] = {}
+        institution_category_flows: Dict[Tuple[str, str], float] = defaultdict(float)
+        inactive_txn_ids = self._inactive_goal_transaction_ids(inactive_goals)
+        txn_lookup: Dict[str, Transaction] = {}
         
         for txn in transactions:
+            if txn.transaction_id in inactive_txn_ids:
+                txn_lookup[txn.transaction_id] = txn
+            
             inst_node = f"inst_{txn.institution_id}"
+            # Track flow from institution to category (only count WITHDRAWALs)
+            spent = txn.amount if txn.type == 'WITHDRAWAL' else None
             
             for tag in txn.tags:
                 category_node = f"cat_{tag}"
                 
                 # Add category node if not exists
-                if category_node not in G:
-                    G.add_node(category_node, type='category', name=tag)
+                if category_node not in category_nodes and category_node not in G:
+                    category_nodes[category_node] = {'type': 'category', 'name': tag}
                 
-                # Track flow from institution to category (only count WITHDRAWALs)
-                if txn.type == 'WITHDRAWAL':
-                    institution_category_flows[inst_node][category_node] += txn.amount
+                if spent is not None:
+                    institution_category_flows[(inst_node, category_node)] += spent
+        
+        G.add_nodes_from(category_nodes.items())
         
         # Add edges for institution -> category flows (only if institution exists in graph)
-        for inst_node, categories in institution_category_flows.items():
-            if inst_node in G:  # Only add edge if institution node exists
-                for cat_node, amount in categories.items():
-                    G.add_edge(inst_node, cat_node, weight=amount, flow_type='spending')
+        G.add_edges_from(
+            (inst_node, cat_node, {'weight': amount, 'flow_type': 'spending'})
+            for (inst_node, cat_node), amount in institution_category_flows.items()
+            if inst_node in G  # Only add edge if institution node exists
+        )
         
-        # Add edges for goal allocations
-        for goal in goals:
-            goal_node = f"goal_{goal.goal_id}"
-            for inst_id, percentage in goal.linked_institutions.items():
-                inst_node = f"inst_{inst_id}"
-                if inst_node in G:
-                    # Weight by goal target amount * percentage
-                    weight = goal.target_amount * (percentage / 100.0)
-                    G.add_edge(inst_node, goal_node, weight=weight, flow_type='allocation')
+        # Add edges for goal allocations, weighted by goal target amount * percentage
+        G.add_edges_from(
+            (
+                f"inst_{inst_id}",
+                f"goal_{goal.goal_id}",
+                {'weight': goal.target_amount * (percentage / 100.0), 'flow_type': 'allocation'}
+            )
+            for goal in goals
+            for inst_id, percentage in goal.linked_institutions.items()
+            if f"inst_{inst_id}" in G
+        )
 
         # For inactive goals, also derive institution links from linked_transactions
-        txn_lookup = {txn.transaction_id: txn for txn in transactions}
-        for goal in goals:
-            if not goal.is_active and goal.linked_transactions:
-                goal_node = f"goal_{goal.goal_id}"
-                for txn_id in goal.linked_transactions:
-                    txn = txn_lookup.get(txn_id)
-                    if txn:
-                        inst_node = f"inst_{txn.institution_id}"
-                        if inst_node in G and not G.has_edge(inst_node, goal_node):
-                            G.add_edge(
-                                inst_node, goal_node,
-                                weight=0, flow_type='inactive_allocation'
-                            )
+        inactive_edges = {}
+        for goal in inactive_goals:
+            goal_node = f"goal_{goal.goal_id}"
+            for txn_id in goal.linked_transactions:
+                txn = txn_lookup.get(txn_id)
+                if txn:
+                    inst_node = f"inst_{txn.institution_id}"
+                    edge = (inst_node, goal_node)
+                    if inst_node in G and edge not in inactive_edges and not G.has_edge(*edge):
+                        inactive_edges[edge] = {'weight': 0, 'flow_type': 'inactive_allocation'}
+        G.add_edges_from((u, v, data) for (u, v), data in inactive_edges.items())
 
         return G
     
@@ -190,7 +296,8 @@ class NetworkAnalytics:
         self,
         institutions: List[Institution],
         goals: List[Goal],
-        transactions: List[Transaction] = None
+        transactions: List[Transaction] = None,
+        inactive_goals: Optional[List[Goal]] = None
     ) -> nx.Graph:
         """
         Build an undirected graph showing goal-institution relationships.
@@ -205,73 +312,57 @@ class NetworkAnalytics:
             goals: List of goals
             transactions: Optional list of transactions used to resolve
                 institution links for inactive goals
+            inactive_goals: Inactive goals with linked transactions, if already
+                filtered by the caller
         
         Returns:
             NetworkX Graph
         """
         G = nx.Graph()
+        if inactive_goals is None:
+            inactive_goals = self._inactive_goals(goals)
+        
+        # Institution balances, looked up once for every goal's current amount
+        balances = {inst.institution_id: inst.current_balance for inst in institutions}
         
         # Add institution nodes
-        for inst in institutions:
-            G.add_node(
+        G.add_nodes_from(
+            (
                 f"inst_{inst.institution_id}",
-                type='institution',
-                name=inst.institution_name,
-                balance=inst.current_balance
+                {'type': 'institution', 'name': inst.institution_name, 'balance': inst.current_balance}
             )
+            for inst in institutions
+        )
         
-        # Add goal nodes and edges
-        for goal in goals:
-            goal_node = f"goal_{goal.goal_id}"
-            current_amount = goal.calculate_current_amount(institutions) if institutions else 0.0
-            G.add_node(
-                goal_node,
-                type='goal',
-                name=goal.name,
-                target=goal.target_amount,
-                current=current_amount,
-                is_completed=goal.is_completed,
-                is_active=goal.is_active
+        # Add goal nodes, then edges with allocation percentages
+        # (active goals use linked_institutions)
+        G.add_nodes_from(
+            (
+                f"goal_{goal.goal_id}",
+                {
+                    'type': 'goal',
+                    'name': goal.name,
+                    'target': goal.target_amount,
+                    'current': goal.calculate_current_amount(institutions, balances) if institutions else 0.0,
+                    'is_completed': goal.is_completed,
+                    'is_active': goal.is_active
+                }
             )
-            
-            # Add edges with allocation percentages (active goals use linked_institutions)
-            for inst_id, percentage in goal.linked_institutions.items():
-                inst_node = f"inst_{inst_id}"
-                if inst_node in G:
-                    G.add_edge(
-                        inst_node,
-                        goal_node,
-                        weight=percentage,
-                        allocation=percentage
-                    )
-
-        # For inactive goals, also derive institution links from linked_transactions.
-        # Use the actual transaction amounts so the edge weight reflects real money moved.
-        # Pre-sum per (inst, goal) pair to handle multiple transactions to the same institution.
-        txn_lookup = {txn.transaction_id: txn for txn in transactions} if transactions else {}
-        if transactions:
-            for goal in goals:
-                if not goal.is_active and goal.linked_transactions:
-                    goal_node = f"goal_{goal.goal_id}"
-                    # Accumulate amounts per institution before adding edges
-                    inst_amounts: Dict[str, float] = defaultdict(float)
-                    for txn_id in goal.linked_transactions:
-                        txn = txn_lookup.get(txn_id)
-                        if txn:
-                            inst_amounts[txn.institution_id] += txn.amount
-                    for inst_id, amount in inst_amounts.items():
-                        inst_node = f"inst_{inst_id}"
-                        # Only add if the edge wasn't already created via linked_institutions
-                        if inst_node in G and not G.has_edge(inst_node, goal_node):
-                            G.add_edge(
-                                inst_node,
-                                goal_node,
-                                weight=amount,
-                                allocation=None
-                            )
+            for goal in goals
+        )
+        G.add_edges_from(
+            (f"inst_{inst_id}", f"goal_{goal.goal_id}", {'weight': percentage, 'allocation': percentage})
+            for goal in goals
+            for inst_id, percentage in goal.linked_institutions.items()
+            if f"inst_{inst_id}" in G
+        )
 
-        # Add aggregated tag nodes: goal-linked transactions → goal→tag edges;
-        # all other transactions → institution→tag edges
+        # Single pass over transactions: index the ones inactive goals link to
+        # and accumulate tag flows. Goal-linked transactions → goal→tag edges;
+        # all other transactions → institution→tag edges.
+        inactive_txn_ids = self._inactive_goal_transaction_ids(inactive_goals)
+        txn_lookup: Dict[str, Transaction] = {}
+        tag_flows: Dict[Tuple[str, str], float] = defaultdict(float)
         if transactions:
             # Map txn_id -> goal_node for every transaction referenced by a goal
             txn_to_goal: Dict[str, str] = {}
@@ -280,8 +371,10 @@ class NetworkAnalytics:
                     txn_to_goal[txn_id] = f"goal_{goal.goal_id}"
 
             # Accumulate amounts by (source_node, tag)
-            tag_flows: Dict[Tuple[str, str], float] = defaultdict(float)
             for txn in transactions:
+                if txn.transaction_id in inactive_txn_ids:
+                    txn_lookup[txn.transaction_id] = txn
+                
                 linked_goal = txn_to_goal.get(txn.transaction_id)
                 if linked_goal and linked_goal in G:
                     source = linked_goal
@@ -289,24 +382,80 @@ class NetworkAnalytics:
                     source = f"inst_{txn.institution_id}"
                     if source not in G:
                         continue
+                amount = txn.amount
                 for tag in txn.tags:
                     # Skip goal-completion tag — the inst→goal edge already represents this flow
                     if tag == 'goal-completion':
                         continue
-                    tag_flows[(source, tag)] += txn.amount
+                    tag_flows[(source, tag)] += amount
 
-            # Add tag nodes and edges
-            for (source, tag), total in tag_flows.items():
-                tag_node = f"tag_{tag}"
-                if tag_node not in G:
-                    G.add_node(tag_node, type='tag', name=tag)
-                if not G.has_edge(source, tag_node):
-                    G.add_edge(source, tag_node, weight=total, flow_type='spending')
-                else:
-                    G[source][tag_node]['weight'] += total
+        # For inactive goals, also derive institution links from linked_transactions.
+        # Use the actual transaction amounts so the edge weight reflects real money moved.
+        # Pre-sum per (inst, goal) pair to handle multiple transactions to the same institution.
+        if txn_lookup:
+            inactive_edges = []
+            for goal in inactive_goals:
+                goal_node = f"goal_{goal.goal_id}"
+                # Accumulate amounts per institution before adding edges
+                inst_amounts: Dict[str, float] = defaultdict(float)
+                for txn_id in goal.linked_transactions:
+                    txn = txn_lookup.get(txn_id)
+                    if txn:
+                        inst_amounts[txn.institution_id] += txn.amount
+                for inst_id, amount in inst_amounts.items():
+                    inst_node = f"inst_{inst_id}"
+                    # Only add if the edge wasn't already created via linked_institutions
+                    if inst_node in G and not G.has_edge(inst_node, goal_node):
+                        inactive_edges.append(
+                            (inst_node, goal_node, {'weight': amount, 'allocation': None})
+                        )
+            G.add_edges_from(inactive_edges)
+
+        # Add tag nodes and edges. tag_flows keys are unique (source, tag) pairs,
+        # so each aggregated flow becomes exactly one edge.
+        tag_nodes = {}
+        for (source, tag) in tag_flows:
+            tag_node = f"tag_{tag}"
+            if tag_node not in tag_nodes and tag_node not in G:
+                tag_nodes[tag_node] = {'type': 'tag', 'name': tag}
+        G.add_nodes_from(tag_nodes.items())
+        G.add_edges_from(
+            (source, f"tag_{tag}", {'weight': total, 'flow_type': 'spending'})
+            for (source, tag), total in tag_flows.items()
+        )
 
         return G
     
+    def _inactive_goals(self, goals: List[Goal]) -> List[Goal]:
+        """
+        Filter the inactive goals that reference transactions.
+        
+        Only these goals are linked to institutions through their
+        ``linked_transactions``.
+        
+        Args:
+            goals: List of goals
+        
+        Returns:
+            List of inactive goals with at least one linked transaction
+        """
+        return [goal for goal in goals if not goal.is_active and goal.linked_transactions]
+    
+    def _inactive_goal_transaction_ids(self, inactive_goals: List[Goal]) -> Set[str]:
+        """
+        Collect the transaction ids referenced by inactive goals.
+        
+        No other lookup by id is needed, so builders only index transactions
+        whose id is in this set.
+        
+        Args:
+            inactive_goals: Goals returned by ``_inactive_goals``
+        
+        Returns:
+            Set of transaction ids
+        """
+        return {txn_id for goal in inactive_goals for txn_id in goal.linked_transactions}
+    
     def build_tag_network(self, transactions: List[Transaction]) -> nx.Graph:
         """
         Build an undirected graph showing co-occurrence of transaction tags.
@@ -322,41 +471,48 @@ class NetworkAnalytics:
         """
         G = nx.Graph()
         
-        # Track tag co-occurrences
-        tag_pairs = defaultdict(int)
-        tag_amounts = defaultdict(float)
-        
+        # Intern tags as small ints ranked in string order, so sorting ids
+        # matches sorting the tags
+        first_seen: Dict[str, None] = {}
         for txn in transactions:
-            # Add nodes for each tag
             for tag in txn.tags:
-                if tag not in G:
-                    G.add_node(tag, type='tag', name=tag)
-                tag_amounts[tag] += txn.amount
+                first_seen.setdefault(tag)
+        tags_by_id = sorted(first_seen)
+        tag_to_id = {tag: i for i, tag in enumerate(tags_by_id)}
+        
+        # Track tag co-occurrences and amounts
+        tag_amounts = [0.0] * len(tags_by_id)
+        pair_counts: Counter = Counter()
+        
+        for txn in transactions:
+            ids = sorted([tag_to_id[tag] for tag in txn.tags])
+            amount = txn.amount
+            for tag_id in ids:
+                tag_amounts[tag_id] += amount
             
-            # Add edges for co-occurring tags
-            tags = sorted(txn.tags)  # Sort for consistent ordering
-            for i, tag1 in enumerate(tags):
-                for tag2 in tags[i+1:]:
-                    pair = (tag1, tag2)
-                    tag_pairs[pair] += 1
-        
-        # Add edges with weights
-        for (tag1, tag2), count in tag_pairs.items():
-            G.add_edge(tag1, tag2, weight=count, co_occurrences=count)
-        
-        # Update node attributes with total amounts
-        for tag, amount in tag_amounts.items():
-            if tag in G:
-                G.nodes[tag]['total_amount'] = amount
+            # Pair enumeration and counting both run in C (combinations + Counter.update)
+            if len(ids) > 1:
+                pair_counts.update(combinations(ids, 2))
+        
+        # Add nodes (in order of first appearance) with total amounts, then weighted edges
+        G.add_nodes_from(
+            (tag, {'type': 'tag', 'name': tag, 'total_amount': tag_amounts[tag_to_id[tag]]})
+            for tag in first_seen
+        )
+        G.add_edges_from(
+            (tags_by_id[id1], tags_by_id[id2], {'weight': count, 'co_occurrences': count})
+            for (id1, id2), count in pair_counts.items()
+        )
         
         return G
     
-    def calculate_centrality_metrics(self, graph: nx.Graph) -> Dict[str, Any]:
+    def calculate_centrality_metrics(self, graph: nx.Graph, undirected: Optional[nx.Graph] = None) -> Dict[str, Any]:
         """
         Calculate various centrality metrics for the graph.
         
         Args:
             graph: NetworkX graph
+            undirected: Undirected view of graph, if the caller already has one
         
         Returns:
             Dictionary of centrality metrics
@@ -369,8 +525,17 @@ class NetworkAnalytics:
                 'pagerank': {}
             }
         
-        # Convert to undirected for some metrics
-        undirected_graph = graph.to_undirected() if isinstance(graph, nx.DiGraph) else graph
+        return self._cached_metric(
+            'centrality', graph, lambda g: self._compute_centrality_metrics(g, undirected)
+        )
+    
+    def _compute_centrality_metrics(self, graph: nx.Graph, undirected: Optional[nx.Graph] = None) -> Dict[str, Any]:
+        """Compute centrality metrics for a non-empty graph (uncached)."""
+        if self.backend == constants.NETWORK_BACKEND_IGRAPH:
+            return self._calculate_centrality_metrics_igraph(graph)
+        
+        # Undirected view for some metrics
+        undirected_graph = undirected if undirected is not None else self._as_undirected(graph)
         
         result = {
             'degree_centrality': {},
@@ -383,14 +548,23 @@ class NetworkAnalytics:
         degree_cent = nx.degree_centrality(undirected_graph)
         result['degree_centrality'] = self._top_k_nodes(degree_cent, k=10)
         
-        # Betweenness centrality (nodes on shortest paths)
-        if undirected_graph.number_of_nodes() > 2:
-            betweenness = nx.betweenness_centrality(undirected_graph)
-            result['betweenness_centrality'] = self._top_k_nodes(betweenness, k=10)
+        if nx.is_forest(undirected_graph):
+            # Trees have closed forms for both metrics, computed in one DFS
+            betweenness, closeness = self._forest_centrality(undirected_graph)
+        else:
+            # Betweenness centrality (nodes on shortest paths)
+            betweenness = None
+            if undirected_graph.number_of_nodes() > 2:
+                betweenness = self._leaf_reduced_betweenness(undirected_graph)
+            
+            # Closeness centrality (average distance to all other nodes)
+            closeness = None
+            if nx.is_connected(undirected_graph):
+                closeness = nx.closeness_centrality(undirected_graph)
         
-        # Closeness centrality (average distance to all other nodes)
-        if nx.is_connected(undirected_graph):
-            closeness = nx.closeness_centrality(undirected_graph)
+        if betweenness is not None:
+            result['betweenness_centrality'] = self._top_k_nodes(betweenness, k=10)
+        if closeness is not None:
             result['closeness_centrality'] = self._top_k_nodes(closeness, k=10)
         
         # PageRank (importance based on connections)
@@ -405,12 +579,149 @@ class NetworkAnalytics:
         
         return result
     
-    def detect_communities(self, graph: nx.Graph) -> Dict[str, Any]:
+    def _forest_centrality(
+        self,
+        graph: nx.Graph
+    ) -> Tuple[Optional[Dict[Any, float]], Optional[Dict[Any, float]]]:
+        """
+        Betweenness and closeness centrality for an acyclic undirected graph.
+        
+        In a tree every pair of nodes has exactly one path, so removing node
+        ``v`` from its component of size ``c`` splits it into pieces of sizes
+        ``s_i`` and ``v`` lies on ``(c - 1)**2 - sum(s_i**2)`` ordered pairs.
+        Distance sums follow from subtree sizes by rerooting:
+        ``D(child) = D(parent) + n - 2 * size(child)``. Both match the
+        normalized NetworkX definitions.
+        
+        Args:
+            graph: Undirected NetworkX forest
+        
+        Returns:
+            Tuple of (betweenness, closeness); betweenness is None for graphs
+            with two or fewer nodes and closeness is None unless the forest is
+            a single tree, mirroring when the general path computes them
+        """
+        n = graph.number_of_nodes()
+        betweenness = dict.fromkeys(graph, 0.0) if n > 2 else None
+        closeness = None
+        visited = set()
+        
+        for root in graph:
+            if root in visited:
+                continue
+            
+            # Iterative DFS; parents always precede their children in order
+            parent = {root: None}
+            order = [root]
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for nbr in graph[node]:
+                    if nbr not in parent:
+                        parent[nbr] = node
+                        order.append(nbr)
+                        stack.append(nbr)
+            visited.update(order)
+            
+            size = dict.fromkeys(order, 1)
+            child_squares = dict.fromkeys(order, 0)
+            for node in reversed(order[1:]):
+                size[parent[node]] += size[node]
+                child_squares[parent[node]] += size[node] ** 2
+            component_size = len(order)
+            
+            if betweenness is not None:
+                scale = 1.0 / ((n - 1) * (n - 2))
+                for node in order:
+                    squares = child_squares[node] + (component_size - size[node]) ** 2
+                    betweenness[node] = ((component_size - 1) ** 2 - squares) * scale
+            
+            if component_size == n:
+                # Single tree: sum of depths from the root, then reroot downwards
+                distance = {root: sum(size[node] for node in order[1:])}
+                for node in order[1:]:
+                    distance[node] = distance[parent[node]] + n - 2 * size[node]
+                closeness = {
+                    node: (n - 1) / distance[node] if distance[node] > 0 else 0.0
+                    for node in graph
+                }
+        
+        return betweenness, closeness
+    
+    def _leaf_reduced_betweenness(self, graph: nx.Graph) -> Dict[Any, float]:
+        """
+        Normalized betweenness centrality that skips BFS from leaf nodes.
+        
+        Equivalent to ``nx.betweenness_centrality(graph)`` for an undirected,
+        unweighted graph. The financial graphs are mostly leaves (categories and
+        tags hanging off one institution or goal), and every shortest path from
+        a leaf runs through its single neighbor ``u``. Brandes' dependency
+        accumulation therefore only needs to run from non-leaf sources: each
+        run from ``u`` is weighted by ``1 + leaves(u)`` to stand in for its
+        leaves, and ``u`` is credited with every leaf-to-other pair it carries.
+        Leaves themselves always score 0.
+        
+        Args:
+            graph: Undirected NetworkX graph with more than two nodes
+        
+        Returns:
+            Dictionary mapping node IDs to normalized betweenness
+        """
+        betweenness = dict.fromkeys(graph, 0.0)
+        neighbors = {node: [nbr for nbr in graph[node] if nbr != node] for node in graph}
+        leaf_counts = defaultdict(int)
+        for node, nbrs in neighbors.items():
+            if len(nbrs) == 1:
+                leaf_counts[nbrs[0]] += 1
+        
+        for source, nbrs in neighbors.items():
+            if len(nbrs) <= 1:
+                continue  # Leaves are covered by their neighbor; isolated nodes carry nothing
+            
+            # Single-source shortest paths (BFS) counting path multiplicities
+            order = []
+            predecessors = {source: []}
+            sigma = {source: 1}
+            dist = {source: 0}
+            queue = [source]
+            for v in queue:
+                order.append(v)
+                next_dist = dist[v] + 1
+                for w in neighbors[v]:
+                    if w not in dist:
+                        dist[w] = next_dist
+                        sigma[w] = 0
+                        predecessors[w] = []
+                        queue.append(w)
+                    if dist[w] == next_dist:
+                        sigma[w] += sigma[v]
+                        predecessors[w].append(v)
+            
+            # Accumulate dependencies in reverse BFS order
+            leaves = leaf_counts[source]
+            weight = 1 + leaves
+            delta = dict.fromkeys(order, 0.0)
+            for w in reversed(order):
+                coeff = (1.0 + delta[w]) / sigma[w]
+                for v in predecessors[w]:
+                    delta[v] += sigma[v] * coeff
+                if w != source:
+                    betweenness[w] += weight * delta[w]
+            
+            # Paths from each leaf of source to every other node in the component pass through source
+            betweenness[source] += leaves * (len(order) - 2)
+        
+        n = graph.number_of_nodes()
+        scale = 1.0 / ((n - 1) * (n - 2))
+        return {node: value * scale for node, value in betweenness.items()}
+    
+    def detect_communities(self, graph: nx.Graph, undirected: Optional[nx.Graph] = None) -> Dict[str, Any]:
         """
         Detect communities/clusters in the graph.
         
         Args:
             graph: NetworkX graph
+            undirected: Undirected view of graph, if the caller already has one
         
         Returns:
             Dictionary containing community information
@@ -422,19 +733,38 @@ class NetworkAnalytics:
                 'modularity': 0.0
             }
         
-        # Convert to undirected
-        undirected_graph = graph.to_undirected() if isinstance(graph, nx.DiGraph) else graph
+        return self._cached_metric(
+            'communities', graph, lambda g: self._compute_communities(g, undirected)
+        )
+    
+    def _compute_communities(self, graph: nx.Graph, undirected: Optional[nx.Graph] = None) -> Dict[str, Any]:
+        """Detect communities in a non-empty graph (uncached)."""
+        # Undirected view
+        undirected_graph = undirected if undirected is not None else self._as_undirected(graph)
         
-        # Use greedy modularity optimization
+        # Use Louvain modularity optimization
         try:
-            communities_generator = nx.community.greedy_modularity_communities(undirected_graph)
-            communities = [list(community) for community in communities_generator]
-            
-            # Calculate modularity
-            modularity = nx.community.modularity(
-                undirected_graph,
-                [set(comm) for comm in communities]
-            )
+            if self.backend == constants.NETWORK_BACKEND_IGRAPH:
+                communities, modularity = self._detect_communities_igraph(undirected_graph)
+            else:
+                communities = sorted(
+                    (
+                        list(community)
+                        for community in nx.community.louvain_communities(
+                            undirected_graph,
+                            weight=None,
+                            seed=constants.NETWORK_COMMUNITY_SEED
+                        )
+                    ),
+                    key=len,
+                    reverse=True
+                )
+                
+                # Calculate modularity
+                modularity = nx.community.modularity(
+                    undirected_graph,
+                    [set(comm) for comm in communities]
+                )
             
             return {
                 'num_communities': len(communities),
@@ -459,7 +789,8 @@ class NetworkAnalytics:
         self,
         graph: nx.Graph,
         source: str,
-        target: str
+        target: str,
+        undirected: Optional[nx.Graph] = None
     ) -> Dict[str, Any]:
         """
         Find shortest path between two nodes.
@@ -468,11 +799,12 @@ class NetworkAnalytics:
             graph: NetworkX graph
             source: Source node ID
             target: Target node ID
+            undirected: Undirected view of graph, if the caller already has one
         
         Returns:
             Dictionary containing path information
         """
-        undirected_graph = graph.to_undirected() if isinstance(graph, nx.DiGraph) else graph
+        undirected_graph = undirected if undirected is not None else self._as_undirected(graph)
         
         try:
             path = nx.shortest_path(undirected_graph, source, target)
@@ -490,7 +822,11 @@ class NetworkAnalytics:
                 'length': float('inf')
             }
     
-    def calculate_clustering_coefficients(self, graph: nx.Graph) -> Dict[str, float]:
+    def calculate_clustering_coefficients(
+        self,
+        graph: nx.Graph,
+        undirected: Optional[nx.Graph] = None
+    ) -> Dict[str, float]:
         """
         Calculate clustering coefficient for nodes.
         
@@ -499,11 +835,12 @@ class NetworkAnalytics:
         
         Args:
             graph: NetworkX graph
+            undirected: Undirected view of graph, if the caller already has one
         
         Returns:
             Dictionary mapping node IDs to clustering coefficients
         """
-        undirected_graph = graph.to_undirected() if isinstance(graph, nx.DiGraph) else graph
+        undirected_graph = undirected if undirected is not None else self._as_undirected(graph)
         
         if undirected_graph.number_of_nodes() == 0:
             return {}
@@ -511,8 +848,199 @@ class NetworkAnalytics:
         clustering = nx.clustering(undirected_graph)
         return self._top_k_nodes(clustering, k=10)
     
+    def _as_undirected(self, graph: nx.Graph) -> nx.Graph:
+        """
+        Return an undirected view of the graph without copying it.
+        
+        Args:
+            graph: NetworkX graph
+        
+        Returns:
+            The graph itself if undirected, otherwise a read-only undirected view
+        """
+        return graph.to_undirected(as_view=True) if graph.is_directed() else graph
+    
+    def _count_components(self, graph: nx.Graph) -> int:
+        """
+        Count weakly connected components with a union-find over the edge list.
+        
+        Edge direction is ignored, so no undirected copy or BFS is needed.
+        
+        Args:
+            graph: NetworkX graph
+        
+        Returns:
+            Number of connected components (0 for an empty graph)
+        """
+        components = UnionFind(graph)
+        for u, v in graph.edges():
+            components.union(u, v)
+        return sum(1 for _ in components.to_sets())
+    
+    def _graph_fingerprint(self, graph: nx.Graph) -> str:
+        """
+        Hash the graph structure that the metrics depend on.
+        
+        Covers directedness, node order, and edges with their weights (used by
+        PageRank); node attributes do not affect any metric and are ignored.
+        
+        Args:
+            graph: NetworkX graph
+        
+        Returns:
+            Hex digest identifying the graph structure
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((graph.is_directed(), list(graph.nodes()))).encode())
+        digest.update(repr([(u, v, data.get('weight')) for u, v, data in graph.edges(data=True)]).encode())
+        return digest.hexdigest()
+    
+    def _cached_metric(
+        self,
+        name: str,
+        graph: nx.Graph,
+        compute: Callable[[nx.Graph], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Return a metric result for the graph, computing it only on a cache miss.
+        
+        Args:
+            name: Metric name (part of the cache key)
+            graph: NetworkX graph
+            compute: Function computing the metric from the graph
+        
+        Returns:
+            Copy of the metric result
+        """
+        key = (name, self._graph_fingerprint(graph))
+        with self._metrics_lock:
+            result = self._metrics_cache.get(key)
+        if result is None:
+            result = compute(graph)
+            with self._metrics_lock:
+                self._metrics_cache.set(key, result)
+        return copy.deepcopy(result)
+    
+    def _to_igraph(self, graph: nx.Graph) -> Tuple[Any, List[Any]]:
+        """
+        Convert a NetworkX graph to igraph in a single bulk construction.
+        
+        Args:
+            graph: NetworkX graph
+        
+        Returns:
+            Tuple of (igraph.Graph, node ids ordered by igraph vertex index)
+        """
+        nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = []
+        weights = []
+        for source, target, data in graph.edges(data=True):
+            edges.append((index[source], index[target]))
+            weights.append(data.get('weight', 1))
+        
+        ig_graph = igraph.Graph(
+            n=len(nodes),
+            edges=edges,
+            directed=graph.is_directed(),
+            edge_attrs={'weight': weights}
+        )
+        return ig_graph, nodes
+    
+    def _calculate_centrality_metrics_igraph(self, graph: nx.Graph) -> Dict[str, Any]:
+        """
+        igraph implementation of calculate_centrality_metrics.
+        
+        Scores are normalized the same way as the NetworkX functions so both
+        backends return comparable values.
+        
+        Args:
+            graph: Non-empty NetworkX graph
+        
+        Returns:
+            Dictionary of centrality metrics
+        """
+        ig_graph, nodes = self._to_igraph(graph)
+        undirected = ig_graph.as_undirected(mode='collapse') if ig_graph.is_directed() else ig_graph
+        n = undirected.vcount()
+        
+        result = {
+            'degree_centrality': {},
+            'betweenness_centrality': {},
+            'closeness_centrality': {},
+            'pagerank': {}
+        }
+        
+        # Degree centrality
+        if n > 1:
+            degree_cent = dict(zip(nodes, (d / (n - 1) for d in undirected.degree())))
+        else:
+            degree_cent = {node: 1 for node in nodes}
+        result['degree_centrality'] = self._top_k_nodes(degree_cent, k=10)
+        
+        # Betweenness centrality (igraph counts each undirected pair once)
+        if n > 2:
+            scale = 2.0 / ((n - 1) * (n - 2))
+            betweenness = dict(zip(nodes, (b * scale for b in undirected.betweenness(directed=False))))
+            result['betweenness_centrality'] = self._top_k_nodes(betweenness, k=10)
+        
+        # Closeness centrality
+        if undirected.is_connected():
+            if n > 1:
+                closeness = dict(zip(nodes, undirected.closeness()))
+            else:
+                closeness = {node: 0.0 for node in nodes}
+            result['closeness_centrality'] = self._top_k_nodes(closeness, k=10)
+        
+        # PageRank (weighted, like nx.pagerank)
+        try:
+            pagerank = dict(zip(nodes, ig_graph.pagerank(directed=ig_graph.is_directed(), weights='weight')))
+            result['pagerank'] = self._top_k_nodes(pagerank, k=10)
+        except Exception as exc:
+            logger.warning(f"igraph PageRank failed: {exc}")
+        
+        return result
+    
+    def _detect_communities_igraph(self, undirected_graph: nx.Graph) -> Tuple[List[List[Any]], float]:
+        """
+        Run Louvain modularity optimization (multilevel) in igraph.
+        
+        igraph draws its random node order from Python's ``random`` module, so
+        a seeded generator is swapped in for the call to keep results stable.
+        The generator is process-wide, so the swap, the call and the restore
+        run under _IGRAPH_RNG_LOCK to keep concurrent analyses from sharing it.
+        
+        Args:
+            undirected_graph: Undirected NetworkX graph
+        
+        Returns:
+            Tuple of (communities largest first, modularity)
+        """
+        if undirected_graph.number_of_edges() == 0:
+            # Modularity is undefined without edges (NetworkX raises here too)
+            raise ZeroDivisionError("modularity is undefined for a graph without edges")
+        
+        ig_graph, nodes = self._to_igraph(undirected_graph)
+        with _IGRAPH_RNG_LOCK:
+            igraph.set_random_number_generator(random.Random(constants.NETWORK_COMMUNITY_SEED))
+            try:
+                clustering = ig_graph.community_multilevel()
+            finally:
+                igraph.set_random_number_generator(random)
+        communities = sorted(
+            ([nodes[i] for i in members] for members in clustering),
+            key=len,
+            reverse=True
+        )
+        return communities, ig_graph.modularity(clustering.membership)
+    
     def _serialize_nodes(self, graph: nx.Graph) -> List[Dict[str, Any]]:
-        """Serialize graph nodes to dictionary format."""
+        """
+        Serialize graph nodes to dictionary format.
+        
+        Attribute dicts are shared with the graph rather than copied, so the
+        cost is one small wrapper dict per node.
+        """
         return [
             {
                 'id': node,
@@ -522,7 +1050,11 @@ class NetworkAnalytics:
         ]
     
     def _serialize_edges(self, graph: nx.Graph) -> List[Dict[str, Any]]:
-        """Serialize graph edges to dictionary format."""
+        """
+        Serialize graph edges to dictionary format.
+        
+        Like ``_serialize_nodes``, attribute dicts are shared, not copied.
+        """
         return [
             {
                 'source': source,
@@ -547,9 +1079,5 @@ class NetworkAnalytics:
         Returns:
             Dictionary of top k nodes
         """
-        sorted_nodes = sorted(
-            node_values.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        return dict(sorted_nodes[:k])
+        # O(n log k) selection; ties keep insertion order like a stable sort
+        return dict(heapq.nlargest(k, node_values.items(), key=_NODE_VALUE))
@@ -5,7 +5,7 @@ from typing import List, Dict, Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Institution:
     """Financial institution data model."""
     
@@ -31,7 +31,7 @@ class Institution:
         return (self.balance_change / self.starting_balance) * 100
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """Transaction data model."""
     
@@ -61,7 +61,7 @@ class Transaction:
         return self.amount if self.is_deposit else -self.amount
 
 
-@dataclass
+@dataclass(slots=True)
 class Goal:
     """Financial goal data model."""
     
@@ -82,15 +82,24 @@ class Goal:
         """Calculate total allocation percentage."""
         return sum(self.linked_institutions.values())
     
-    def calculate_current_amount(self, institutions: List[Institution]) -> float:
-        """Calculate current amount toward goal based on linked institutions."""
+    def calculate_current_amount(
+        self,
+        institutions: List[Institution],
+        balances: Optional[Dict[str, float]] = None
+    ) -> float:
+        """
+        Calculate current amount toward goal based on linked institutions.
+        
+        Callers evaluating many goals can pass ``balances`` (institution_id ->
+        current_balance), built once, instead of it being rebuilt per goal.
+        """
         total = 0.0
-        inst_dict = {inst.institution_id: inst for inst in institutions}
+        if balances is None:
+            balances = {inst.institution_id: inst.current_balance for inst in institutions}
         
         for inst_id, percent in self.linked_institutions.items():
-            if inst_id in inst_dict:
-                institution = inst_dict[inst_id]
-                allocated_amount = (institution.current_balance * percent) / 100
+            if inst_id in balances:
+                allocated_amount = (balances[inst_id] * percent) / 100
                 total += allocated_amount
         
         return total
@@ -108,7 +117,7 @@ class Goal:
         return max(self.target_amount - current, 0.0)
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalyticsRequest:
     """Request model for analytics generation."""
     
@@ -130,7 +139,7 @@ class AnalyticsRequest:
         return int(dt.timestamp())
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalyticsResponse:
     """Response model for analytics results."""
     
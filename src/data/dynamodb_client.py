@@ -2,22 +2,135 @@
 
 import os
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple, Callable, Iterator
 from datetime import datetime
+from decimal import Decimal
 
 import boto3
-from boto3.dynamodb.conditions import Key, Attr
+import numpy as np
+from boto3.dynamodb.conditions import Key
+from botocore.config import Config
+
+try:
+    import amazondax
+except ImportError:  # Optional DAX read-through cache client
+    amazondax = None
 
 from .data_models import Institution, Transaction, Goal
+from ..utils import constants
+from ..utils.cache import TTLCache
+from ..utils.tracing import patch_aws_clients, traced
 
 
 logger = logging.getLogger(__name__)
 
+# Record DynamoDB calls in X-Ray when tracing is enabled (no-op otherwise)
+patch_aws_clients()
+
+# Attributes read by the model builders; everything else is left on the server
+INSTITUTION_ATTRIBUTES = (
+    'userId', 'institutionId', 'institutionName', 'startingBalance',
+    'currentBalance', 'createdAt', 'allocatedPercent', 'linkedGoals'
+)
+TRANSACTION_ATTRIBUTES = (
+    'institutionId', 'createdAt', 'transactionId', 'userId', 'type',
+    'amount', 'transactionDate', 'tags', 'description'
+)
+# Attributes behind get_transaction_columns' arrays
+TRANSACTION_COLUMN_ATTRIBUTES = ('createdAt', 'type', 'amount', 'transactionDate')
+GOAL_ATTRIBUTES = (
+    'userId', 'goalId', 'name', 'targetAmount', 'createdAt', 'isCompleted',
+    'isActive', 'description', 'linkedInstitutions', 'linkedTransactions', 'completedAt'
+)
+
+# Partition key builder shared by the institutions and goals queries; Key objects
+# are immutable, so only the per-call condition is allocated
+_USER_KEY = Key('userId')
+
+
+def _projection(attributes: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Build ProjectionExpression parameters for a list of attributes.
+    
+    Every name goes through a placeholder so reserved words (``name``,
+    ``type``) are safe. A fresh dict is returned per call because boto3 merges
+    the names generated for condition expressions into it.
+    
+    Args:
+        attributes: Attribute names to fetch
+        
+    Returns:
+        Dictionary with ProjectionExpression and ExpressionAttributeNames
+    """
+    return {
+        'ProjectionExpression': ', '.join(f'#{name}' for name in attributes),
+        'ExpressionAttributeNames': {f'#{name}': name for name in attributes}
+    }
+
+
+def _unmarshal(value: Dict[str, Any]) -> Any:
+    """
+    Convert a low-level (wire format) attribute value to a Python value.
+    
+    Numbers become floats directly instead of going through Decimal; callers
+    that need ints use ``_number_to_int`` on the raw ``N`` string.
+    
+    Args:
+        value: Single-key attribute value such as ``{'S': 'abc'}``
+        
+    Returns:
+        Python value
+    """
+    (type_tag, data), = value.items()
+    if type_tag == 'S' or type_tag == 'BOOL' or type_tag == 'B':
+        return data
+    if type_tag == 'N':
+        return float(data)
+    if type_tag == 'NULL':
+        return None
+    if type_tag == 'L':
+        return [_unmarshal(v) for v in data]
+    if type_tag == 'M':
+        return {k: _unmarshal(v) for k, v in data.items()}
+    if type_tag == 'NS':
+        return [float(n) for n in data]
+    # SS / BS
+    return list(data)
+
+
+def _number_to_int(number: str) -> int:
+    """Parse a DynamoDB ``N`` string as an int, accepting non-integral forms."""
+    try:
+        return int(number)
+    except ValueError:
+        return int(Decimal(number))
+
 
 class DynamoDBClient:
     """Client for accessing DynamoDB tables."""
     
-    def __init__(self, environment: str = "devl", profile: Optional[str] = None, region: str = "us-east-1"):
+    # boto3 sessions shared by every client with the same (profile, region)
+    _sessions: Dict[Tuple[Optional[str], str], boto3.Session] = {}
+    
+    # Keep pooled connections alive between calls and fail fast on stalls
+    _config = Config(
+        tcp_keepalive=True,
+        max_pool_connections=constants.DYNAMODB_MAX_POOL_CONNECTIONS,
+        connect_timeout=constants.DYNAMODB_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=constants.DYNAMODB_READ_TIMEOUT_SECONDS,
+        retries={'max_attempts': constants.DYNAMODB_MAX_ATTEMPTS, 'mode': 'adaptive'}
+    )
+    
+    def __init__(
+        self,
+        environment: str = "devl",
+        profile: Optional[str] = None,
+        region: str = "us-east-1",
+        user_transactions_index: Optional[str] = None
+    ):
         """
         Initialize DynamoDB client.
         
@@ -26,17 +139,31 @@ class DynamoDBClient:
             profile: AWS profile name. Only used for local development.
                      On Lambda, leave as None to use the IAM role credentials.
             region: AWS region
+            user_transactions_index: Name of a Transactions GSI keyed on
+                (userId, transactionDate) that projects the modelled attributes.
+                Defaults to the TRANSACTIONS_USER_INDEX environment variable;
+                when unset, user transactions are gathered per institution.
         """
         self.environment = environment
         self.region = region
+        self.user_transactions_index = user_transactions_index or os.environ.get('TRANSACTIONS_USER_INDEX')
         
         # Use named profile only when explicitly provided (local dev).
         # On Lambda, profile_name must be omitted so boto3 uses the IAM role.
-        session_kwargs = {"region_name": region}
-        if profile:
-            session_kwargs["profile_name"] = profile
-        session = boto3.Session(**session_kwargs)
-        self.dynamodb = session.resource('dynamodb')
+        session_key = (profile, region)
+        session = self._sessions.get(session_key)
+        if session is None:
+            session_kwargs = {"region_name": region}
+            if profile:
+                session_kwargs["profile_name"] = profile
+            session = boto3.Session(**session_kwargs)
+            self._sessions[session_key] = session
+        self.dynamodb = session.resource('dynamodb', config=self._config)
+        # Plain client (no resource type transforms) for the high-volume transaction
+        # queries: items are unmarshalled straight to floats/ints, skipping Decimal.
+        # With DAX_ENDPOINT set, these reads go through the DAX cluster instead (its
+        # client is API-compatible with the low-level DynamoDB client).
+        self.dynamodb_client = self._create_query_client(session, region)
         
         # Table names
         self.institutions_table_name = f"Institutions-{environment}"
@@ -48,44 +175,191 @@ class DynamoDBClient:
         self.transactions_table = self.dynamodb.Table(self.transactions_table_name)
         self.goals_table = self.dynamodb.Table(self.goals_table_name)
         
-        logger.info(f"DynamoDBClient initialized for environment: {environment}")
+        # Short-lived per-user caches for institutions and goals, which rarely change
+        # between the back-to-back requests a dashboard makes
+        self._institutions_cache = TTLCache(
+            maxsize=constants.DYNAMODB_USER_CACHE_MAX_ENTRIES,
+            ttl=constants.DYNAMODB_USER_CACHE_TTL_SECONDS
+        )
+        self._goals_cache = TTLCache(
+            maxsize=constants.DYNAMODB_USER_CACHE_MAX_ENTRIES,
+            ttl=constants.DYNAMODB_USER_CACHE_TTL_SECONDS
+        )
+        self._cache_lock = threading.Lock()
+        # Bumped by invalidate_user so callers caching derived results can key on it
+        self._user_versions: Dict[str, int] = {}
+        
+        logger.info("DynamoDBClient initialized for environment: %s", environment)
+    
+    def _query_all(
+        self,
+        query: Callable[..., Dict[str, Any]],
+        limit: Optional[int] = None,
+        **query_params: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a query and follow LastEvaluatedKey until every page is read.
+        
+        A single query response stops at 1 MB, so reading only the first page
+        silently drops the rest of a large result.
+        
+        Args:
+            query: Query method (``Table.query`` or the low-level client's ``query``)
+            limit: Stop paging once this many items are collected (items are
+                trimmed to the limit)
+            **query_params: Arguments passed to ``query``
+            
+        Returns:
+            List of raw item dictionaries
+        """
+        return list(self._iter_query(query, limit, **query_params))
     
+    def _iter_query(
+        self,
+        query: Callable[..., Dict[str, Any]],
+        limit: Optional[int] = None,
+        **query_params: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a query's items page by page, following LastEvaluatedKey.
+        
+        The next page is only requested once the consumer has taken every item
+        of the current one, so at most one page is buffered.
+        
+        Args:
+            query: Query method (``Table.query`` or the low-level client's ``query``)
+            limit: Stop after yielding this many items
+            **query_params: Arguments passed to ``query``
+            
+        Yields:
+            Raw item dictionaries
+        """
+        count = 0
+        while True:
+            response = query(**query_params)
+            for item in response.get('Items', []):
+                yield item
+                count += 1
+                if limit and count >= limit:
+                    return
+            
+            if 'LastEvaluatedKey' not in response:
+                return
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    def _create_query_client(self, session: boto3.Session, region: str) -> Any:
+        """
+        Create the low-level client used for transaction queries.
+        
+        Args:
+            session: boto3 session
+            region: AWS region
+            
+        Returns:
+            DAX client when DAX_ENDPOINT is set and amazondax is installed,
+            otherwise a DynamoDB client
+        """
+        dax_endpoint = os.environ.get('DAX_ENDPOINT')
+        if dax_endpoint:
+            if amazondax is None:
+                logger.warning("DAX_ENDPOINT is set but amazon-dax-client is not installed; using DynamoDB")
+            else:
+                logger.info("Routing transaction queries through DAX at %s", dax_endpoint)
+                return amazondax.AmazonDaxClient(session, region_name=region, endpoint_url=dax_endpoint)
+        
+        return session.client('dynamodb', config=self._config)
+    
+    def invalidate_user(self, user_id: str) -> None:
+        """
+        Drop a user's cached institutions and goals.
+        
+        Call after writing any table so the next read goes to DynamoDB. Also
+        bumps the user's data version, which invalidates results other
+        components cached against user_data_version().
+        
+        Args:
+            user_id: User ID from Cognito
+        """
+        with self._cache_lock:
+            self._institutions_cache.invalidate(user_id)
+            self._goals_cache.invalidate(user_id)
+            self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+    
+    def user_data_version(self, user_id: str) -> int:
+        """
+        Get a counter that changes whenever a user's data is invalidated.
+        
+        Args:
+            user_id: User ID from Cognito
+            
+        Returns:
+            Number of invalidate_user() calls made for the user
+        """
+        with self._cache_lock:
+            return self._user_versions.get(user_id, 0)
+    
+    def _cached_for_user(self, cache: TTLCache, user_id: str, fetch: Callable[[str], List[Any]]) -> List[Any]:
+        """
+        Return a user's cached list, fetching and storing it on a miss.
+        
+        Args:
+            cache: Cache to read and fill
+            user_id: User ID (cache key)
+            fetch: Loader called on a miss
+            
+        Returns:
+            A new list holding the cached objects
+        """
+        with self._cache_lock:
+            cached = cache.get(user_id)
+        if cached is not None:
+            logger.info("Using cached results for user %s", user_id)
+            return list(cached)
+        
+        # Fetch outside the lock so other users' queries are not serialized
+        result = fetch(user_id)
+        with self._cache_lock:
+            cache.set(user_id, result)
+        return list(result)
+    
+    @traced('dynamodb.get_institutions')
     def get_institutions(self, user_id: str) -> List[Institution]:
         """
         Get all institutions for a user.
         
+        Results are cached per user for DYNAMODB_USER_CACHE_TTL_SECONDS, so a
+        write made elsewhere can be missed for up to that long unless
+        ``invalidate_user`` is called.
+        
         Args:
             user_id: User ID from Cognito
             
         Returns:
             List of Institution objects
         """
+        return self._cached_for_user(self._institutions_cache, user_id, self._query_institutions)
+    
+    def _query_institutions(self, user_id: str) -> List[Institution]:
+        """Query all institutions for a user from DynamoDB."""
         try:
-            response = self.institutions_table.query(
-                KeyConditionExpression=Key('userId').eq(user_id)
+            items = self._query_all(
+                self.institutions_table.query,
+                KeyConditionExpression=_USER_KEY.eq(user_id),
+                **_projection(INSTITUTION_ATTRIBUTES)
             )
             
             institutions = []
-            for item in response.get('Items', []):
-                institution = Institution(
-                    user_id=item['userId'],
-                    institution_id=item['institutionId'],
-                    institution_name=item['institutionName'],
-                    starting_balance=float(item.get('startingBalance', 0)),
-                    current_balance=float(item.get('currentBalance', 0)),
-                    created_at=int(item.get('createdAt', 0)),
-                    allocated_percent=item.get('allocatedPercent'),
-                    linked_goals=item.get('linkedGoals', [])
-                )
-                institutions.append(institution)
-            
-            logger.info(f"Retrieved {len(institutions)} institutions for user {user_id}")
+            for item in items:
+                institutions.append(self._institution_from_item(item))
+            
+            logger.info("Retrieved %d institutions for user %s", len(institutions), user_id)
             return institutions
             
         except Exception as e:
-            logger.error(f"Error fetching institutions for user {user_id}: {str(e)}")
+            logger.error("Error fetching institutions for user %s: %s", user_id, e)
             raise
     
+    @traced('dynamodb.get_institution')
     def get_institution(self, user_id: str, institution_id: str) -> Optional[Institution]:
         """
         Get a specific institution.
@@ -102,28 +376,21 @@ class DynamoDBClient:
                 Key={
                     'userId': user_id,
                     'institutionId': institution_id
-                }
+                },
+                **_projection(INSTITUTION_ATTRIBUTES)
             )
             
             item = response.get('Item')
             if not item:
                 return None
             
-            return Institution(
-                user_id=item['userId'],
-                institution_id=item['institutionId'],
-                institution_name=item['institutionName'],
-                starting_balance=float(item.get('startingBalance', 0)),
-                current_balance=float(item.get('currentBalance', 0)),
-                created_at=int(item.get('createdAt', 0)),
-                allocated_percent=item.get('allocatedPercent'),
-                linked_goals=item.get('linkedGoals', [])
-            )
+            return self._institution_from_item(item)
             
         except Exception as e:
-            logger.error(f"Error fetching institution {institution_id}: {str(e)}")
+            logger.error("Error fetching institution %s: %s", institution_id, e)
             raise
     
+    @traced('dynamodb.get_transactions')
     def get_transactions(
         self,
         institution_id: str,
@@ -145,85 +412,148 @@ class DynamoDBClient:
         Returns:
             List of Transaction objects
         """
+        transactions = list(self.iter_transactions(institution_id, user_id, start_date, end_date, limit))
+        
+        logger.info("Retrieved %d transactions for institution %s", len(transactions), institution_id)
+        return transactions
+    
+    def iter_transactions(
+        self,
+        institution_id: str,
+        user_id: Optional[str] = None,
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Transaction]:
+        """
+        Stream transactions for an institution as query pages arrive.
+        
+        Single-pass consumers can fold over this instead of holding the whole
+        list; only the current page is kept in memory.
+        
+        Args:
+            institution_id: Institution ID (partition key)
+            user_id: Filter by user ID
+            start_date: Start timestamp (inclusive)
+            end_date: End timestamp (inclusive)
+            limit: Maximum number of results
+            
+        Yields:
+            Transaction objects, newest createdAt first
+        """
         try:
-            # Build key condition — only the partition key.
-            # NOTE: `createdAt` (the sort key) is always set to insertion time, NOT the
-            # transaction's actual date.  Filtering by createdAt would exclude historical
-            # test transactions inserted recently.  We filter by `transactionDate` instead,
-            # using a FilterExpression applied after the partition-key scan.
-            key_condition = Key('institutionId').eq(institution_id)
-
-            # Build filter expressions
-            filter_parts = []
-            if start_date:
-                filter_parts.append(Attr('transactionDate').gte(start_date))
-            if end_date:
-                filter_parts.append(Attr('transactionDate').lte(end_date))
-            if user_id:
-                filter_parts.append(Attr('userId').eq(user_id))
-
-            combined_filter = None
-            for part in filter_parts:
-                combined_filter = part if combined_filter is None else combined_filter & part
-
-            # Build query parameters
-            query_params = {
-                'KeyConditionExpression': key_condition,
-                'ScanIndexForward': False  # Sort descending (newest createdAt first)
-            }
-
-            if combined_filter is not None:
-                query_params['FilterExpression'] = combined_filter
-
-            # Note: limit is intentionally NOT applied here because DynamoDB evaluates
-            # Limit before FilterExpression, which would silently drop matching items.
-            # Callers that need a hard cap should slice the returned list themselves.
+            for item in self._iter_transaction_items(institution_id, user_id, start_date, end_date, limit):
+                yield self._transaction_from_raw_item(item)
+            
+        except Exception as e:
+            logger.error("Error fetching transactions for institution %s: %s", institution_id, e)
+            raise
+    
+    @traced('dynamodb.get_transaction_columns')
+    def get_transaction_columns(
+        self,
+        institution_id: str,
+        user_id: Optional[str] = None,
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get transactions for an institution as NumPy columns instead of objects.
+        
+        Fills preallocated arrays in one pass over the raw items, fetching only
+        the attributes behind them and skipping the per-item Transaction
+        construction, for callers that aggregate over whole columns.
+        
+        Args:
+            institution_id: Institution ID (partition key)
+            user_id: Filter by user ID
+            start_date: Start timestamp (inclusive)
+            end_date: End timestamp (inclusive)
             
-            response = self.transactions_table.query(**query_params)
+        Returns:
+            Dictionary of equal-length arrays, newest createdAt first: type
+            (object), amount (float64) and transaction_date (int64)
+        """
+        try:
+            items = list(self._iter_transaction_items(
+                institution_id, user_id, start_date, end_date, None,
+                attributes=TRANSACTION_COLUMN_ATTRIBUTES
+            ))
             
-            transactions = []
-            for item in response.get('Items', []):
-                transaction = Transaction(
-                    institution_id=item['institutionId'],
-                    created_at=int(item['createdAt']),
-                    transaction_id=item['transactionId'],
-                    user_id=item['userId'],
-                    type=item['type'],
-                    amount=float(item['amount']),
-                    transaction_date=int(item.get('transactionDate', item['createdAt'])),
-                    tags=item.get('tags', []),
-                    description=item.get('description')
-                )
-                transactions.append(transaction)
-
-            # Handle DynamoDB pagination
-            while 'LastEvaluatedKey' in response:
-                query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
-                response = self.transactions_table.query(**query_params)
-                for item in response.get('Items', []):
-                    transactions.append(Transaction(
-                        institution_id=item['institutionId'],
-                        created_at=int(item['createdAt']),
-                        transaction_id=item['transactionId'],
-                        user_id=item['userId'],
-                        type=item['type'],
-                        amount=float(item['amount']),
-                        transaction_date=int(item.get('transactionDate', item['createdAt'])),
-                        tags=item.get('tags', []),
-                        description=item.get('description')
-                    ))
-
-            # Apply post-filter limit in Python (safe after FilterExpression is evaluated)
-            if limit:
-                transactions = transactions[:limit]
-
-            logger.info(f"Retrieved {len(transactions)} transactions for institution {institution_id}")
-            return transactions
+            n = len(items)
+            types = np.empty(n, dtype=object)
+            amounts = np.empty(n, dtype=np.float64)
+            dates = np.empty(n, dtype=np.int64)
+            for i, item in enumerate(items):
+                types[i] = item['type']['S']
+                amounts[i] = float(item['amount']['N'])
+                dates[i] = self._transaction_date_from_raw_item(item)
+            
+            logger.info("Retrieved %d transaction rows for institution %s", n, institution_id)
+            return {'type': types, 'amount': amounts, 'transaction_date': dates}
             
         except Exception as e:
-            logger.error(f"Error fetching transactions for institution {institution_id}: {str(e)}")
+            logger.error("Error fetching transaction columns for institution %s: %s", institution_id, e)
             raise
     
+    def _iter_transaction_items(
+        self,
+        institution_id: str,
+        user_id: Optional[str],
+        start_date: Optional[int],
+        end_date: Optional[int],
+        limit: Optional[int],
+        attributes: Tuple[str, ...] = TRANSACTION_ATTRIBUTES
+    ) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """
+        Query raw (wire format) transaction items for an institution.
+        
+        Args:
+            institution_id: Institution ID (partition key)
+            user_id: Filter by user ID
+            start_date: Start timestamp (inclusive)
+            end_date: End timestamp (inclusive)
+            limit: Maximum number of results
+            attributes: Attributes to project (every one Transaction needs by default)
+            
+        Returns:
+            Iterator over low-level item dictionaries, newest createdAt first
+        """
+        # Key condition is only the partition key.
+        # NOTE: `createdAt` (the sort key) is always set to insertion time, NOT the
+        # transaction's actual date.  Filtering by createdAt would exclude historical
+        # test transactions inserted recently.  We filter by `transactionDate` instead,
+        # using a FilterExpression applied after the partition-key scan.
+        query_params = {
+            'TableName': self.transactions_table_name,
+            'KeyConditionExpression': '#institutionId = :institutionId',
+            'ScanIndexForward': False,  # Sort descending (newest createdAt first)
+            **_projection(attributes)
+        }
+        values = {':institutionId': {'S': institution_id}}
+
+        # Build filter expressions (the low-level client takes expression strings)
+        filter_parts = []
+        if start_date:
+            filter_parts.append('#transactionDate >= :startDate')
+            values[':startDate'] = {'N': str(start_date)}
+        if end_date:
+            filter_parts.append('#transactionDate <= :endDate')
+            values[':endDate'] = {'N': str(end_date)}
+        if user_id:
+            filter_parts.append('#userId = :userId')
+            values[':userId'] = {'S': user_id}
+
+        if filter_parts:
+            query_params['FilterExpression'] = ' AND '.join(filter_parts)
+        query_params['ExpressionAttributeValues'] = values
+
+        # Note: limit is intentionally NOT passed to DynamoDB because it evaluates
+        # Limit before FilterExpression, which would silently drop matching items.
+        # Pagination stops once enough filtered items are in hand instead.
+        return self._iter_query(self.dynamodb_client.query, limit=limit, **query_params)
+    
+    @traced('dynamodb.get_all_user_transactions')
     def get_all_user_transactions(
         self,
         user_id: str,
@@ -239,69 +569,193 @@ class DynamoDBClient:
             end_date: End timestamp (inclusive)
             
         Returns:
-            List of Transaction objects
+            List of Transaction objects, newest first
         """
+        if self.user_transactions_index:
+            return self._query_user_transactions_index(user_id, start_date, end_date)
+        
         # First get all institutions for the user
         institutions = self.get_institutions(user_id)
+        return self.get_all_user_transactions_for(institutions, user_id, start_date, end_date)
+    
+    def _query_user_transactions_index(
+        self,
+        user_id: str,
+        start_date: Optional[int],
+        end_date: Optional[int]
+    ) -> List[Transaction]:
+        """
+        Get a user's transactions with one query on the (userId, transactionDate) GSI.
         
-        # Then fetch transactions for each institution
-        all_transactions = []
-        for institution in institutions:
-            transactions = self.get_transactions(
+        The date range becomes part of the key condition and the index returns
+        rows already ordered by transactionDate, so neither the per-institution
+        fan-out nor the final sort is needed.
+        
+        Args:
+            user_id: User ID from Cognito
+            start_date: Start timestamp (inclusive)
+            end_date: End timestamp (inclusive)
+            
+        Returns:
+            List of Transaction objects, newest first
+        """
+        try:
+            key_condition = '#userId = :userId'
+            values = {':userId': {'S': user_id}}
+            if start_date and end_date:
+                key_condition += ' AND #transactionDate BETWEEN :startDate AND :endDate'
+            elif start_date:
+                key_condition += ' AND #transactionDate >= :startDate'
+            elif end_date:
+                key_condition += ' AND #transactionDate <= :endDate'
+            if start_date:
+                values[':startDate'] = {'N': str(start_date)}
+            if end_date:
+                values[':endDate'] = {'N': str(end_date)}
+            
+            items = self._query_all(
+                self.dynamodb_client.query,
+                TableName=self.transactions_table_name,
+                IndexName=self.user_transactions_index,
+                KeyConditionExpression=key_condition,
+                ExpressionAttributeValues=values,
+                ScanIndexForward=False,  # Newest transactionDate first
+                **_projection(TRANSACTION_ATTRIBUTES)
+            )
+            
+            transactions = [self._transaction_from_raw_item(item) for item in items]
+            
+            logger.info("Retrieved %d total transactions for user %s from index", len(transactions), user_id)
+            return transactions
+            
+        except Exception as e:
+            logger.error("Error querying transactions index for user %s: %s", user_id, e)
+            raise
+    
+    @traced('dynamodb.get_all_user_transactions_for')
+    def get_all_user_transactions_for(
+        self,
+        institutions: List[Institution],
+        user_id: str,
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None
+    ) -> List[Transaction]:
+        """
+        Get all transactions for already-fetched institutions of a user.
+        
+        Callers that need the institutions themselves can fetch them once and
+        pass them here instead of querying them twice.
+        
+        Args:
+            institutions: The user's institutions
+            user_id: User ID from Cognito
+            start_date: Start timestamp (inclusive)
+            end_date: End timestamp (inclusive)
+            
+        Returns:
+            List of Transaction objects, newest first
+        """
+        # Then fetch transactions for each institution. Each query hits a different
+        # partition and the botocore client is thread-safe, so run them concurrently.
+        # The institutions were already resolved for this user and the institution
+        # partition only holds that user's transactions, so no userId filter is sent.
+        def fetch(institution: Institution) -> List[Transaction]:
+            return self.get_transactions(
                 institution_id=institution.institution_id,
-                user_id=user_id,
                 start_date=start_date,
                 end_date=end_date
             )
-            all_transactions.extend(transactions)
+        
+        all_transactions = []
+        if len(institutions) > 1:
+            max_workers = min(constants.DYNAMODB_MAX_QUERY_WORKERS, len(institutions))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map() keeps institution order, so ties in the sort below stay stable
+                for transactions in executor.map(fetch, institutions):
+                    all_transactions.extend(transactions)
+        else:
+            for institution in institutions:
+                all_transactions.extend(fetch(institution))
         
         # Sort by transaction_date descending
         all_transactions.sort(key=lambda t: t.transaction_date, reverse=True)
         
-        logger.info(f"Retrieved {len(all_transactions)} total transactions for user {user_id}")
+        logger.info("Retrieved %d total transactions for user %s", len(all_transactions), user_id)
         return all_transactions
     
+    @traced('dynamodb.get_user_financials')
+    def get_user_financials(
+        self,
+        user_id: str,
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None
+    ) -> Tuple[List[Institution], List[Transaction], List[Goal]]:
+        """
+        Get a user's institutions, transactions and goals with overlapping reads.
+        
+        With a transactions GSI configured the three reads are independent and
+        run concurrently. Otherwise the transaction queries need the
+        institutions first, and only the goals query runs alongside them.
+        
+        Args:
+            user_id: User ID from Cognito
+            start_date: Start timestamp for transactions (inclusive)
+            end_date: End timestamp for transactions (inclusive)
+            
+        Returns:
+            Tuple of (institutions, transactions newest first, goals)
+        """
+        if self.user_transactions_index:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                institutions_future = executor.submit(self.get_institutions, user_id)
+                goals_future = executor.submit(self.get_goals, user_id)
+                transactions = self._query_user_transactions_index(user_id, start_date, end_date)
+                return institutions_future.result(), transactions, goals_future.result()
+        
+        institutions = self.get_institutions(user_id)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            goals_future = executor.submit(self.get_goals, user_id)
+            transactions = self.get_all_user_transactions_for(institutions, user_id, start_date, end_date)
+            return institutions, transactions, goals_future.result()
+    
+    @traced('dynamodb.get_goals')
     def get_goals(self, user_id: str) -> List[Goal]:
         """
         Get all goals for a user.
         
+        Results are cached per user for DYNAMODB_USER_CACHE_TTL_SECONDS, so a
+        write made elsewhere can be missed for up to that long unless
+        ``invalidate_user`` is called.
+        
         Args:
             user_id: User ID from Cognito
             
         Returns:
             List of Goal objects
         """
+        return self._cached_for_user(self._goals_cache, user_id, self._query_goals)
+    
+    def _query_goals(self, user_id: str) -> List[Goal]:
+        """Query all goals for a user from DynamoDB."""
         try:
-            response = self.goals_table.query(
-                KeyConditionExpression=Key('userId').eq(user_id)
+            items = self._query_all(
+                self.goals_table.query,
+                KeyConditionExpression=_USER_KEY.eq(user_id),
+                **_projection(GOAL_ATTRIBUTES)
             )
             
             goals = []
-            for item in response.get('Items', []):
-                raw_linked = item.get('linkedInstitutions', {})
-                completed_at_raw = item.get('completedAt')
-                goal = Goal(
-                    user_id=item['userId'],
-                    goal_id=item['goalId'],
-                    name=item['name'],
-                    target_amount=float(item.get('targetAmount', 0)),
-                    created_at=int(item.get('createdAt', 0)),
-                    is_completed=item.get('isCompleted', False),
-                    is_active=item.get('isActive', True),
-                    description=item.get('description'),
-                    linked_institutions={k: float(v) for k, v in raw_linked.items()},
-                    linked_transactions=item.get('linkedTransactions', []),
-                    completed_at=int(completed_at_raw) if completed_at_raw is not None else None
-                )
-                goals.append(goal)
-            
-            logger.info(f"Retrieved {len(goals)} goals for user {user_id}")
+            for item in items:
+                goals.append(self._goal_from_item(item))
+            
+            logger.info("Retrieved %d goals for user %s", len(goals), user_id)
             return goals
             
         except Exception as e:
-            logger.error(f"Error fetching goals for user {user_id}: {str(e)}")
+            logger.error("Error fetching goals for user %s: %s", user_id, e)
             raise
     
+    @traced('dynamodb.get_goal')
     def get_goal(self, user_id: str, goal_id: str) -> Optional[Goal]:
         """
         Get a specific goal.
@@ -318,29 +772,186 @@ class DynamoDBClient:
                 Key={
                     'userId': user_id,
                     'goalId': goal_id
-                }
+                },
+                **_projection(GOAL_ATTRIBUTES)
             )
             
             item = response.get('Item')
             if not item:
                 return None
             
-            raw_linked = item.get('linkedInstitutions', {})
-            completed_at_raw = item.get('completedAt')
-            return Goal(
-                user_id=item['userId'],
-                goal_id=item['goalId'],
-                name=item['name'],
-                target_amount=float(item.get('targetAmount', 0)),
-                created_at=int(item.get('createdAt', 0)),
-                is_completed=item.get('isCompleted', False),
-                is_active=item.get('isActive', True),
-                description=item.get('description'),
-                linked_institutions={k: float(v) for k, v in raw_linked.items()},
-                linked_transactions=item.get('linkedTransactions', []),
-                completed_at=int(completed_at_raw) if completed_at_raw is not None else None
+            return self._goal_from_item(item)
+            
+        except Exception as e:
+            logger.error("Error fetching goal %s: %s", goal_id, e)
+            raise
+    
+    @traced('dynamodb.get_institutions_by_ids')
+    def get_institutions_by_ids(self, user_id: str, institution_ids: List[str]) -> List[Institution]:
+        """
+        Get several institutions with BatchGetItem instead of one GetItem each.
+        
+        Args:
+            user_id: User ID from Cognito
+            institution_ids: Institution IDs to fetch
+            
+        Returns:
+            Institution objects in the order requested (missing IDs are skipped)
+        """
+        try:
+            items = self._batch_get_items(
+                self.institutions_table_name,
+                'institutionId',
+                user_id,
+                institution_ids,
+                INSTITUTION_ATTRIBUTES
+            )
+            return [
+                self._institution_from_item(items[institution_id])
+                for institution_id in dict.fromkeys(institution_ids)
+                if institution_id in items
+            ]
+            
+        except Exception as e:
+            logger.error("Error batch fetching institutions for user %s: %s", user_id, e)
+            raise
+    
+    @traced('dynamodb.get_goals_by_ids')
+    def get_goals_by_ids(self, user_id: str, goal_ids: List[str]) -> List[Goal]:
+        """
+        Get several goals with BatchGetItem instead of one GetItem each.
+        
+        Args:
+            user_id: User ID from Cognito
+            goal_ids: Goal IDs to fetch
+            
+        Returns:
+            Goal objects in the order requested (missing IDs are skipped)
+        """
+        try:
+            items = self._batch_get_items(
+                self.goals_table_name,
+                'goalId',
+                user_id,
+                goal_ids,
+                GOAL_ATTRIBUTES
             )
+            return [
+                self._goal_from_item(items[goal_id])
+                for goal_id in dict.fromkeys(goal_ids)
+                if goal_id in items
+            ]
             
         except Exception as e:
-            logger.error(f"Error fetching goal {goal_id}: {str(e)}")
+            logger.error("Error batch fetching goals for user %s: %s", user_id, e)
             raise
+    
+    def _batch_get_items(
+        self,
+        table_name: str,
+        id_attribute: str,
+        user_id: str,
+        ids: List[str],
+        attributes: Tuple[str, ...]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch items keyed by (userId, id) in BatchGetItem requests of up to 100 keys.
+        
+        Unprocessed keys (throttling) are retried with exponential backoff.
+        
+        Args:
+            table_name: DynamoDB table name
+            id_attribute: Name of the sort key attribute
+            user_id: User ID (partition key)
+            ids: Sort key values; duplicates are ignored
+            attributes: Attributes to project
+            
+        Returns:
+            Dictionary mapping each found id to its raw item
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        items: Dict[str, Dict[str, Any]] = {}
+        
+        for start in range(0, len(unique_ids), constants.DYNAMODB_BATCH_GET_MAX_KEYS):
+            request = {
+                table_name: {
+                    'Keys': [
+                        {'userId': user_id, id_attribute: item_id}
+                        for item_id in unique_ids[start:start + constants.DYNAMODB_BATCH_GET_MAX_KEYS]
+                    ],
+                    **_projection(attributes)
+                }
+            }
+            
+            for attempt in range(constants.DYNAMODB_MAX_ATTEMPTS):
+                if attempt:
+                    time.sleep(constants.DYNAMODB_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+                
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(table_name, []):
+                    items[item[id_attribute]] = item
+                
+                request = response.get('UnprocessedKeys') or {}
+                if not request:
+                    break
+            
+            if request:
+                raise RuntimeError(f"BatchGetItem left keys unprocessed in {table_name}")
+        
+        return items
+    
+    @staticmethod
+    def _institution_from_item(item: Dict[str, Any]) -> Institution:
+        """Build an Institution from a DynamoDB item."""
+        return Institution(
+            user_id=item['userId'],
+            institution_id=item['institutionId'],
+            institution_name=item['institutionName'],
+            starting_balance=float(item.get('startingBalance', 0)),
+            current_balance=float(item.get('currentBalance', 0)),
+            created_at=int(item.get('createdAt', 0)),
+            allocated_percent=item.get('allocatedPercent'),
+            linked_goals=item.get('linkedGoals', [])
+        )
+    
+    @staticmethod
+    def _transaction_from_raw_item(item: Dict[str, Dict[str, Any]]) -> Transaction:
+        """Build a Transaction from a low-level (wire format) DynamoDB item."""
+        tags = item.get('tags')
+        description = item.get('description')
+        return Transaction(
+            institution_id=item['institutionId']['S'],
+            created_at=_number_to_int(item['createdAt']['N']),
+            transaction_id=item['transactionId']['S'],
+            user_id=item['userId']['S'],
+            type=item['type']['S'],
+            amount=float(item['amount']['N']),
+            transaction_date=DynamoDBClient._transaction_date_from_raw_item(item),
+            tags=_unmarshal(tags) if tags else [],
+            description=_unmarshal(description) if description else None
+        )
+    
+    @staticmethod
+    def _transaction_date_from_raw_item(item: Dict[str, Dict[str, Any]]) -> int:
+        """Read a raw item's transactionDate, falling back to createdAt for older rows."""
+        transaction_date = item.get('transactionDate')
+        return _number_to_int((transaction_date or item['createdAt'])['N'])
+    
+    @staticmethod
+    def _goal_from_item(item: Dict[str, Any]) -> Goal:
+        """Build a Goal from a DynamoDB item."""
+        raw_linked = item.get('linkedInstitutions', {})
+        completed_at_raw = item.get('completedAt')
+        return Goal(
+            user_id=item['userId'],
+            goal_id=item['goalId'],
+            name=item['name'],
+            target_amount=float(item.get('targetAmount', 0)),
+            created_at=int(item.get('createdAt', 0)),
+            is_completed=item.get('isCompleted', False),
+            is_active=item.get('isActive', True),
+            description=item.get('description'),
+            linked_institutions={k: float(v) for k, v in raw_linked.items()},
+            linked_transactions=item.get('linkedTransactions', []),
+            completed_at=int(completed_at_raw) if completed_at_raw is not None else None
+        )
@@ -3,8 +3,9 @@
 import json
 import logging
 import os
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+import threading
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Optional
 
 from src.analytics.cash_flow import CashFlowAnalytics
 from src.analytics.categories import CategoryAnalytics
@@ -13,20 +14,24 @@ from src.analytics.health_score import HealthScoreAnalytics
 from src.analytics.institutions import InstitutionAnalytics
 from src.analytics.network import NetworkAnalytics
 from src.data.dynamodb_client import DynamoDBClient
+from src.lambda_handlers.common import (
+    ANALYTICS_TYPES,
+    ANALYTICS_TYPES_STR,
+    UNDATED_ANALYTICS_TYPES,
+    get_db_client,
+    json_dumps,
+    json_loads,
+    validate_date_range,
+)
 from src.utils import date_utils
+from src.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# Valid analytics types
-ANALYTICS_TYPES = {
-    'cash_flow',
-    'categories',
-    'goals',
-    'institutions',
-    'network',
-    'health',
-}
+# Analytics instances bound to the shared DynamoDB client, one per class (see _get_analytics)
+_ANALYTICS_INSTANCES: Dict[type, Any] = {}
+_ANALYTICS_INSTANCES_LOCK = threading.Lock()
 
 
 def _get_environment() -> str:
@@ -69,7 +74,7 @@ def _build_response(status_code: int, body: Any) -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*',
         },
-        'body': json.dumps(body, default=str),
+        'body': json_dumps(body),
     }
 
 
@@ -85,31 +90,111 @@ def _validate_request(body: Dict[str, Any]) -> Optional[str]:
     if analytics_type not in ANALYTICS_TYPES:
         return (
             f"Invalid analyticsType '{analytics_type}'. "
-            f"Must be one of: {', '.join(sorted(ANALYTICS_TYPES))}"
+            f"Must be one of: {ANALYTICS_TYPES_STR}"
         )
 
-    # dateRange is not required for 'goals' (snapshot), 'institutions' (optional time window),
-    # or 'network' (all-time graph, not date-scoped)
-    if analytics_type not in ('goals', 'institutions', 'network'):
-        date_range = body.get('dateRange', {})
-        start_date = date_range.get('start')
-        end_date = date_range.get('end')
-        if not start_date or not end_date:
-            return "Missing required fields: dateRange.start and dateRange.end"
-
-        # Validate ISO date format
-        try:
-            datetime.strptime(start_date, '%Y-%m-%d')
-            datetime.strptime(end_date, '%Y-%m-%d')
-        except ValueError:
-            return "dateRange dates must be in YYYY-MM-DD format"
-
-        if start_date >= end_date:
-            return "dateRange.start must be before dateRange.end"
+    if analytics_type not in UNDATED_ANALYTICS_TYPES:
+        return validate_date_range(body.get('dateRange', {}))
 
     return None
 
 
+def _get_analytics(analytics_class: type, db_client: DynamoDBClient) -> Any:
+    """
+    Get the module-level instance of an analytics class bound to db_client.
+
+    Instances live across warm invocations, so result caches such as
+    InstitutionAnalytics' (keyed per user and data version) are reused; a new
+    instance is built when the DynamoDB client changes.
+    """
+    with _ANALYTICS_INSTANCES_LOCK:
+        analytics = _ANALYTICS_INSTANCES.get(analytics_class)
+        if analytics is None or analytics.db_client is not db_client:
+            analytics = analytics_class(db_client)
+            _ANALYTICS_INSTANCES[analytics_class] = analytics
+        return analytics
+
+
+def _run_cash_flow(
+    user_id: str, start_date: str, end_date: str, options: Dict[str, Any], db_client: DynamoDBClient
+) -> Dict[str, Any]:
+    """Run cash flow analytics."""
+    group_by = options.get('groupBy', 'month')
+    analytics = _get_analytics(CashFlowAnalytics, db_client)
+    return analytics.analyze(user_id, start_date, end_date, group_by=group_by)
+
+
+def _run_categories(
+    user_id: str, start_date: str, end_date: str, options: Dict[str, Any], db_client: DynamoDBClient
+) -> Dict[str, Any]:
+    """Run category analytics."""
+    analytics = _get_analytics(CategoryAnalytics, db_client)
+    return analytics.analyze(user_id, start_date, end_date)
+
+
+def _run_goals(
+    user_id: str, start_date: str, end_date: str, options: Dict[str, Any], db_client: DynamoDBClient
+) -> Dict[str, Any]:
+    """Run goal analytics (snapshot, no date range)."""
+    analytics = _get_analytics(GoalAnalytics, db_client)
+    return analytics.analyze(user_id)
+
+
+def _run_institutions(
+    user_id: str, start_date: str, end_date: str, options: Dict[str, Any], db_client: DynamoDBClient
+) -> Dict[str, Any]:
+    """Run institution analytics."""
+    analytics = _get_analytics(InstitutionAnalytics, db_client)
+    return analytics.analyze(user_id, start_date, end_date)
+
+
+def _run_network(
+    user_id: str, start_date: str, end_date: str, options: Dict[str, Any], db_client: DynamoDBClient
+) -> Dict[str, Any]:
+    """Run network analytics on the goal/institution graph."""
+    analytics = _get_analytics(NetworkAnalytics, db_client)
+    return analytics.analyze(user_id, graph_type='goal_institution')
+
+
+def _run_health(
+    user_id: str, start_date: str, end_date: str, options: Dict[str, Any], db_client: DynamoDBClient
+) -> Dict[str, Any]:
+    """
+    Run health score analytics.
+
+    HealthScoreAnalytics works with raw data (no DynamoDB dependency), so the
+    data is fetched here.
+    """
+    start_ts, end_ts = date_utils.get_date_range(start_date, end_date)
+    institutions, transactions, goals = db_client.get_user_financials(
+        user_id, start_date=start_ts, end_date=end_ts
+    )
+
+    period_days = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days
+
+    include_recommendations = options.get('includeRecommendations', True)
+    analytics = HealthScoreAnalytics()
+    return analytics.analyze(
+        transactions=transactions,
+        institutions=institutions,
+        goals=goals,
+        period_days=period_days,
+        include_recommendations=include_recommendations,
+    )
+
+
+# Analytics type -> runner; every runner takes (user_id, start_date, end_date, options, db_client)
+_ANALYTICS_RUNNERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    'cash_flow': _run_cash_flow,
+    'categories': _run_categories,
+    'goals': _run_goals,
+    'institutions': _run_institutions,
+    'network': _run_network,
+    'health': _run_health,
+}
+
+
+@traced('analytics.run')
 def _run_analytics(
     analytics_type: str,
     user_id: str,
@@ -132,54 +217,10 @@ def _run_analytics(
     Returns:
         Analytics result dictionary
     """
-    if analytics_type == 'cash_flow':
-        group_by = options.get('groupBy', 'month')
-        analytics = CashFlowAnalytics(db_client)
-        return analytics.analyze(user_id, start_date, end_date, group_by=group_by)
-
-    elif analytics_type == 'categories':
-        analytics = CategoryAnalytics(db_client)
-        return analytics.analyze(user_id, start_date, end_date)
-
-    elif analytics_type == 'goals':
-        analytics = GoalAnalytics(db_client)
-        return analytics.analyze(user_id)
-
-    elif analytics_type == 'institutions':
-        analytics = InstitutionAnalytics(db_client)
-        return analytics.analyze(user_id, start_date, end_date)
-
-    elif analytics_type == 'network':
-        analytics = NetworkAnalytics(db_client)
-        return analytics.analyze(user_id, graph_type='goal_institution')
-
-    elif analytics_type == 'health':
-        # HealthScoreAnalytics works with raw data (no DynamoDB dependency)
-        start_ts, end_ts = date_utils.get_date_range(start_date, end_date)
-        transactions = db_client.get_all_user_transactions(
-            user_id=user_id,
-            start_date=start_ts,
-            end_date=end_ts,
-        )
-        institutions = db_client.get_institutions(user_id)
-        goals = db_client.get_goals(user_id)
-
-        period_days = (
-            datetime.strptime(end_date, '%Y-%m-%d')
-            - datetime.strptime(start_date, '%Y-%m-%d')
-        ).days
-
-        include_recommendations = options.get('includeRecommendations', True)
-        analytics = HealthScoreAnalytics()
-        return analytics.analyze(
-            transactions=transactions,
-            institutions=institutions,
-            goals=goals,
-            period_days=period_days,
-            include_recommendations=include_recommendations,
-        )
-
-    raise ValueError(f"Unsupported analytics type: {analytics_type}")
+    runner = _ANALYTICS_RUNNERS.get(analytics_type)
+    if runner is None:
+        raise ValueError(f"Unsupported analytics type: {analytics_type}")
+    return runner(user_id, start_date, end_date, options, db_client)
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -206,7 +247,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     # --- Parse request body ---
     try:
         raw_body = event.get('body') or '{}'
-        body = json.loads(raw_body)
+        body = json_loads(raw_body)
     except json.JSONDecodeError as exc:
         return _build_response(400, {'error': f'Invalid JSON body: {exc}'})
 
@@ -221,16 +262,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     end_date = date_range.get('end')
     options = body.get('options', {})
 
-    logger.info(
-        f"Running {analytics_type} analytics for user {user_id} "
-        f"({start_date} → {end_date})" if start_date else
-        f"Running {analytics_type} analytics for user {user_id}"
-    )
+    if start_date:
+        logger.info("Running %s analytics for user %s (%s → %s)", analytics_type, user_id, start_date, end_date)
+    else:
+        logger.info("Running %s analytics for user %s", analytics_type, user_id)
 
     # --- Initialize DynamoDB client ---
     environment = _get_environment()
     try:
-        db_client = DynamoDBClient(environment=environment)
+        db_client = get_db_client(environment)
     except Exception as exc:
         logger.error(f"Failed to initialize DynamoDB client: {exc}")
         return _build_response(500, {'error': 'Failed to connect to database'})
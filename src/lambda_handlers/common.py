@@ -0,0 +1,125 @@
+"""Helpers shared by the analytics and report Lambda handlers."""
+
+import json
+import re
+import threading
+from datetime import date
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON codec; stdlib json is used without it
+    orjson = None
+
+from src.data.dynamodb_client import DynamoDBClient
+
+# Valid analyticsType values for POST /api/analytics/generate
+ANALYTICS_TYPES = frozenset({
+    'cash_flow',
+    'categories',
+    'goals',
+    'institutions',
+    'network',
+    'health',
+})
+ANALYTICS_TYPES_STR = ', '.join(sorted(ANALYTICS_TYPES))
+
+# Types that take no dateRange: 'goals' (snapshot), 'institutions' (optional
+# time window) and 'network' (all-time graph, not date-scoped)
+UNDATED_ANALYTICS_TYPES = frozenset({'goals', 'institutions', 'network'})
+
+# Valid reportType values for POST /api/analytics/report
+REPORT_TYPES = frozenset({
+    'cash_flow',
+    'category',
+    'goal',
+    'network',
+    'health_score',
+    'comprehensive',
+})
+REPORT_TYPES_STR = ', '.join(sorted(REPORT_TYPES))
+
+# Types that take no dateRange: 'goal' (snapshot) and 'network' (all-time)
+UNDATED_REPORT_TYPES = frozenset({'goal', 'network'})
+
+# orjson equivalents of json.dumps' int-key coercion, plus native NumPy scalars
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson else 0
+
+# Strict YYYY-MM-DD layout for dateRange values
+_ISO_DATE_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+
+# DynamoDB client reused across warm Lambda invocations (created on first use)
+_DB_CLIENT: Optional[DynamoDBClient] = None
+_DB_CLIENT_LOCK = threading.Lock()
+
+
+def get_db_client(environment: str) -> DynamoDBClient:
+    """
+    Get the module-level DynamoDB client, creating it on first use.
+
+    Reusing one client keeps botocore's connection pool, TLS sessions and
+    resolved credentials warm between invocations of the same container.
+    Both handlers share it when they run in the same process.
+    """
+    global _DB_CLIENT
+    with _DB_CLIENT_LOCK:
+        if _DB_CLIENT is None or _DB_CLIENT.environment != environment:
+            _DB_CLIENT = DynamoDBClient(environment=environment)
+        return _DB_CLIENT
+
+
+def json_dumps(body: Any, sort_keys: bool = False) -> str:
+    """Serialize a body, using orjson when it is installed."""
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPTIONS
+        return orjson.dumps(body, default=str, option=option).decode('utf-8')
+    return json.dumps(body, sort_keys=sort_keys, default=str)
+
+
+def json_loads(raw: str) -> Any:
+    """
+    Parse a request body, using orjson when it is installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+    the stdlib exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def is_iso_date(value: Any) -> bool:
+    """
+    Check that value is a YYYY-MM-DD string naming a real calendar date.
+
+    The regex pins the zero-padded layout (so the string comparison of start
+    and end is chronological); date.fromisoformat then rejects values such as
+    2025-13-40 without strptime's format parsing.
+    """
+    if not isinstance(value, str) or not _ISO_DATE_RE.fullmatch(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def validate_date_range(date_range: Dict[str, Any]) -> Optional[str]:
+    """
+    Validate a request's dateRange object.
+
+    Returns an error message string if invalid, otherwise None.
+    """
+    start_date = date_range.get('start')
+    end_date = date_range.get('end')
+    if not start_date or not end_date:
+        return "Missing required fields: dateRange.start and dateRange.end"
+
+    if not (is_iso_date(start_date) and is_iso_date(end_date)):
+        return "dateRange dates must be in YYYY-MM-DD format"
+
+    if start_date >= end_date:
+        return "dateRange.start must be before dateRange.end"
+
+    return None
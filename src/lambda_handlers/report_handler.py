@@ -1,35 +1,59 @@
 """Lambda handler for POST /api/analytics/report."""
 
+import gzip
+import hashlib
+import io
 import json
 import logging
 import os
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-
-from src.analytics.cash_flow import CashFlowAnalytics
-from src.analytics.categories import CategoryAnalytics
-from src.analytics.goals import GoalAnalytics
-from src.analytics.health_score import HealthScoreAnalytics
-from src.analytics.institutions import InstitutionAnalytics
-from src.analytics.network import NetworkAnalytics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+
 from src.data.dynamodb_client import DynamoDBClient
+from src.lambda_handlers.common import (
+    REPORT_TYPES,
+    REPORT_TYPES_STR,
+    UNDATED_REPORT_TYPES,
+    get_db_client,
+    json_dumps,
+    json_loads,
+    validate_date_range,
+)
 from src.utils import date_utils
-from src.visualization.charts import ChartGenerator
-from src.visualization.reports import ReportGenerator
+from src.utils.cache import TTLCache
+from src.utils.constants import (
+    CHART_CACHE_MAX_ENTRIES,
+    REPORT_CACHE_PAST_TTL_SECONDS,
+    REPORT_CACHE_TTL_SECONDS,
+)
+from src.utils.tracing import traced
 from src.visualization.s3_uploader import S3Uploader
 
+# Analytics and Plotly-based visualization modules are imported where they are
+# used, so a cold start (and a cached-report hit) only loads what it needs
+if TYPE_CHECKING:
+    from src.visualization.charts import ChartGenerator
+    from src.visualization.reports import ReportGenerator
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# Valid report types
-REPORT_TYPES = {
-    'cash_flow',
-    'category',
-    'goal',
-    'network',
-    'health_score',
-    'comprehensive',
-}
+# Sections of a comprehensive report, in page order
+COMPREHENSIVE_SECTIONS = ('cash_flow', 'category', 'goal', 'health_score')
+
+# Built Plotly figures keyed by chart method and inputs (see _cached_chart);
+# sections run concurrently in comprehensive reports, hence the lock
+_CHART_CACHE = TTLCache(maxsize=CHART_CACHE_MAX_ENTRIES)
+_CHART_CACHE_LOCK = threading.Lock()
+
+# S3 uploader and chart/report generators, kept for warm invocations
+_S3_UPLOADER: Optional[S3Uploader] = None
+_S3_UPLOADER_LOCK = threading.Lock()
+_GENERATORS: Optional[Tuple['ChartGenerator', 'ReportGenerator']] = None
+_GENERATORS_LOCK = threading.Lock()
 
 
 def _get_environment() -> str:
@@ -37,6 +61,68 @@ def _get_environment() -> str:
     return os.environ.get('ENVIRONMENT', 'devl')
 
 
+def _get_s3_uploader(bucket_name: str) -> S3Uploader:
+    """Get the module-level S3 uploader, creating it on first use."""
+    global _S3_UPLOADER
+    uploader = _S3_UPLOADER
+    if uploader is not None and uploader.bucket_name == bucket_name:
+        return uploader
+    with _S3_UPLOADER_LOCK:
+        if _S3_UPLOADER is None or _S3_UPLOADER.bucket_name != bucket_name:
+            _S3_UPLOADER = S3Uploader(bucket_name=bucket_name)
+        return _S3_UPLOADER
+
+
+def _get_generators() -> Tuple['ChartGenerator', 'ReportGenerator']:
+    """
+    Get the module-level chart and report generators, creating them on first use.
+
+    Both are stateless between calls. They are imported here rather than at
+    module scope so requests that never render (cache hits, validation
+    errors) do not load Plotly and Jinja2.
+    """
+    global _GENERATORS
+    generators = _GENERATORS
+    if generators is not None:
+        return generators
+    with _GENERATORS_LOCK:
+        if _GENERATORS is None:
+            from src.visualization.charts import ChartGenerator
+            from src.visualization.reports import ReportGenerator
+
+            _GENERATORS = (ChartGenerator(), ReportGenerator())
+        return _GENERATORS
+
+
+def _cached_chart(chart_gen: 'ChartGenerator', method: str, **kwargs: Any) -> Any:
+    """
+    Build a chart with chart_gen, reusing an identical figure built recently.
+
+    Constructing and validating a Plotly figure costs tens of milliseconds, far
+    more than hashing its inputs, and the same charts recur when a user's
+    single and comprehensive reports cover the same data. Figures are only
+    read after construction, so cached ones are shared as-is.
+
+    Args:
+        chart_gen: Chart generator
+        method: ChartGenerator method name, e.g. 'create_pie_chart'
+        **kwargs: Arguments for that method
+
+    Returns:
+        Plotly figure
+    """
+    payload = json_dumps(kwargs, sort_keys=True).encode('utf-8')
+    key = (method, hashlib.sha1(payload).digest())
+
+    with _CHART_CACHE_LOCK:
+        fig = _CHART_CACHE.get(key)
+    if fig is None:
+        fig = getattr(chart_gen, method)(**kwargs)
+        with _CHART_CACHE_LOCK:
+            _CHART_CACHE.set(key, fig)
+    return fig
+
+
 def _get_s3_bucket() -> str:
     """Get S3 bucket name from env variable."""
     return os.environ.get('ANALYTICS_S3_BUCKET', f"cpsc-analytics-{_get_environment()}")
@@ -61,28 +147,49 @@ def _save_report_locally(
     caller does not need to branch on local vs remote.
     """
     now = datetime.now(timezone.utc)
-    timestamp = int(now.timestamp())
-    date_path = now.strftime('%Y/%m/%d')
-    filename = f"{report_type}_report_{timestamp}.html"
-    key = f"reports/{user_id}/{date_path}/{filename}"
+    key = f"reports/{user_id}/{now:%Y/%m/%d}/{report_type}_report_{int(now.timestamp())}.html"
 
-    full_dir = os.path.join(reports_dir, os.path.dirname(key))
-    os.makedirs(full_dir, exist_ok=True)
-    full_path = os.path.join(reports_dir, key)
+    full_path = Path(reports_dir, key).resolve()
+    full_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(full_path, 'w', encoding='utf-8') as fh:
+    # Comprehensive reports run to megabytes; a large buffer keeps writes few
+    with open(full_path, 'w', encoding='utf-8', buffering=1 << 20) as fh:
         fh.write(html_content)
 
-    abs_path = os.path.abspath(full_path).replace('\\', '/')
-    logger.info(f"Report saved locally: {abs_path}")
+    logger.info(f"Report saved locally: {full_path}")
 
     return {
-        'presigned_url': f"file:///{abs_path}",
+        # as_uri() yields a valid file:// URL for both POSIX and drive-letter paths
+        'presigned_url': full_path.as_uri(),
         'key': key,
         'bucket': reports_dir,
     }
 
 
+def _report_cache_key(
+    user_id: str,
+    report_type: str,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    options: Dict[str, Any],
+) -> str:
+    """Hash the inputs that determine a report's HTML into its cache key."""
+    raw = f"{user_id}|{report_type}|{start_date}|{end_date}|{json.dumps(options, sort_keys=True, default=str)}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _report_cache_ttl(end_date: Optional[str]) -> int:
+    """
+    Return how long a rendered report stays fresh.
+
+    Reports over past periods only change when old data is edited, so they
+    are kept for a day; snapshots and ranges reaching today for an hour.
+    """
+    if end_date and end_date < datetime.now(timezone.utc).date().isoformat():
+        return REPORT_CACHE_PAST_TTL_SECONDS
+    return REPORT_CACHE_TTL_SECONDS
+
+
 def _get_user_id_from_event(event: Dict[str, Any]) -> Optional[str]:
     """
     Extract user_id from Cognito JWT claims in the API Gateway event.
@@ -117,10 +224,31 @@ def _build_response(status_code: int, body: Any) -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*',
         },
-        'body': json.dumps(body, default=str),
+        'body': json_dumps(body),
     }
 
 
+def _build_report_body(
+    report_type: str,
+    user_id: str,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    upload_result: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Build the success response body for a stored report."""
+    response_body = {
+        'reportType': report_type,
+        'userId': user_id,
+        'generatedAt': datetime.now(timezone.utc).isoformat(),
+        'reportUrl': upload_result.get('presigned_url'),
+        's3Key': upload_result.get('key'),
+        'bucket': upload_result.get('bucket'),
+    }
+    if start_date and end_date:
+        response_body['dateRange'] = {'start': start_date, 'end': end_date}
+    return response_body
+
+
 def _validate_request(body: Dict[str, Any]) -> Optional[str]:
     """
     Validate request body.
@@ -133,29 +261,16 @@ def _validate_request(body: Dict[str, Any]) -> Optional[str]:
     if report_type not in REPORT_TYPES:
         return (
             f"Invalid reportType '{report_type}'. "
-            f"Must be one of: {', '.join(sorted(REPORT_TYPES))}"
+            f"Must be one of: {REPORT_TYPES_STR}"
         )
 
-    # dateRange is not required for 'goal' (snapshot) or 'network' (all-time)
-    if report_type not in ('goal', 'network'):
-        date_range = body.get('dateRange', {})
-        start_date = date_range.get('start')
-        end_date = date_range.get('end')
-        if not start_date or not end_date:
-            return "Missing required fields: dateRange.start and dateRange.end"
-
-        try:
-            datetime.strptime(start_date, '%Y-%m-%d')
-            datetime.strptime(end_date, '%Y-%m-%d')
-        except ValueError:
-            return "dateRange dates must be in YYYY-MM-DD format"
-
-        if start_date >= end_date:
-            return "dateRange.start must be before dateRange.end"
+    if report_type not in UNDATED_REPORT_TYPES:
+        return validate_date_range(body.get('dateRange', {}))
 
     return None
 
 
+@traced('report.generate')
 def _generate_single_report(
     report_type: str,
     user_id: str,
@@ -163,8 +278,8 @@ def _generate_single_report(
     end_date: str,
     options: Dict[str, Any],
     db_client: DynamoDBClient,
-    chart_gen: ChartGenerator,
-    report_gen: ReportGenerator,
+    chart_gen: 'ChartGenerator',
+    report_gen: 'ReportGenerator',
 ) -> str:
     """
     Generate HTML for a single report type.
@@ -175,6 +290,7 @@ def _generate_single_report(
     user_name = options.get('userName')
 
     if report_type == 'cash_flow':
+        from src.analytics.cash_flow import CashFlowAnalytics
         analytics = CashFlowAnalytics(db_client)
         data = analytics.analyze(user_id, start_date, end_date)
         charts: List = []
@@ -184,7 +300,8 @@ def _generate_single_report(
             deposits = [p.get('total_deposits', 0) for p in periods]
             withdrawals = [p.get('total_withdrawals', 0) for p in periods]
             charts.append(
-                chart_gen.create_stacked_bar_chart(
+                _cached_chart(
+                    chart_gen, 'create_stacked_bar_chart',
                     categories=labels,
                     series={'Deposits': deposits, 'Withdrawals': withdrawals},
                     title='Cash Flow Over Time',
@@ -193,6 +310,7 @@ def _generate_single_report(
         return report_gen.generate_cash_flow_report(data, charts, user_name=user_name)
 
     elif report_type == 'category':
+        from src.analytics.categories import CategoryAnalytics
         analytics = CategoryAnalytics(db_client)
         data = analytics.analyze(user_id, start_date, end_date)
         charts = []
@@ -200,34 +318,36 @@ def _generate_single_report(
         if top_cats:
             labels = [c.get('name') for c in top_cats[:10]]
             values = [c.get('amount', 0) for c in top_cats[:10]]
-            charts.append(chart_gen.create_pie_chart(labels=labels, values=values, title='Spending by Category'))
+            charts.append(_cached_chart(
+                chart_gen, 'create_pie_chart', labels=labels, values=values, title='Spending by Category'
+            ))
         return report_gen.generate_category_report(data, charts, user_name=user_name)
 
     elif report_type == 'goal':
+        from src.analytics.goals import GoalAnalytics
         analytics = GoalAnalytics(db_client)
         data = analytics.analyze(user_id)
         charts = []
-        goals = data.get('goals', [])
-        if goals:
-            # Use unique labels: append index when goal names collide so Plotly
-            # does not merge duplicate category names and stack their values.
-            name_counts: dict = {}
-            unique_labels = []
-            for g in goals:
-                name = g.get('name', 'Unknown')
-                if name in name_counts:
-                    name_counts[name] += 1
-                    unique_labels.append(f"{name} ({name_counts[name]})")
-                else:
-                    name_counts[name] = 1
-                    unique_labels.append(name)
-            values = [g.get('progress_percent', 0) for g in goals]
+        # Use unique labels: append index when goal names collide so Plotly
+        # does not merge duplicate category names and stack their values.
+        # Labels, values and colors are collected in a single pass.
+        name_counts: Dict[str, int] = {}
+        unique_labels: List[str] = []
+        values = []
+        bar_colors: List[str] = []
+        for g in data.get('goals', []):
+            name = g.get('name', 'Unknown')
+            count = name_counts.get(name, 0) + 1
+            name_counts[name] = count
+            unique_labels.append(name if count == 1 else f"{name} ({count})")
+            values.append(g.get('progress_percent', 0))
             # Green for complete/inactive goals, red for in-progress ones
-            bar_colors = [
+            bar_colors.append(
                 '#28a745' if (g.get('is_completed') or not g.get('is_active', True)) else '#dc3545'
-                for g in goals
-            ]
-            charts.append(chart_gen.create_bar_chart(
+            )
+        if unique_labels:
+            charts.append(_cached_chart(
+                chart_gen, 'create_bar_chart',
                 categories=unique_labels,
                 values=values,
                 title='Goal Progress (%)',
@@ -239,6 +359,7 @@ def _generate_single_report(
         return report_gen.generate_goal_report(data, charts, user_name=user_name, goal_labels=unique_labels)
 
     elif report_type == 'network':
+        from src.analytics.network import NetworkAnalytics
         analytics = NetworkAnalytics(db_client)
         data = analytics.analyze(user_id, graph_type='goal_institution')
         charts = []
@@ -246,7 +367,8 @@ def _generate_single_report(
         edges = data.get('edges', [])
         if nodes:
             charts.append(
-                chart_gen.create_network_graph(
+                _cached_chart(
+                    chart_gen, 'create_network_graph',
                     nodes=nodes,
                     edges=edges,
                     title='Financial Network Graph',
@@ -265,12 +387,23 @@ def _generate_single_report(
         id_to_name = {str(n['id']): _node_label(n) for n in nodes}
 
         # --- Section 1: institution → goal flows from graph edges ---
-        sankey_edges = [e for e in edges if e.get('attributes', {}).get('weight', 0) > 0]
-        logger.info(f"Network: {len(nodes)} nodes, {len(edges)} edges, {len(sankey_edges)} weighted edges for Sankey")
-
-        sankey_sources = [id_to_name.get(str(e['source']), str(e['source'])) for e in sankey_edges]
-        sankey_targets = [id_to_name.get(str(e['target']), str(e['target'])) for e in sankey_edges]
-        sankey_values  = [float(e['attributes']['weight']) for e in sankey_edges]
+        # Filter to weighted edges in the same pass, reading each edge's
+        # attributes once (and without a placeholder dict when absent)
+        sankey_sources: List[str] = []
+        sankey_targets: List[str] = []
+        sankey_values: List[float] = []
+        for e in edges:
+            attrs = e.get('attributes')
+            weight = attrs.get('weight', 0) if attrs else 0
+            if weight <= 0:
+                continue
+            source = str(e['source'])
+            target = str(e['target'])
+            sankey_sources.append(id_to_name.get(source, source))
+            sankey_targets.append(id_to_name.get(target, target))
+            sankey_values.append(float(weight))
+        goal_flow_count = len(sankey_values)
+        logger.info(f"Network: {len(nodes)} nodes, {len(edges)} edges, {goal_flow_count} weighted edges for Sankey")
 
         # --- Section 2: institution → spending-category flows for non-goal transactions ---
         # Build institution-id → display label map from the already-fetched nodes
@@ -301,13 +434,14 @@ def _generate_single_report(
             sankey_values.append(amount)
 
         logger.info(
-            f"Sankey totals — {len(sankey_edges)} goal flows, "
+            f"Sankey totals — {goal_flow_count} goal flows, "
             f"{len(spending)} non-goal spending flows"
         )
 
         if sankey_sources:
             charts.append(
-                chart_gen.create_sankey_diagram(
+                _cached_chart(
+                    chart_gen, 'create_sankey_diagram',
                     sources=sankey_sources,
                     targets=sankey_targets,
                     values=sankey_values,
@@ -320,16 +454,12 @@ def _generate_single_report(
         return report_gen.generate_network_report(data, charts, user_name=user_name)
 
     elif report_type == 'health_score':
+        from src.analytics.health_score import HealthScoreAnalytics
         start_ts, end_ts = date_utils.get_date_range(start_date, end_date)
-        transactions = db_client.get_all_user_transactions(
-            user_id=user_id, start_date=start_ts, end_date=end_ts
+        institutions, transactions, goals = db_client.get_user_financials(
+            user_id, start_date=start_ts, end_date=end_ts
         )
-        institutions = db_client.get_institutions(user_id)
-        goals = db_client.get_goals(user_id)
-        period_days = (
-            datetime.strptime(end_date, '%Y-%m-%d')
-            - datetime.strptime(start_date, '%Y-%m-%d')
-        ).days
+        period_days = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days
         analytics = HealthScoreAnalytics()
         data = analytics.analyze(
             transactions=transactions,
@@ -342,7 +472,8 @@ def _generate_single_report(
         # Gauge chart for overall score
         overall_score = data.get('overall_score', 0)
         charts.append(
-            chart_gen.create_gauge_chart(
+            _cached_chart(
+                chart_gen, 'create_gauge_chart',
                 value=overall_score,
                 title='Financial Health Score',
                 max_value=100,
@@ -354,7 +485,8 @@ def _generate_single_report(
             radar_cats = [k.replace('_', ' ').title() for k in components.keys()]
             radar_vals = [v.get('score', 0) for v in components.values()]
             charts.append(
-                chart_gen.create_radar_chart(
+                _cached_chart(
+                    chart_gen, 'create_radar_chart',
                     categories=radar_cats,
                     values=radar_vals,
                     title='Score Dimensions',
@@ -365,26 +497,34 @@ def _generate_single_report(
     raise ValueError(f"Unsupported report type: {report_type}")
 
 
+@traced('report.generate_comprehensive')
 def _generate_comprehensive_report(
     user_id: str,
     start_date: str,
     end_date: str,
     options: Dict[str, Any],
     db_client: DynamoDBClient,
-    chart_gen: ChartGenerator,
-    report_gen: ReportGenerator,
-) -> str:
+    chart_gen: 'ChartGenerator',
+    report_gen: 'ReportGenerator',
+    gzip_output: bool = False,
+) -> Union[str, bytes]:
     """
     Generate a comprehensive multi-section HTML report.
 
     Combines cash_flow, category, goal, and health_score sections.
+
+    Returns:
+        HTML string, or the gzip-compressed UTF-8 HTML when gzip_output is set
     """
     user_name = options.get('userName', 'User')
     sections_html = []
 
-    for rtype in ['cash_flow', 'category', 'goal', 'health_score']:
-        try:
-            section_html = _generate_single_report(
+    # Sections spend most of their time waiting on DynamoDB, so generate them
+    # concurrently; the shared clients and generators are safe across threads
+    with ThreadPoolExecutor(max_workers=len(COMPREHENSIVE_SECTIONS)) as executor:
+        futures = {
+            rtype: executor.submit(
+                _generate_single_report,
                 report_type=rtype,
                 user_id=user_id,
                 start_date=start_date,
@@ -394,16 +534,39 @@ def _generate_comprehensive_report(
                 chart_gen=chart_gen,
                 report_gen=report_gen,
             )
-            sections_html.append(section_html)
-        except Exception as exc:
-            logger.warning(f"Skipping {rtype} section in comprehensive report: {exc}")
+            for rtype in COMPREHENSIVE_SECTIONS
+        }
+        for rtype in COMPREHENSIVE_SECTIONS:
+            try:
+                sections_html.append(futures[rtype].result())
+            except Exception as exc:
+                logger.warning(f"Skipping {rtype} section in comprehensive report: {exc}")
 
     if not sections_html:
         raise RuntimeError("No report sections could be generated")
 
-    # Wrap all sections in a single HTML page
+    parts = _comprehensive_page_parts(user_name, start_date, end_date, sections_html)
+    if not gzip_output:
+        return ''.join(parts)
+
+    # Stream the page through gzip piece by piece rather than first joining
+    # the (Plotly-heavy) sections into one large string
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=6) as gz:
+        for part in parts:
+            gz.write(part.encode('utf-8'))
+    return buf.getvalue()
+
+
+def _comprehensive_page_parts(
+    user_name: str,
+    start_date: str,
+    end_date: str,
+    sections_html: List[str],
+) -> Iterator[str]:
+    """Yield the comprehensive report page in order, one section at a time."""
     now_str = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
-    combined = f"""<!DOCTYPE html>
+    yield f"""<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="UTF-8">
@@ -419,12 +582,16 @@ body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans
 <h1 style="font-size:2.5em;">Comprehensive Financial Report</h1>
 <p>Generated for: {user_name} | {now_str} | Period: {start_date} to {end_date}</p>
 </div>
-{'<hr class="section-divider">'.join(
-    f'<div class="report-section">{html}</div>' for html in sections_html
-)}
+"""
+    for i, html in enumerate(sections_html):
+        if i:
+            yield '<hr class="section-divider">'
+        yield '<div class="report-section">'
+        yield html
+        yield '</div>'
+    yield """
 </body>
 </html>"""
-    return combined
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -460,7 +627,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     # --- Parse request body ---
     try:
         raw_body = event.get('body') or '{}'
-        body = json.loads(raw_body)
+        body = json_loads(raw_body)
     except json.JSONDecodeError as exc:
         return _build_response(400, {'error': f'Invalid JSON body: {exc}'})
 
@@ -485,25 +652,37 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     bucket_name = _get_s3_bucket()
 
     try:
-        db_client = DynamoDBClient(environment=environment)
+        db_client = get_db_client(environment)
     except Exception as exc:
         logger.error(f"Failed to initialize DynamoDB client: {exc}")
         return _build_response(500, {'error': 'Failed to connect to database'})
 
-    chart_gen = ChartGenerator()
-    report_gen = ReportGenerator()
-
     local_reports_dir = _get_local_reports_dir()
     if local_reports_dir:
         s3_uploader = None
     else:
         try:
-            s3_uploader = S3Uploader(bucket_name=bucket_name)
+            s3_uploader = _get_s3_uploader(bucket_name)
         except Exception as exc:
             logger.error(f"Failed to initialize S3 uploader: {exc}")
             return _build_response(500, {'error': 'Failed to initialize storage client'})
 
+    # --- Serve a recently rendered copy of the same report ---
+    use_cache = s3_uploader is not None and not options.get('noCache')
+    if use_cache:
+        cache_key = _report_cache_key(user_id, report_type, start_date, end_date, options)
+        try:
+            cached = s3_uploader.get_cached_report(cache_key, _report_cache_ttl(end_date))
+        except Exception as exc:
+            logger.warning(f"Report cache lookup failed: {exc}")
+            cached = None
+        if cached:
+            logger.info(f"Serving cached {report_type} report {cached['key']}")
+            return _build_response(200, _build_report_body(report_type, user_id, start_date, end_date, cached))
+
     # --- Generate report HTML ---
+    chart_gen, report_gen = _get_generators()
+
     try:
         if report_type == 'comprehensive':
             html_content = _generate_comprehensive_report(
@@ -514,6 +693,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 db_client=db_client,
                 chart_gen=chart_gen,
                 report_gen=report_gen,
+                # Comprehensive reports inline four sections of Plotly JSON
+                # and shrink several-fold when gzipped; local copies stay plain
+                gzip_output=not local_reports_dir,
             )
         else:
             html_content = _generate_single_report(
@@ -551,21 +733,16 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 html_content=html_content,
                 user_id=user_id,
                 report_type=report_type,
+                content_encoding='gzip' if isinstance(html_content, bytes) else None,
             )
         except Exception as exc:
             logger.error(f"S3 upload failed: {exc}", exc_info=True)
             return _build_response(500, {'error': 'Failed to store report'})
 
-    # --- Build response ---
-    response_body = {
-        'reportType': report_type,
-        'userId': user_id,
-        'generatedAt': datetime.now(timezone.utc).isoformat(),
-        'reportUrl': upload_result.get('presigned_url'),
-        's3Key': upload_result.get('key'),
-        'bucket': upload_result.get('bucket'),
-    }
-    if start_date and end_date:
-        response_body['dateRange'] = {'start': start_date, 'end': end_date}
+        if use_cache:
+            try:
+                s3_uploader.cache_report(upload_result['key'], cache_key)
+            except Exception as exc:
+                logger.warning(f"Failed to cache report: {exc}")
 
-    return _build_response(200, response_body)
+    return _build_response(200, _build_report_body(report_type, user_id, start_date, end_date, upload_result))
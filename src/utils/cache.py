@@ -0,0 +1,81 @@
+"""In-process caching utilities."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from .constants import CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(
+        self,
+        maxsize: int = CACHE_MAX_ENTRIES,
+        ttl: float = CACHE_TTL_SECONDS,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the least recently used
+            ttl: Seconds an entry stays valid after it is stored
+            timer: Clock used for expiry (injectable for tests)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if self._timer() >= expires_at:
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = (self._timer() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
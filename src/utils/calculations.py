@@ -1,11 +1,34 @@
-"""Financial calculation utilities."""
+"""
+Financial calculation utilities.
 
-from typing import List, Dict, Tuple
+Functions taking a list of numbers also accept a NumPy array. Arrays are
+reduced with NumPy directly, so callers holding arrays need not convert them
+with .tolist() first.
+"""
+
+from typing import List, Dict, Sequence, Tuple, Union
+import math
 import statistics
 from collections import defaultdict
+from fractions import Fraction
+
+import numpy as np
+
+# Floats at or above 2**52 cannot hold a fractional part
+_FLOAT_EXACT_INT_LIMIT = 2.0 ** 52
+
+# Numeric inputs: a list/sequence of numbers or a 1-D NumPy array
+Values = Union[Sequence[float], np.ndarray]
 
 
-def calculate_net_flow(deposits: List[float], withdrawals: List[float]) -> float:
+def _total(values: Values) -> float:
+    """Sum values, using NumPy's reduction for arrays."""
+    if isinstance(values, np.ndarray):
+        return float(values.sum())
+    return sum(values)
+
+
+def calculate_net_flow(deposits: Values, withdrawals: Values) -> float:
     """
     Calculate net cash flow.
     
@@ -16,12 +39,10 @@ def calculate_net_flow(deposits: List[float], withdrawals: List[float]) -> float
     Returns:
         Net flow (deposits - withdrawals)
     """
-    total_deposits = sum(deposits) if deposits else 0
-    total_withdrawals = sum(withdrawals) if withdrawals else 0
-    return total_deposits - total_withdrawals
+    return _total(deposits) - _total(withdrawals)
 
 
-def calculate_average(values: List[float]) -> float:
+def calculate_average(values: Values) -> float:
     """
     Calculate average of values.
     
@@ -31,10 +52,12 @@ def calculate_average(values: List[float]) -> float:
     Returns:
         Average value or 0 if empty
     """
-    return statistics.mean(values) if values else 0.0
+    if len(values) == 0:
+        return 0.0
+    return float(np.mean(np.asarray(values, dtype=np.float64)))
 
 
-def calculate_median(values: List[float]) -> float:
+def calculate_median(values: Values) -> float:
     """
     Calculate median of values.
     
@@ -44,10 +67,14 @@ def calculate_median(values: List[float]) -> float:
     Returns:
         Median value or 0 if empty
     """
-    return statistics.median(values) if values else 0.0
+    if len(values) == 0:
+        return 0.0
+    if isinstance(values, np.ndarray):
+        return float(np.median(values))
+    return statistics.median(values)
 
 
-def calculate_std_dev(values: List[float]) -> float:
+def calculate_std_dev(values: Values) -> float:
     """
     Calculate standard deviation of values.
     
@@ -59,10 +86,10 @@ def calculate_std_dev(values: List[float]) -> float:
     """
     if len(values) < 2:
         return 0.0
-    return statistics.stdev(values)
+    return float(np.std(np.asarray(values, dtype=np.float64), ddof=1))
 
 
-def calculate_variance(values: List[float]) -> float:
+def calculate_variance(values: Values) -> float:
     """
     Calculate variance of values.
     
@@ -74,10 +101,10 @@ def calculate_variance(values: List[float]) -> float:
     """
     if len(values) < 2:
         return 0.0
-    return statistics.variance(values)
+    return float(np.var(np.asarray(values, dtype=np.float64), ddof=1))
 
 
-def calculate_savings_rate(deposits: List[float], withdrawals: List[float]) -> float:
+def calculate_savings_rate(deposits: Values, withdrawals: Values) -> float:
     """
     Calculate savings rate as percentage.
     
@@ -88,12 +115,13 @@ def calculate_savings_rate(deposits: List[float], withdrawals: List[float]) -> f
     Returns:
         Savings rate percentage (0-100)
     """
-    total_deposits = sum(deposits) if deposits else 0
+    # Sum each side once; calculate_net_flow would sum deposits a second time
+    total_deposits = _total(deposits)
     if total_deposits == 0:
         return 0.0
     
-    net_savings = calculate_net_flow(deposits, withdrawals)
-    return (net_savings / total_deposits) * 100
+    total_withdrawals = _total(withdrawals)
+    return ((total_deposits - total_withdrawals) / total_deposits) * 100
 
 
 def calculate_growth_rate(start_value: float, end_value: float) -> float:
@@ -112,7 +140,7 @@ def calculate_growth_rate(start_value: float, end_value: float) -> float:
     return ((end_value - start_value) / start_value) * 100
 
 
-def calculate_compound_growth_rate(values: List[float], periods: int) -> float:
+def calculate_compound_growth_rate(values: Values, periods: int) -> float:
     """
     Calculate compound annual growth rate (CAGR).
     
@@ -123,7 +151,7 @@ def calculate_compound_growth_rate(values: List[float], periods: int) -> float:
     Returns:
         CAGR percentage
     """
-    if not values or len(values) < 2 or periods <= 0:
+    if len(values) < 2 or periods <= 0:
         return 0.0
     
     start_value = values[0]
@@ -135,7 +163,7 @@ def calculate_compound_growth_rate(values: List[float], periods: int) -> float:
     return (((end_value / start_value) ** (1 / periods)) - 1) * 100
 
 
-def calculate_burn_rate(withdrawals: List[float], days: int) -> float:
+def calculate_burn_rate(withdrawals: Values, days: int) -> float:
     """
     Calculate daily burn rate (average spending per day).
     
@@ -149,11 +177,10 @@ def calculate_burn_rate(withdrawals: List[float], days: int) -> float:
     if days <= 0:
         return 0.0
     
-    total_withdrawals = sum(withdrawals) if withdrawals else 0
-    return total_withdrawals / days
+    return _total(withdrawals) / days
 
 
-def calculate_percentile(values: List[float], percentile: float) -> float:
+def calculate_percentile(values: Values, percentile: float) -> float:
     """
     Calculate percentile of values.
     
@@ -164,9 +191,13 @@ def calculate_percentile(values: List[float], percentile: float) -> float:
     Returns:
         Value at given percentile
     """
-    if not values:
+    if len(values) == 0:
         return 0.0
     
+    if isinstance(values, np.ndarray):
+        # NumPy's default linear interpolation is the formula below
+        return float(np.percentile(values, percentile))
+    
     sorted_values = sorted(values)
     k = (len(sorted_values) - 1) * (percentile / 100)
     f = int(k)
@@ -177,7 +208,7 @@ def calculate_percentile(values: List[float], percentile: float) -> float:
     return sorted_values[f]
 
 
-def calculate_weighted_average(values: List[float], weights: List[float]) -> float:
+def calculate_weighted_average(values: Values, weights: Values) -> float:
     """
     Calculate weighted average.
     
@@ -188,14 +219,17 @@ def calculate_weighted_average(values: List[float], weights: List[float]) -> flo
     Returns:
         Weighted average
     """
-    if not values or not weights or len(values) != len(weights):
+    if len(values) == 0 or len(values) != len(weights):
         return 0.0
     
-    total_weight = sum(weights)
+    total_weight = _total(weights)
     if total_weight == 0:
         return 0.0
     
-    weighted_sum = sum(v * w for v, w in zip(values, weights))
+    if isinstance(values, np.ndarray) or isinstance(weights, np.ndarray):
+        weighted_sum = float(np.dot(np.asarray(values, dtype=np.float64), np.asarray(weights, dtype=np.float64)))
+    else:
+        weighted_sum = sum(v * w for v, w in zip(values, weights))
     return weighted_sum / total_weight
 
 
@@ -242,10 +276,14 @@ def calculate_category_totals(grouped_transactions: Dict[str, List], amount_key:
     return totals
 
 
-def calculate_moving_average(values: List[float], window_size: int) -> List[float]:
+def calculate_moving_average(values: Values, window_size: int) -> List[float]:
     """
     Calculate moving average.
     
+    The first window_size - 1 entries average the partial window seen so far.
+    Window sums come from differences of a prefix sum, so the cost is O(n)
+    regardless of window_size.
+    
     Args:
         values: List of values
         window_size: Size of moving window
@@ -253,19 +291,16 @@ def calculate_moving_average(values: List[float], window_size: int) -> List[floa
     Returns:
         List of moving averages
     """
-    if not values or window_size <= 0:
+    if len(values) == 0 or window_size <= 0:
         return []
     
-    moving_avgs = []
-    for i in range(len(values)):
-        start_idx = max(0, i - window_size + 1)
-        window = values[start_idx:i + 1]
-        moving_avgs.append(statistics.mean(window))
-    
-    return moving_avgs
+    prefix = np.concatenate(([0.0], np.cumsum(np.asarray(values, dtype=np.float64))))
+    ends = np.arange(1, len(prefix))
+    starts = np.maximum(0, ends - window_size)
+    return ((prefix[ends] - prefix[starts]) / (ends - starts)).tolist()
 
 
-def normalize_values(values: List[float]) -> List[float]:
+def normalize_values(values: Values) -> List[float]:
     """
     Normalize values to 0-1 range.
     
@@ -275,9 +310,16 @@ def normalize_values(values: List[float]) -> List[float]:
     Returns:
         List of normalized values
     """
-    if not values:
+    if len(values) == 0:
         return []
     
+    if isinstance(values, np.ndarray):
+        min_val = values.min()
+        max_val = values.max()
+        if min_val == max_val:
+            return [0.5] * len(values)
+        return ((values - min_val) / (max_val - min_val)).tolist()
+    
     min_val = min(values)
     max_val = max(values)
     
@@ -287,7 +329,7 @@ def normalize_values(values: List[float]) -> List[float]:
     return [(v - min_val) / (max_val - min_val) for v in values]
 
 
-def detect_outliers(values: List[float], threshold: float = 2.0) -> List[Tuple[int, float]]:
+def detect_outliers(values: Values, threshold: float = 2.0) -> List[Tuple[int, float]]:
     """
     Detect outliers using standard deviation method.
     
@@ -301,16 +343,16 @@ def detect_outliers(values: List[float], threshold: float = 2.0) -> List[Tuple[i
     if len(values) < 3:
         return []
     
-    mean = statistics.mean(values)
-    std_dev = statistics.stdev(values)
-    
-    outliers = []
-    for i, value in enumerate(values):
-        z_score = abs((value - mean) / std_dev) if std_dev > 0 else 0
-        if z_score > threshold:
-            outliers.append((i, value))
+    # Center once and reuse it for both the sample std dev and the deviations;
+    # |v - mean| > threshold * std is the z-score test without a per-element divide
+    arr = np.asarray(values, dtype=np.float64)
+    centered = arr - arr.mean()
+    std_dev = math.sqrt(float(centered @ centered) / (len(arr) - 1))
+    if std_dev <= 0:
+        return []
     
-    return outliers
+    is_outlier = np.abs(centered) > threshold * std_dev
+    return [(i, values[i]) for i in np.flatnonzero(is_outlier).tolist()]
 
 
 def calculate_runway(current_balance: float, burn_rate: float) -> int:
@@ -332,4 +374,11 @@ def calculate_runway(current_balance: float, burn_rate: float) -> int:
     if burn_rate <= 0:
         return -1  # Infinite runway (no spending or gaining money)
     
-    return int(current_balance / burn_rate)
+    days = current_balance / burn_rate
+    if days < _FLOAT_EXACT_INT_LIMIT:
+        return math.floor(days)
+    
+    # The float quotient has lost its fractional digits here (or overflowed to
+    # inf for a tiny burn rate). Fractions hold both floats exactly, so their
+    # floor division is the exact day count at any magnitude.
+    return Fraction(current_balance) // Fraction(burn_rate)
@@ -1,5 +1,7 @@
 """Constants used throughout the analytics system."""
 
+from typing import NamedTuple
+
 # Analytics types
 ANALYTICS_CASH_FLOW = "cash_flow"
 ANALYTICS_CATEGORIES = "categories"
@@ -8,14 +10,15 @@ ANALYTICS_INSTITUTIONS = "institutions"
 ANALYTICS_NETWORK = "network"
 ANALYTICS_HEALTH = "health"
 
-ANALYTICS_TYPES = [
+ANALYTICS_TYPES_ORDER = (
     ANALYTICS_CASH_FLOW,
     ANALYTICS_CATEGORIES,
     ANALYTICS_GOALS,
     ANALYTICS_INSTITUTIONS,
     ANALYTICS_NETWORK,
     ANALYTICS_HEALTH
-]
+)
+ANALYTICS_TYPES = frozenset(ANALYTICS_TYPES_ORDER)  # Membership checks
 
 # Transaction types
 TRANSACTION_DEPOSIT = "DEPOSIT"
@@ -26,7 +29,7 @@ FORMAT_JSON = "json"
 FORMAT_HTML = "html"
 FORMAT_PDF = "pdf"
 
-OUTPUT_FORMATS = [FORMAT_JSON, FORMAT_HTML, FORMAT_PDF]
+OUTPUT_FORMATS = frozenset({FORMAT_JSON, FORMAT_HTML, FORMAT_PDF})
 
 # Date format constants
 DATE_FORMAT_ISO = "%Y-%m-%d"
@@ -37,8 +40,12 @@ DATETIME_FORMAT_ISO = "%Y-%m-%dT%H:%M:%S"
 # Time periods
 SECONDS_PER_DAY = 86400
 SECONDS_PER_WEEK = 604800
-SECONDS_PER_MONTH = 2592000  # Approximate (30 days)
-SECONDS_PER_YEAR = 31536000  # Approximate (365 days)
+APPROX_SECONDS_PER_30_DAYS = 2592000  # Fixed 30-day window, not a calendar month
+APPROX_SECONDS_PER_365_DAYS = 31536000  # Fixed 365-day window, not a calendar year
+# Deprecated: bucketing with these misaligns calendar months and years. Use
+# date_utils.date_trunc_month / date_trunc_year, or the APPROX_* names above.
+SECONDS_PER_MONTH = APPROX_SECONDS_PER_30_DAYS
+SECONDS_PER_YEAR = APPROX_SECONDS_PER_365_DAYS
 
 # Visualization types
 VIZ_LINE_CHART = "line_chart"
@@ -64,12 +71,38 @@ HEALTH_WEIGHT_SPENDING_DIVERSITY = 0.20
 HEALTH_WEIGHT_ACCOUNT_UTILIZATION = 0.15
 HEALTH_WEIGHT_TRANSACTION_REGULARITY = 0.15
 
+
+class HealthWeights(NamedTuple):
+    """Health score component weights; field names match the score breakdown keys."""
+    savings_rate: float
+    goal_progress: float
+    spending_diversity: float
+    account_utilization: float
+    transaction_regularity: float
+
+
+HEALTH_WEIGHTS = HealthWeights(
+    savings_rate=HEALTH_WEIGHT_SAVINGS_RATE,
+    goal_progress=HEALTH_WEIGHT_GOAL_PROGRESS,
+    spending_diversity=HEALTH_WEIGHT_SPENDING_DIVERSITY,
+    account_utilization=HEALTH_WEIGHT_ACCOUNT_UTILIZATION,
+    transaction_regularity=HEALTH_WEIGHT_TRANSACTION_REGULARITY
+)
+
 # Color schemes
-COLORS_PRIMARY = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
+COLORS_PRIMARY = ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b')
 COLORS_DEPOSIT = '#2ca02c'  # Green
 COLORS_WITHDRAWAL = '#d62728'  # Red
 COLORS_NEUTRAL = '#1f77b4'  # Blue
 
+# Chart rendering
+CHART_WEBGL_MIN_POINTS = 1000  # Line/area series longer than this render with WebGL (Scattergl)
+CHART_MARKERS_MAX_POINTS = 5000  # Line series longer than this drop per-point markers
+CHART_HEATMAP_MAX_LABELED_CELLS = 2500  # Larger heatmaps omit per-cell text labels
+CHART_RESAMPLE_MIN_POINTS = 5000  # resample=True only downsamples series longer than this
+CHART_RESAMPLE_BUCKETS = 1000  # Min/max buckets kept per series (up to 2 points each)
+CHART_LAYOUT_CACHE_MAX_ENTRIES = 32  # Network graph spring layouts reused per ChartGenerator
+
 # Thresholds and limits
 MAX_CATEGORIES_DISPLAY = 10
 MIN_TRANSACTIONS_FOR_ANALYSIS = 5
@@ -79,9 +112,29 @@ OUTLIER_THRESHOLD_STD_DEV = 2.0
 # S3 configuration
 S3_BUCKET_PREFIX = "cpsc-analytics-outputs"
 S3_PRESIGNED_URL_EXPIRATION = 3600  # 1 hour
+S3_MULTIPART_THRESHOLD_BYTES = 8 * 1024 * 1024
+S3_MULTIPART_CHUNKSIZE_BYTES = 8 * 1024 * 1024
+S3_MULTIPART_MAX_CONCURRENCY = 4
+REPORT_CACHE_TTL_SECONDS = 3600  # Reports whose range reaches today (or snapshots)
+REPORT_CACHE_PAST_TTL_SECONDS = 86400  # Reports covering only past dates
+
+# DynamoDB connection settings (botocore Config)
+DYNAMODB_MAX_POOL_CONNECTIONS = 50
+DYNAMODB_CONNECT_TIMEOUT_SECONDS = 2
+DYNAMODB_READ_TIMEOUT_SECONDS = 5
+DYNAMODB_MAX_ATTEMPTS = 5
+DYNAMODB_MAX_QUERY_WORKERS = 16  # Concurrent per-institution transaction queries
+DYNAMODB_BATCH_GET_MAX_KEYS = 100  # BatchGetItem request limit
+DYNAMODB_RETRY_BASE_DELAY_SECONDS = 0.05  # Backoff for unprocessed batch keys
+DYNAMODB_USER_CACHE_TTL_SECONDS = 30  # Per-user institutions/goals reuse window
+DYNAMODB_USER_CACHE_MAX_ENTRIES = 1024
 
 # Cache settings
 CACHE_TTL_SECONDS = 300  # 5 minutes
+CACHE_MAX_ENTRIES = 256
+INSTITUTION_ANALYSIS_CACHE_TTL_SECONDS = 30  # Cached InstitutionAnalytics.analyze() results
+CHART_CACHE_MAX_ENTRIES = 64  # Plotly figures reused by report_handler
+DATE_CACHE_MAX_ENTRIES = 4096  # Memoized timestamp -> datetime conversions
 
 # Error messages
 ERROR_INVALID_USER_ID = "Invalid user ID provided"
@@ -100,7 +153,7 @@ ENV_DEVELOPMENT = "devl"
 ENV_ACCEPTANCE = "acpt"
 ENV_PRODUCTION = "prod"
 
-ENVIRONMENTS = [ENV_DEVELOPMENT, ENV_ACCEPTANCE, ENV_PRODUCTION]
+ENVIRONMENTS = frozenset({ENV_DEVELOPMENT, ENV_ACCEPTANCE, ENV_PRODUCTION})
 
 # AWS regions
 AWS_REGION_US_EAST_1 = "us-east-1"
@@ -120,6 +173,10 @@ NETWORK_MIN_NODE_SIZE = 100
 NETWORK_MAX_NODE_SIZE = 1000
 NETWORK_EDGE_WIDTH_SCALE = 0.01
 NETWORK_LAYOUT_ITERATIONS = 50
+NETWORK_BACKEND_NETWORKX = "networkx"
+NETWORK_BACKEND_IGRAPH = "igraph"
+NETWORK_BACKENDS = frozenset({NETWORK_BACKEND_NETWORKX, NETWORK_BACKEND_IGRAPH})
+NETWORK_COMMUNITY_SEED = 42  # Fixed Louvain seed so community output is reproducible
 
 # Report configuration
 REPORT_TITLE_FONT_SIZE = 24
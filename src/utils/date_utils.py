@@ -1,8 +1,58 @@
 """Date and time utility functions."""
 
-from datetime import datetime, timedelta, timezone
-from typing import Tuple, List
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Callable, List, NamedTuple, Tuple
 import calendar
+import math
+import time
+
+import numpy as np
+
+from .constants import (
+    DATE_CACHE_MAX_ENTRIES,
+    DATE_FORMAT_ISO,
+    DATE_FORMAT_SHORT,
+    DATETIME_FORMAT_ISO,
+    SECONDS_PER_DAY,
+)
+
+UTC = timezone.utc
+
+
+class DateRange(NamedTuple):
+    """Inclusive date range as UNIX timestamps; unpacks like (start, end)."""
+    start: int
+    end: int
+
+
+@lru_cache(maxsize=2048)
+def _days_in_month(year: int, month: int) -> int:
+    """Number of days in a month, memoized (only a few hundred year/month pairs occur)."""
+    return calendar.monthrange(year, month)[1]
+
+
+@lru_cache(maxsize=DATE_CACHE_MAX_ENTRIES)
+def _whole_ts_to_dt(timestamp: int) -> datetime:
+    """Convert a whole-second int UNIX timestamp to a UTC datetime, memoized."""
+    return datetime.fromtimestamp(timestamp, tz=UTC)
+
+
+def _ts_to_dt(timestamp: int) -> datetime:
+    """
+    Convert a UNIX timestamp to a UTC datetime.
+    
+    Transaction timestamps repeat heavily (day boundaries, re-read rows), and a
+    cache hit is several times cheaper than fromtimestamp. datetimes are
+    immutable, so sharing them is safe. Values go through float first (as
+    fromtimestamp would), so numeric strings keep working; whole-second ones
+    are cached under their int, letting equal int, float, Decimal and string
+    values share one entry, and fractional ones are converted directly.
+    """
+    value = float(timestamp)
+    if value.is_integer():
+        return _whole_ts_to_dt(int(value))
+    return datetime.fromtimestamp(value, tz=UTC)
 
 
 def timestamp_to_datetime(timestamp: int) -> datetime:
@@ -15,7 +65,7 @@ def timestamp_to_datetime(timestamp: int) -> datetime:
     Returns:
         datetime object in UTC
     """
-    return datetime.fromtimestamp(float(timestamp), tz=timezone.utc)
+    return _ts_to_dt(timestamp)
 
 
 def datetime_to_timestamp(dt: datetime) -> int:
@@ -45,6 +95,23 @@ def iso_to_timestamp(iso_string: str) -> int:
     return int(dt.timestamp())
 
 
+def iso_to_timestamps(iso_strings: List[str]) -> np.ndarray:
+    """
+    Convert many ISO format date strings to UNIX timestamps.
+    
+    Each distinct string is parsed once, so columns of repeated dates cost one
+    parse per unique value. Results match iso_to_timestamp element for element.
+    
+    Args:
+        iso_strings: Date strings in ISO format
+        
+    Returns:
+        int64 array of UNIX timestamps, in input order
+    """
+    parsed = {iso_string: iso_to_timestamp(iso_string) for iso_string in dict.fromkeys(iso_strings)}
+    return np.fromiter(map(parsed.__getitem__, iso_strings), dtype=np.int64, count=len(iso_strings))
+
+
 def timestamp_to_iso(timestamp: int) -> str:
     """
     Convert UNIX timestamp to ISO format string (UTC).
@@ -55,11 +122,11 @@ def timestamp_to_iso(timestamp: int) -> str:
     Returns:
         ISO format date string
     """
-    dt = datetime.fromtimestamp(float(timestamp), tz=timezone.utc)
+    dt = _ts_to_dt(timestamp)
     return dt.isoformat()
 
 
-def get_date_range(start_date: str, end_date: str) -> Tuple[int, int]:
+def get_date_range(start_date: str, end_date: str) -> DateRange:
     """
     Convert date range strings to timestamps.
     
@@ -68,11 +135,9 @@ def get_date_range(start_date: str, end_date: str) -> Tuple[int, int]:
         end_date: End date in ISO format
         
     Returns:
-        Tuple of (start_timestamp, end_timestamp)
+        DateRange of (start, end) timestamps
     """
-    start_ts = iso_to_timestamp(start_date)
-    end_ts = iso_to_timestamp(end_date)
-    return start_ts, end_ts
+    return DateRange(iso_to_timestamp(start_date), iso_to_timestamp(end_date))
 
 
 def get_month_boundaries(timestamp: int) -> Tuple[int, int]:
@@ -85,16 +150,101 @@ def get_month_boundaries(timestamp: int) -> Tuple[int, int]:
     Returns:
         Tuple of (month_start_timestamp, month_end_timestamp)
     """
-    dt = datetime.fromtimestamp(float(timestamp), tz=timezone.utc)
+    fields = time.gmtime(float(timestamp))
+    
+    # First day of month: step back over the elapsed days and time of day
+    elapsed = (fields.tm_mday - 1) * SECONDS_PER_DAY + fields.tm_hour * 3600 + fields.tm_min * 60 + fields.tm_sec
+    month_start = math.floor(timestamp) - elapsed
+    
+    # Last second of the last day of month
+    month_end = month_start + _days_in_month(fields.tm_year, fields.tm_mon) * SECONDS_PER_DAY - 1
     
-    # First day of month
-    month_start = datetime(dt.year, dt.month, 1, tzinfo=timezone.utc)
+    return month_start, month_end
+
+
+def date_trunc_month(timestamp: int) -> int:
+    """
+    Truncate a timestamp to the start of its calendar month (UTC).
     
-    # Last day of month
-    last_day = calendar.monthrange(dt.year, dt.month)[1]
-    month_end = datetime(dt.year, dt.month, last_day, 23, 59, 59, tzinfo=timezone.utc)
+    Use this rather than dividing by SECONDS_PER_MONTH, which is a fixed
+    30-day approximation and drifts off calendar months.
     
-    return int(month_start.timestamp()), int(month_end.timestamp())
+    Args:
+        timestamp: UNIX timestamp
+        
+    Returns:
+        UNIX timestamp of the first second of the month
+    """
+    return get_month_boundaries(timestamp)[0]
+
+
+def date_trunc_year(timestamp: int) -> int:
+    """
+    Truncate a timestamp to the start of its calendar year (UTC).
+    
+    Args:
+        timestamp: UNIX timestamp
+        
+    Returns:
+        UNIX timestamp of the first second of the year
+    """
+    fields = time.gmtime(float(timestamp))
+    elapsed = (fields.tm_yday - 1) * SECONDS_PER_DAY + fields.tm_hour * 3600 + fields.tm_min * 60 + fields.tm_sec
+    return math.floor(timestamp) - elapsed
+
+
+def _epoch_days(timestamps: List[int]) -> np.ndarray:
+    """Whole UTC days since the epoch for each timestamp, as datetime64[D]."""
+    seconds = np.floor(np.asarray(timestamps, dtype=np.float64)).astype(np.int64)
+    return (seconds // SECONDS_PER_DAY).astype('datetime64[D]')
+
+
+def _group_by_codes(
+    timestamps: List[int],
+    codes: np.ndarray,
+    labels: Callable[[np.ndarray], List[str]]
+) -> dict:
+    """
+    Bucket timestamps by an integer code per element.
+    
+    Args:
+        timestamps: Original timestamps, returned unchanged inside the buckets
+        codes: One integer bucket code per timestamp
+        labels: Maps the array of unique codes to their dictionary keys
+        
+    Returns:
+        Dictionary mapping bucket keys to lists of timestamps, with buckets in
+        order of first appearance and timestamps in input order
+    """
+    # One stable sort lays the buckets out contiguously, each in input order
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+    starts = np.concatenate(([0], bounds))
+    
+    keys = labels(sorted_codes[starts])
+    members = np.split(np.asarray(timestamps, dtype=object)[order], bounds)
+    
+    # A bucket's first sorted member is also its first appearance in the input
+    return {keys[bucket]: members[bucket].tolist() for bucket in np.argsort(order[starts]).tolist()}
+
+
+def _sunday_week(day_of_year, weekday):
+    """
+    strftime %U week number from a zero-based day of year and Sunday = 0 weekday.
+    
+    Weeks start on Sunday; days before the year's first Sunday are week 00.
+    Works elementwise on NumPy arrays as well as on ints.
+    """
+    return (day_of_year + 7 - weekday) // 7
+
+
+def _week_codes(day_numbers: np.ndarray) -> np.ndarray:
+    """Integer week keys (year * 100 + %U week) for days since the epoch."""
+    years = day_numbers.astype('datetime64[D]').astype('datetime64[Y]')
+    day_of_year = day_numbers - years.astype('datetime64[D]').astype(np.int64)
+    weekday = (day_numbers + 4) % 7  # Sunday = 0; the epoch was a Thursday
+    return (years.astype(np.int64) + 1970) * 100 + _sunday_week(day_of_year, weekday)
 
 
 def group_by_month(timestamps: List[int]) -> dict:
@@ -107,36 +257,49 @@ def group_by_month(timestamps: List[int]) -> dict:
     Returns:
         Dictionary mapping month keys (YYYY-MM) to list of timestamps
     """
-    grouped = {}
-    for ts in timestamps:
-        dt = datetime.fromtimestamp(float(ts), tz=timezone.utc)
-        month_key = dt.strftime('%Y-%m')
-        if month_key not in grouped:
-            grouped[month_key] = []
-        grouped[month_key].append(ts)
+    if len(timestamps) == 0:
+        return {}
     
-    return grouped
+    months = _epoch_days(timestamps).astype('datetime64[M]')
+    return _group_by_codes(
+        timestamps,
+        months.astype(np.int64),
+        lambda codes: np.datetime_as_string(codes.astype('datetime64[M]')).tolist()
+    )
 
 
 def group_by_week(timestamps: List[int]) -> dict:
     """
     Group timestamps by week.
     
+    Weeks follow strftime's %U: they start on Sunday, and days before the
+    first Sunday of a year fall in week 00.
+    
     Args:
         timestamps: List of UNIX timestamps
         
     Returns:
         Dictionary mapping week keys (YYYY-Wxx) to list of timestamps
     """
-    grouped = {}
-    for ts in timestamps:
-        dt = datetime.fromtimestamp(float(ts), tz=timezone.utc)
-        week_key = dt.strftime('%Y-W%U')
-        if week_key not in grouped:
-            grouped[week_key] = []
-        grouped[week_key].append(ts)
+    if len(timestamps) == 0:
+        return {}
+    
+    day_numbers = _epoch_days(timestamps).astype(np.int64)
+    first_day = int(day_numbers.min())
+    span = int(day_numbers.max()) - first_day + 1
     
-    return grouped
+    # Transactions cluster on few calendar days: derive each day's week once and
+    # look it up, unless the range spans more days than there are timestamps
+    if span <= len(day_numbers):
+        codes = _week_codes(np.arange(first_day, first_day + span))[day_numbers - first_day]
+    else:
+        codes = _week_codes(day_numbers)
+    
+    return _group_by_codes(
+        timestamps,
+        codes,
+        lambda codes: [f"{code // 100:04d}-W{code % 100:02d}" for code in codes.tolist()]
+    )
 
 
 def group_by_day(timestamps: List[int]) -> dict:
@@ -149,15 +312,15 @@ def group_by_day(timestamps: List[int]) -> dict:
     Returns:
         Dictionary mapping day keys (YYYY-MM-DD) to list of timestamps
     """
-    grouped = {}
-    for ts in timestamps:
-        dt = datetime.fromtimestamp(float(ts), tz=timezone.utc)
-        day_key = dt.strftime('%Y-%m-%d')
-        if day_key not in grouped:
-            grouped[day_key] = []
-        grouped[day_key].append(ts)
+    if len(timestamps) == 0:
+        return {}
     
-    return grouped
+    days = _epoch_days(timestamps)
+    return _group_by_codes(
+        timestamps,
+        days.astype(np.int64),
+        lambda codes: np.datetime_as_string(codes.astype('datetime64[D]')).tolist()
+    )
 
 
 def get_days_between(start_timestamp: int, end_timestamp: int) -> int:
@@ -172,7 +335,7 @@ def get_days_between(start_timestamp: int, end_timestamp: int) -> int:
         Number of days (rounded down)
     """
     diff_seconds = end_timestamp - start_timestamp
-    return diff_seconds // (24 * 3600)
+    return diff_seconds // SECONDS_PER_DAY
 
 
 def get_months_between(start_timestamp: int, end_timestamp: int) -> int:
@@ -186,13 +349,46 @@ def get_months_between(start_timestamp: int, end_timestamp: int) -> int:
     Returns:
         Number of months (approximate)
     """
-    start_dt = datetime.fromtimestamp(float(start_timestamp), tz=timezone.utc)
-    end_dt = datetime.fromtimestamp(float(end_timestamp), tz=timezone.utc)
+    start_dt = _ts_to_dt(start_timestamp)
+    end_dt = _ts_to_dt(end_timestamp)
     
     return (end_dt.year - start_dt.year) * 12 + (end_dt.month - start_dt.month)
 
 
-def format_date(timestamp: int, format_string: str = '%Y-%m-%d') -> str:
+def _format_iso(dt: datetime) -> str:
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
+
+def _format_iso_datetime(dt: datetime) -> str:
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+
+def _format_short(dt: datetime) -> str:
+    return f"{dt.month:02d}/{dt.day:02d}/{dt.year:04d}"
+
+
+def _format_month(dt: datetime) -> str:
+    return f"{dt.year:04d}-{dt.month:02d}"
+
+
+def _format_week(dt: datetime) -> str:
+    day_of_year = dt.toordinal() - date(dt.year, 1, 1).toordinal()
+    return f"{dt.year:04d}-W{_sunday_week(day_of_year, dt.isoweekday() % 7):02d}"
+
+
+# Formats known at import time are assembled directly; strftime re-parses its
+# format string on every call. Formats with names (DATE_FORMAT_DISPLAY's %B)
+# stay on strftime so they follow the process locale.
+_FORMATTERS = {
+    DATE_FORMAT_ISO: _format_iso,
+    DATETIME_FORMAT_ISO: _format_iso_datetime,
+    DATE_FORMAT_SHORT: _format_short,
+    '%Y-%m': _format_month,
+    '%Y-W%U': _format_week,
+}
+
+
+def format_date(timestamp: int, format_string: str = DATE_FORMAT_ISO) -> str:
     """
     Format timestamp as string (UTC).
     
@@ -203,7 +399,10 @@ def format_date(timestamp: int, format_string: str = '%Y-%m-%d') -> str:
     Returns:
         Formatted date string
     """
-    dt = datetime.fromtimestamp(float(timestamp), tz=timezone.utc)
+    dt = _ts_to_dt(timestamp)
+    formatter = _FORMATTERS.get(format_string)
+    if formatter is not None:
+        return formatter(dt)
     return dt.strftime(format_string)
 
 
@@ -214,7 +413,7 @@ def get_current_timestamp() -> int:
     Returns:
         Current UNIX timestamp
     """
-    return int(datetime.now().timestamp())
+    return int(time.time())
 
 
 def add_days(timestamp: int, days: int) -> int:
@@ -228,9 +427,8 @@ def add_days(timestamp: int, days: int) -> int:
     Returns:
         New UNIX timestamp
     """
-    dt = datetime.fromtimestamp(float(timestamp), tz=timezone.utc)
-    new_dt = dt + timedelta(days=days)
-    return int(new_dt.timestamp())
+    # Epoch seconds in UTC have no DST shifts, so a day is always SECONDS_PER_DAY
+    return int(timestamp + days * SECONDS_PER_DAY)
 
 
 def add_months(timestamp: int, months: int) -> int:
@@ -244,23 +442,16 @@ def add_months(timestamp: int, months: int) -> int:
     Returns:
         New UNIX timestamp
     """
-    dt = datetime.fromtimestamp(float(timestamp), tz=timezone.utc)
+    dt = _ts_to_dt(timestamp)
     
     # Calculate new month and year
-    new_month = dt.month + months
-    new_year = dt.year
-    
-    while new_month > 12:
-        new_month -= 12
-        new_year += 1
-    
-    while new_month < 1:
-        new_month += 12
-        new_year -= 1
+    year_offset, month_index = divmod(dt.month - 1 + months, 12)
+    new_year = dt.year + year_offset
+    new_month = month_index + 1
     
     # Handle day overflow (e.g., Jan 31 + 1 month = Feb 28/29)
-    max_day = calendar.monthrange(new_year, new_month)[1]
+    max_day = _days_in_month(new_year, new_month)
     new_day = min(dt.day, max_day)
     
-    new_dt = datetime(new_year, new_month, new_day, dt.hour, dt.minute, dt.second, tzinfo=timezone.utc)
+    new_dt = datetime(new_year, new_month, new_day, dt.hour, dt.minute, dt.second, tzinfo=UTC)
     return int(new_dt.timestamp())
@@ -0,0 +1,53 @@
+"""AWS X-Ray tracing helpers.
+
+Tracing is active only when aws-xray-sdk is installed and the Lambda function
+has active tracing enabled (Lambda then sets AWS_XRAY_DAEMON_ADDRESS).
+Otherwise ``traced`` returns functions unchanged, so untraced deployments pay
+nothing. Which requests are sampled is decided by the X-Ray sampling rules of
+the account, not here.
+"""
+
+import os
+from typing import Callable, TypeVar
+
+try:
+    from aws_xray_sdk.core import patch, xray_recorder
+except ImportError:  # Optional tracing SDK
+    patch = None
+    xray_recorder = None
+
+
+F = TypeVar('F', bound=Callable)
+
+_patched = False
+
+
+def tracing_enabled() -> bool:
+    """Check whether the X-Ray SDK is installed and a daemon is configured."""
+    return xray_recorder is not None and bool(os.environ.get('AWS_XRAY_DAEMON_ADDRESS'))
+
+
+def patch_aws_clients() -> None:
+    """Patch boto3/botocore once so every AWS call is recorded as a subsegment."""
+    global _patched
+    if _patched or not tracing_enabled():
+        return
+    patch(('boto3', 'botocore'))
+    _patched = True
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """
+    Decorator recording each call of a function as an X-Ray subsegment.
+
+    Args:
+        name: Subsegment name
+
+    Returns:
+        Decorator; a no-op when tracing is not enabled
+    """
+    def decorator(func: F) -> F:
+        if not tracing_enabled():
+            return func
+        return xray_recorder.capture(name)(func)
+    return decorator
@@ -1,6 +1,23 @@
 """Visualization module for generating charts and reports."""
 
-from .charts import ChartGenerator
-from .reports import ReportGenerator
+import importlib
+
+_EXPORTS = {
+    'ChartGenerator': '.charts',
+    'ReportGenerator': '.reports',
+}
 
 __all__ = ['ChartGenerator', 'ReportGenerator']
+
+
+def __getattr__(name):
+    # Import submodules on first access so loading one does not pull in the rest
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value  # Later lookups bypass __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
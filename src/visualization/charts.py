@@ -1,58 +1,193 @@
 """Chart generation utilities for financial analytics visualizations."""
 
-from typing import Dict, List, Any, Optional, Tuple
+from collections import defaultdict
+from itertools import chain
+from typing import Dict, List, Any, Optional, Tuple, Union
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import networkx as nx
 from datetime import datetime
 import base64
+import threading
 from io import BytesIO
 
+from ..utils.cache import TTLCache
+from ..utils.calculations import Values
+from ..utils.constants import (
+    CHART_HEATMAP_MAX_LABELED_CELLS,
+    CHART_LAYOUT_CACHE_MAX_ENTRIES,
+    CHART_MARKERS_MAX_POINTS,
+    CHART_RESAMPLE_BUCKETS,
+    CHART_RESAMPLE_MIN_POINTS,
+    CHART_WEBGL_MIN_POINTS,
+    NETWORK_LAYOUT_ITERATIONS,
+)
+
+
+def _as_values(values: Values) -> np.ndarray:
+    """
+    Coerce a numeric series to a float64 array.
+    
+    Accepts lists, NumPy arrays and pandas/Arrow columns (via __array__). Plotly
+    validates and serializes contiguous arrays without per-element inspection;
+    None entries become NaN, which Plotly draws as gaps just like None.
+    """
+    return np.asarray(values, dtype=np.float64)
+
+
+def _minmax_indices(values: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of each of ``buckets`` equal slices.
+    
+    Keeping both extremes per slice preserves the visible envelope (spikes and
+    dips) of a long series. NaN gaps never win a bucket unless the whole bucket
+    is NaN, in which case the gap is kept.
+    """
+    size = -(-len(values) // buckets)
+    padded = np.full(size * buckets, np.nan)
+    padded[:len(values)] = values
+    grid = padded.reshape(buckets, size)
+    nan = np.isnan(grid)
+    offsets = np.arange(buckets) * size
+    
+    mins = np.where(nan, np.inf, grid).argmin(axis=1) + offsets
+    maxs = np.where(nan, -np.inf, grid).argmax(axis=1) + offsets
+    return np.concatenate((mins, maxs))
+
 
 class ChartGenerator:
-    """Generate various chart types for financial analytics."""
+    """
+    Generate various chart types for financial analytics.
+    
+    Numeric inputs may be lists, NumPy arrays or pandas/Arrow columns; they are
+    converted to float64 arrays once before reaching Plotly.
+    """
     
-    def __init__(self, theme: str = 'plotly_white'):
+    def __init__(
+        self,
+        theme: str = 'plotly_white',
+        webgl_min_points: Optional[int] = CHART_WEBGL_MIN_POINTS
+    ):
         """
         Initialize chart generator.
         
         Args:
             theme: Plotly template theme (plotly, plotly_white, plotly_dark, etc.)
+            webgl_min_points: Line/area series longer than this are drawn with
+                              WebGL (Scattergl) instead of SVG; None disables WebGL
         """
         self.theme = theme
         self.default_colors = px.colors.qualitative.Set2
+        self.webgl_min_points = webgl_min_points
+        self._layout_cache = TTLCache(maxsize=CHART_LAYOUT_CACHE_MAX_ENTRIES)
+        self._layout_lock = threading.Lock()  # Report sections chart concurrently
+    
+    def _scatter_trace(self, n_points: int) -> type:
+        """Pick Scattergl for long series (GPU-rendered), Scatter (crisp SVG) otherwise."""
+        if self.webgl_min_points is not None and n_points > self.webgl_min_points:
+            return go.Scattergl
+        return go.Scatter
+    
+    def _layout(self, G: nx.Graph) -> Dict[Any, Tuple[float, float]]:
+        """
+        Spring layout of a graph, memoized on its nodes, edges and edge weights.
+        
+        spring_layout is an O(iterations * V^2) pure-Python loop; repeated charts
+        of the same network (dashboard refreshes) reuse the first result, which
+        also keeps node positions stable between refreshes.
+        """
+        if G.number_of_nodes() == 0:
+            return {}
+        if G.number_of_nodes() == 1:
+            return {next(iter(G.nodes())): (0, 0)}
+        
+        key = (
+            frozenset(G.nodes()),
+            frozenset((frozenset((u, v)), w) for u, v, w in G.edges(data='weight'))
+        )
+        with self._layout_lock:
+            pos = self._layout_cache.get(key)
+        if pos is None:
+            pos = nx.spring_layout(G, k=1, iterations=NETWORK_LAYOUT_ITERATIONS)
+            with self._layout_lock:
+                self._layout_cache.set(key, pos)
+        return pos
+    
+    @staticmethod
+    def _resample(
+        data: Dict[str, Values],
+        x_axis: Any
+    ) -> Tuple[Dict[str, np.ndarray], Any]:
+        """
+        Min/max-downsample long series to about 2 * CHART_RESAMPLE_BUCKETS points.
+        
+        Every series keeps the union of all series' selected indices, so traces
+        stay aligned on one x axis (required for stacking and unified hover).
+        A series shorter than x_axis keeps the indices within its length, so
+        it still pairs with the leading x values as Plotly draws it unsampled.
+        
+        Args:
+            data: Dictionary mapping series names to values
+            x_axis: Shared x-axis labels
+        
+        Returns:
+            Tuple of (downsampled data, downsampled x_axis); inputs are returned
+            as arrays unchanged when at most CHART_RESAMPLE_MIN_POINTS long
+        """
+        series = {name: _as_values(values) for name, values in data.items()}
+        if len(x_axis) <= CHART_RESAMPLE_MIN_POINTS:
+            return series, x_axis
+        
+        picks = [np.array([0, len(x_axis) - 1])]
+        picks.extend(_minmax_indices(values, CHART_RESAMPLE_BUCKETS) for values in series.values() if len(values))
+        keep = np.unique(np.concatenate(picks))
+        keep = keep[keep < len(x_axis)]
+        
+        resampled = {name: values[keep[keep < len(values)]] for name, values in series.items()}
+        return resampled, np.asarray(x_axis)[keep]
     
     def create_line_chart(
         self,
-        data: Dict[str, List[float]],
+        data: Dict[str, Values],
         x_axis: List[str],
         title: str,
         x_label: str = "Date",
         y_label: str = "Amount",
-        height: int = 500
+        height: int = 500,
+        resample: bool = False
     ) -> go.Figure:
         """
         Create a line chart for time series data.
         
         Args:
-            data: Dictionary mapping series names to value lists
+            data: Dictionary mapping series names to value lists or arrays
             x_axis: List of x-axis labels (dates/periods)
             title: Chart title
             x_label: X-axis label
             y_label: Y-axis label
             height: Chart height in pixels
+            resample: If True, series longer than CHART_RESAMPLE_MIN_POINTS are
+                      min/max-downsampled before plotting
         
         Returns:
             Plotly Figure object
         """
+        # Rendering choices follow the full series, so resampling keeps them
+        n_points = len(x_axis)
+        if resample:
+            data, x_axis = self._resample(data, x_axis)
+        
         fig = go.Figure()
+        trace = self._scatter_trace(n_points)
+        mode = 'lines' if n_points > CHART_MARKERS_MAX_POINTS else 'lines+markers'
         
         for i, (name, values) in enumerate(data.items()):
-            fig.add_trace(go.Scatter(
+            fig.add_trace(trace(
                 x=x_axis,
-                y=values,
-                mode='lines+markers',
+                y=_as_values(values),
+                mode=mode,
                 name=name,
                 line=dict(width=3, color=self.default_colors[i % len(self.default_colors)]),
                 marker=dict(size=8)
@@ -80,7 +215,7 @@ class ChartGenerator:
     def create_bar_chart(
         self,
         categories: List[str],
-        values: List[float],
+        values: Values,
         title: str,
         x_label: str = "Category",
         y_label: str = "Amount",
@@ -105,6 +240,9 @@ class ChartGenerator:
         Returns:
             Plotly Figure object
         """
+        values = _as_values(values)
+        label_format = "{:.1f}%" if y_label == '% Complete' else "${:,.2f}"
+        text = list(map(label_format.format, values.tolist()))
         color_kwargs = (
             dict(color=bar_colors)
             if bar_colors is not None
@@ -116,7 +254,7 @@ class ChartGenerator:
                 x=values,
                 orientation='h',
                 marker=dict(**color_kwargs),
-                text=[f"{v:.1f}%" if y_label == '% Complete' else f"${v:,.2f}" for v in values],
+                text=text,
                 textposition='auto'
             )])
             fig.update_layout(
@@ -128,7 +266,7 @@ class ChartGenerator:
                 x=categories,
                 y=values,
                 marker=dict(**color_kwargs),
-                text=[f"{v:.1f}%" if y_label == '% Complete' else f"${v:,.2f}" for v in values],
+                text=text,
                 textposition='auto'
             )])
             fig.update_layout(
@@ -148,7 +286,7 @@ class ChartGenerator:
     def create_pie_chart(
         self,
         labels: List[str],
-        values: List[float],
+        values: Values,
         title: str,
         donut: bool = False,
         height: int = 500
@@ -170,7 +308,7 @@ class ChartGenerator:
         
         fig = go.Figure(data=[go.Pie(
             labels=labels,
-            values=values,
+            values=_as_values(values),
             hole=hole_size,
             marker=dict(colors=self.default_colors),
             textposition='auto',
@@ -197,7 +335,7 @@ class ChartGenerator:
     def create_stacked_bar_chart(
         self,
         categories: List[str],
-        data_series: Dict[str, List[float]],
+        data_series: Dict[str, Values],
         title: str,
         x_label: str = "Category",
         y_label: str = "Amount",
@@ -208,7 +346,7 @@ class ChartGenerator:
         
         Args:
             categories: List of category names (x-axis)
-            data_series: Dictionary mapping series names to value lists
+            data_series: Dictionary mapping series names to value lists or arrays
             title: Chart title
             x_label: X-axis label
             y_label: Y-axis label
@@ -223,7 +361,7 @@ class ChartGenerator:
             fig.add_trace(go.Bar(
                 name=name,
                 x=categories,
-                y=values,
+                y=_as_values(values),
                 marker=dict(color=self.default_colors[i % len(self.default_colors)])
             ))
         
@@ -248,40 +386,53 @@ class ChartGenerator:
     
     def create_area_chart(
         self,
-        data: Dict[str, List[float]],
+        data: Dict[str, Values],
         x_axis: List[str],
         title: str,
         x_label: str = "Date",
         y_label: str = "Amount",
         stacked: bool = False,
-        height: int = 500
+        height: int = 500,
+        resample: bool = False
     ) -> go.Figure:
         """
         Create an area chart for time series data.
         
         Args:
-            data: Dictionary mapping series names to value lists
+            data: Dictionary mapping series names to value lists or arrays
             x_axis: List of x-axis labels
             title: Chart title
             x_label: X-axis label
             y_label: Y-axis label
             stacked: If True, creates a stacked area chart
             height: Chart height in pixels
+            resample: If True, series longer than CHART_RESAMPLE_MIN_POINTS are
+                      min/max-downsampled before plotting
         
         Returns:
             Plotly Figure object
         """
+        n_points = len(x_axis)
+        if resample:
+            data, x_axis = self._resample(data, x_axis)
+        
         fig = go.Figure()
         
+        # Scattergl has no stackgroup, so stacked areas stay on SVG
+        if stacked:
+            trace, stacking = go.Scatter, dict(stackgroup='one')
+        else:
+            trace, stacking = self._scatter_trace(n_points), {}
+        
         for i, (name, values) in enumerate(data.items()):
-            fig.add_trace(go.Scatter(
+            fig.add_trace(trace(
                 x=x_axis,
-                y=values,
+                y=_as_values(values),
                 mode='lines',
                 name=name,
                 fill='tonexty' if i > 0 and stacked else 'tozeroy',
                 line=dict(width=2, color=self.default_colors[i % len(self.default_colors)]),
-                stackgroup='one' if stacked else None
+                **stacking
             ))
         
         fig.update_layout(
@@ -298,8 +449,8 @@ class ChartGenerator:
     
     def create_scatter_plot(
         self,
-        x_data: List[float],
-        y_data: List[float],
+        x_data: Values,
+        y_data: Values,
         labels: Optional[List[str]] = None,
         title: str = "Scatter Plot",
         x_label: str = "X Axis",
@@ -322,13 +473,13 @@ class ChartGenerator:
             Plotly Figure object
         """
         fig = go.Figure(data=go.Scatter(
-            x=x_data,
-            y=y_data,
+            x=_as_values(x_data),
+            y=_as_values(y_data),
             mode='markers',
             text=labels,
             marker=dict(
                 size=12,
-                color=list(range(len(x_data))),
+                color=np.arange(len(x_data)),
                 colorscale='Viridis',
                 showscale=False
             ),
@@ -347,7 +498,7 @@ class ChartGenerator:
     
     def create_heatmap(
         self,
-        z_data: List[List[float]],
+        z_data: Union[List[List[float]], np.ndarray],
         x_labels: List[str],
         y_labels: List[str],
         title: str = "Heatmap",
@@ -358,7 +509,7 @@ class ChartGenerator:
         Create a heatmap for matrix data.
         
         Args:
-            z_data: 2D list of values
+            z_data: 2D list or array of values
             x_labels: X-axis labels
             y_labels: Y-axis labels
             title: Chart title
@@ -368,14 +519,24 @@ class ChartGenerator:
         Returns:
             Plotly Figure object
         """
+        z_data = _as_values(z_data)
+        
+        # Cell labels are unreadable on large grids; skip building them there
+        text_kwargs = {}
+        if z_data.size <= CHART_HEATMAP_MAX_LABELED_CELLS:
+            labels = list(map("${:,.2f}".format, z_data.ravel().tolist()))
+            text_kwargs = dict(
+                text=np.array(labels, dtype=object).reshape(z_data.shape).tolist(),
+                texttemplate='%{text}',
+                textfont={"size": 10}
+            )
+        
         fig = go.Figure(data=go.Heatmap(
             z=z_data,
             x=x_labels,
             y=y_labels,
             colorscale=colorscale,
-            text=[[f"${val:,.2f}" for val in row] for row in z_data],
-            texttemplate='%{text}',
-            textfont={"size": 10},
+            **text_kwargs,
             hovertemplate='%{y} - %{x}<br>Value: $%{z:,.2f}<extra></extra>'
         ))
         
@@ -418,12 +579,7 @@ class ChartGenerator:
             G.add_edge(edge['source'], edge['target'], **edge.get('attributes', {}))
         
         # Calculate layout
-        if G.number_of_nodes() == 0:
-            pos = {}
-        elif G.number_of_nodes() == 1:
-            pos = {list(G.nodes())[0]: (0, 0)}
-        else:
-            pos = nx.spring_layout(G, k=1, iterations=50)
+        pos = self._layout(G)
         
         # Create edge traces
         edge_trace = []
@@ -440,18 +596,15 @@ class ChartGenerator:
             ))
         
         # Create node traces by type
-        node_types = {}
-        for node in G.nodes():
-            node_data = G.nodes[node]
-            node_type = node_data.get('type', 'default')
-            if node_type not in node_types:
-                node_types[node_type] = {'x': [], 'y': [], 'text': [], 'ids': []}
+        node_types = defaultdict(lambda: {'x': [], 'y': [], 'text': [], 'ids': []})
+        for node, node_data in G.nodes(data=True):
+            group = node_types[node_data.get('type', 'default')]
             
             x, y = pos[node]
-            node_types[node_type]['x'].append(x)
-            node_types[node_type]['y'].append(y)
-            node_types[node_type]['text'].append(node_data.get('name', node))
-            node_types[node_type]['ids'].append(node)
+            group['x'].append(x)
+            group['y'].append(y)
+            group['text'].append(node_data.get('name', node))
+            group['ids'].append(node)
         
         # Color mapping for node types
         type_colors = {
@@ -558,7 +711,7 @@ class ChartGenerator:
         self,
         sources: List[str],
         targets: List[str],
-        values: List[float],
+        values: Values,
         title: str,
         node_labels: Optional[List[str]] = None,
         height: int = 600
@@ -583,7 +736,7 @@ class ChartGenerator:
             values = [500, 200, 300]
         """
         # Create unique node list from sources and targets (for index mapping)
-        unique_nodes = list(dict.fromkeys(sources + targets))
+        unique_nodes = list(dict.fromkeys(chain(sources, targets)))
         
         # Use custom labels if provided, otherwise use node names
         display_labels = node_labels if node_labels is not None else unique_nodes
@@ -609,7 +762,7 @@ class ChartGenerator:
             link=dict(
                 source=source_indices,
                 target=target_indices,
-                value=values,
+                value=_as_values(values),
                 color='rgba(0,0,0,0.2)'
             )
         )])
@@ -626,11 +779,11 @@ class ChartGenerator:
     def create_radar_chart(
         self,
         categories: List[str],
-        values: List[float],
+        values: Values,
         title: str,
         max_value: float = 100.0,
         series_name: str = "Score",
-        comparison_values: Optional[List[float]] = None,
+        comparison_values: Optional[Values] = None,
         comparison_name: str = "Previous",
         height: int = 500
     ) -> go.Figure:
@@ -658,7 +811,7 @@ class ChartGenerator:
         
         # Add main data series
         fig.add_trace(go.Scatterpolar(
-            r=values,
+            r=_as_values(values),
             theta=categories,
             fill='toself',
             name=series_name,
@@ -669,7 +822,7 @@ class ChartGenerator:
         # Add comparison series if provided
         if comparison_values is not None:
             fig.add_trace(go.Scatterpolar(
-                r=comparison_values,
+                r=_as_values(comparison_values),
                 theta=categories,
                 fill='toself',
                 name=comparison_name,
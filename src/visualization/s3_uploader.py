@@ -1,12 +1,29 @@
 """S3 upload utilities for storing visualization outputs."""
 
-from typing import Optional
+from typing import Optional, Union
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
 import mimetypes
 
+from ..utils.constants import (
+    APPROX_SECONDS_PER_30_DAYS,
+    S3_MULTIPART_CHUNKSIZE_BYTES,
+    S3_MULTIPART_MAX_CONCURRENCY,
+    S3_MULTIPART_THRESHOLD_BYTES,
+)
+
+# Large reports are sent as concurrent multipart uploads; smaller ones as one PUT
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=S3_MULTIPART_THRESHOLD_BYTES,
+    multipart_chunksize=S3_MULTIPART_CHUNKSIZE_BYTES,
+    max_concurrency=S3_MULTIPART_MAX_CONCURRENCY,
+    use_threads=True
+)
+
 
 class S3Uploader:
     """Upload charts and reports to S3 for storage and access."""
@@ -122,6 +139,42 @@ class S3Uploader:
         Returns:
             Dictionary with upload details
         
+        Raises:
+            ClientError: If upload fails
+        """
+        return self.upload_bytes(
+            body=content.encode('utf-8'),
+            s3_key=s3_key,
+            content_type=content_type,
+            acl=acl,
+            metadata=metadata
+        )
+    
+    def upload_bytes(
+        self,
+        body: bytes,
+        s3_key: str,
+        content_type: str = 'application/octet-stream',
+        acl: str = 'private',
+        metadata: Optional[dict] = None,
+        content_encoding: Optional[str] = None
+    ) -> dict:
+        """
+        Upload an already-encoded body to S3.
+        
+        Bodies above the multipart threshold are uploaded in concurrent parts.
+        
+        Args:
+            body: Bytes to upload
+            s3_key: S3 object key
+            content_type: MIME type of content
+            acl: Access control list
+            metadata: Optional metadata dictionary
+            content_encoding: Content-Encoding of body (e.g. 'gzip')
+        
+        Returns:
+            Dictionary with upload details
+        
         Raises:
             ClientError: If upload fails
         """
@@ -133,12 +186,16 @@ class S3Uploader:
         if metadata:
             extra_args['Metadata'] = metadata
         
+        if content_encoding:
+            extra_args['ContentEncoding'] = content_encoding
+        
         try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=content.encode('utf-8'),
-                **extra_args
+            self.s3_client.upload_fileobj(
+                BytesIO(body),
+                self.bucket_name,
+                s3_key,
+                ExtraArgs=extra_args,
+                Config=_TRANSFER_CONFIG
             )
             
             url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
@@ -231,19 +288,22 @@ class S3Uploader:
     
     def upload_report(
         self,
-        html_content: str,
+        html_content: Union[str, bytes],
         user_id: str,
         report_type: str,
-        timestamp: Optional[datetime] = None
+        timestamp: Optional[datetime] = None,
+        content_encoding: Optional[str] = None
     ) -> dict:
         """
         Upload HTML report with organized naming.
         
         Args:
-            html_content: HTML report content
+            html_content: HTML report content, or an already-encoded body
             user_id: User identifier
             report_type: Type of report
             timestamp: Optional timestamp (defaults to now)
+            content_encoding: Content-Encoding of a bytes report (e.g. 'gzip');
+                callers compress the body themselves, as report_handler does
         
         Returns:
             Dictionary with upload details and presigned URL
@@ -256,24 +316,99 @@ class S3Uploader:
         time_str = timestamp.strftime('%H%M%S')
         s3_key = f"reports/{user_id}/{date_str}/{report_type}_report_{time_str}.html"
         
+        metadata = {
+            'user_id': user_id,
+            'report_type': report_type,
+            'generated_at': timestamp.isoformat()
+        }
+        
         # Upload file
-        result = self.upload_string(
-            content=html_content,
-            s3_key=s3_key,
-            content_type='text/html',
-            metadata={
-                'user_id': user_id,
-                'report_type': report_type,
-                'generated_at': timestamp.isoformat()
-            }
-        )
+        if isinstance(html_content, bytes):
+            result = self.upload_bytes(
+                body=html_content,
+                s3_key=s3_key,
+                content_type='text/html',
+                metadata=metadata,
+                content_encoding=content_encoding
+            )
+        else:
+            result = self.upload_string(
+                content=html_content,
+                s3_key=s3_key,
+                content_type='text/html',
+                metadata=metadata
+            )
         
         # Generate presigned URL (expires in 30 days)
-        presigned_url = self.generate_presigned_url(s3_key, expiration=2592000)
+        presigned_url = self.generate_presigned_url(s3_key, expiration=APPROX_SECONDS_PER_30_DAYS)
         result['presigned_url'] = presigned_url
         
         return result
     
+    def get_cached_report(
+        self,
+        cache_key: str,
+        max_age_seconds: int,
+        expiration: int = APPROX_SECONDS_PER_30_DAYS
+    ) -> Optional[dict]:
+        """
+        Look up a cached report rendered within the last max_age_seconds.
+        
+        Args:
+            cache_key: Report cache key (see report_cache_key)
+            max_age_seconds: Maximum age of the cached object
+            expiration: Presigned URL expiration in seconds (default: 30 days)
+        
+        Returns:
+            Dictionary with upload details and presigned URL, or None when the
+            object is missing or stale
+        """
+        s3_key = self.report_cache_key(cache_key)
+        
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+        except ClientError:
+            return None
+        
+        age = datetime.now(timezone.utc) - response['LastModified']
+        if age > timedelta(seconds=max_age_seconds):
+            return None
+        
+        return {
+            'bucket': self.bucket_name,
+            'key': s3_key,
+            'url': f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}",
+            'content_type': 'text/html',
+            'presigned_url': self.generate_presigned_url(s3_key, expiration=expiration)
+        }
+    
+    def cache_report(self, source_key: str, cache_key: str) -> None:
+        """
+        Copy an uploaded report to its cache key.
+        
+        The copy happens server-side, so the report body is not uploaded twice.
+        
+        Args:
+            source_key: S3 key of the uploaded report
+            cache_key: Report cache key (see report_cache_key)
+        
+        Raises:
+            ClientError: If the copy fails
+        """
+        try:
+            self.s3_client.copy_object(
+                Bucket=self.bucket_name,
+                Key=self.report_cache_key(cache_key),
+                CopySource={'Bucket': self.bucket_name, 'Key': source_key}
+            )
+        except ClientError as e:
+            raise Exception(f"Failed to cache report: {str(e)}")
+    
+    @staticmethod
+    def report_cache_key(cache_key: str) -> str:
+        """Return the S3 key under which a cached report is stored."""
+        return f"reports/cache/{cache_key}.html"
+    
     def list_user_reports(
         self,
         user_id: str,
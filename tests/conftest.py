@@ -1,8 +1,33 @@
 """Configuration for pytest."""
 
 import sys
+import threading
 from pathlib import Path
 
+import pytest
+
 # Add src directory to Python path
 src_path = Path(__file__).parent.parent / 'src'
 sys.path.insert(0, str(src_path))
+
+
+@pytest.fixture
+def concurrent_calls():
+    """
+    Build mock side effects that only return once every call is in flight.
+
+    concurrent_calls(parties) returns fetch; fetch(result) is a side effect
+    that waits on a barrier shared by `parties` calls and then returns result,
+    or result(*args, **kwargs) when result is callable. The barrier raises
+    BrokenBarrierError if the calls ran one after another.
+    """
+    def make(parties):
+        barrier = threading.Barrier(parties, timeout=5)
+
+        def fetch(result):
+            def wait_for_all(*args, **kwargs):
+                barrier.wait()
+                return result(*args, **kwargs) if callable(result) else result
+            return wait_for_all
+        return fetch
+    return make
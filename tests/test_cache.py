@@ -0,0 +1,78 @@
+"""Tests for cache utilities module."""
+
+import pytest
+from src.utils.cache import TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Test TTL cache behaviour."""
+    
+    def test_get_missing_returns_default(self):
+        """Test missing keys return the default."""
+        cache = TTLCache()
+        
+        assert cache.get('missing') is None
+        assert cache.get('missing', 'fallback') == 'fallback'
+    
+    def test_set_and_get(self):
+        """Test stored values are returned before expiry."""
+        cache = TTLCache()
+        cache.set(('user1', None, None), {'value': 1})
+        
+        assert cache.get(('user1', None, None)) == {'value': 1}
+        assert len(cache) == 1
+    
+    def test_entry_expires_after_ttl(self):
+        """Test entries are dropped once the TTL elapses."""
+        clock = FakeClock()
+        cache = TTLCache(ttl=30, timer=clock)
+        cache.set('key', 'value')
+        
+        clock.now = 29.9
+        assert cache.get('key') == 'value'
+        
+        clock.now = 30.0
+        assert cache.get('key') is None
+        assert len(cache) == 0
+    
+    def test_least_recently_used_evicted(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = TTLCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('c') == 3
+    
+    def test_invalidate_and_clear(self):
+        """Test removing one entry and all entries."""
+        cache = TTLCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+        
+        cache.invalidate('a')
+        assert cache.get('a') is None
+        assert cache.get('b') == 2
+        
+        cache.clear()
+        assert len(cache) == 0
+    
+    def test_zero_maxsize_disables_cache(self):
+        """Test a cache with no capacity stores nothing."""
+        cache = TTLCache(maxsize=0)
+        cache.set('a', 1)
+        
+        assert cache.get('a') is None
@@ -1,5 +1,9 @@
 """Tests for utility calculations module."""
 
+import statistics
+from fractions import Fraction
+
+import numpy as np
 import pytest
 from src.utils import calculations
 
@@ -149,6 +153,23 @@ class TestStatistics:
         result = calculations.calculate_average([])
         
         assert result == 0.0
+    
+    def test_matches_statistics_module(self):
+        """Test NumPy-backed statistics agree with the statistics module."""
+        values = [12.5, 3.0, 48.25, 7.75, 19.0, 3.0, 101.5]
+        
+        assert calculations.calculate_average(values) == pytest.approx(statistics.mean(values))
+        assert calculations.calculate_std_dev(values) == pytest.approx(statistics.stdev(values))
+        assert calculations.calculate_variance(values) == pytest.approx(statistics.variance(values))
+        assert isinstance(calculations.calculate_average(values), float)
+    
+    def test_accepts_numpy_arrays(self):
+        """Test arrays are accepted without converting to lists first."""
+        values = np.array([10.0, 20.0, 30.0, 40.0, 50.0])
+        
+        assert calculations.calculate_average(values) == 30.0
+        assert round(calculations.calculate_std_dev(values), 2) == 15.81
+        assert calculations.calculate_average(np.array([])) == 0.0
 
 
 class TestBurnRate:
@@ -202,6 +223,22 @@ class TestRunway:
         result = calculations.calculate_runway(current_balance, burn_rate)
         
         assert result == -1  # Infinite
+    
+    @pytest.mark.parametrize('current_balance,burn_rate,expected', [
+        (3, 2.0 ** -60, 3458764513820540928),
+        (2.0 ** 100, 3.0, 422550200076076467165567735125),
+        (2.0 ** 100 - 2.0 ** 48, 1.0, 1267650600228229120021726494720),
+    ])
+    def test_runway_exact_beyond_float_precision(self, current_balance, burn_rate, expected):
+        """Test runway is the exact floor when the day count exceeds float precision."""
+        assert calculations.calculate_runway(current_balance, burn_rate) == expected
+    
+    def test_runway_tiny_burn_rate(self):
+        """Test a quotient that overflows float still floors exactly."""
+        result = calculations.calculate_runway(1e300, 1e-300)
+        
+        assert isinstance(result, int)
+        assert result * Fraction(1e-300) <= Fraction(1e300) < (result + 1) * Fraction(1e-300)
 
 
 class TestOutlierDetection:
@@ -381,6 +418,15 @@ class TestMovingAverage:
         
         assert result == values
     
+    def test_moving_average_matches_window_mean(self):
+        """Test the prefix-sum version matches averaging each window directly."""
+        values = [3.5, -2.0, 10.25, 7.0, 0.5, 12.0, -4.75, 8.0]
+        
+        result = calculations.calculate_moving_average(values, 4)
+        
+        expected = [statistics.mean(values[max(0, i - 3):i + 1]) for i in range(len(values))]
+        assert result == pytest.approx(expected)
+    
     def test_moving_average_empty_list(self):
         """Test moving average with empty list."""
         result = calculations.calculate_moving_average([], 3)
@@ -459,3 +505,37 @@ class TestCategoryTotals:
         
         assert result['food'] == 150
         assert result['transport'] == 30
+
+
+class TestArrayInputs:
+    """Test NumPy arrays give the same results as lists."""
+    
+    @pytest.mark.parametrize('func', [
+        calculations.calculate_average,
+        calculations.calculate_median,
+        calculations.calculate_std_dev,
+        calculations.calculate_variance,
+        lambda v: calculations.calculate_percentile(v, 37.5),
+        lambda v: calculations.calculate_compound_growth_rate(v, 3),
+        lambda v: calculations.calculate_burn_rate(v, 30),
+        lambda v: calculations.calculate_net_flow(v, v[:2]),
+        lambda v: calculations.calculate_savings_rate(v, v[:2]),
+        lambda v: calculations.calculate_weighted_average(v, v[::-1]),
+        calculations.normalize_values,
+        lambda v: calculations.calculate_moving_average(v, 3),
+        calculations.detect_outliers,
+    ])
+    def test_array_matches_list(self, func):
+        """Test each function accepts an ndarray and matches the list result."""
+        values = [10.0, 12.5, 11.0, 9.5, 250.0, 10.5, 11.5]
+        
+        assert func(np.array(values)) == pytest.approx(func(values))
+    
+    def test_empty_array(self):
+        """Test empty arrays take the same early returns as empty lists."""
+        empty = np.array([])
+        
+        assert calculations.calculate_net_flow(empty, empty) == 0
+        assert calculations.calculate_median(empty) == 0.0
+        assert calculations.calculate_percentile(empty, 50) == 0.0
+        assert calculations.normalize_values(empty) == []
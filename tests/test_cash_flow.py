@@ -197,6 +197,21 @@ class TestCashFlowAnalytics:
         # 5 different days (one per transaction)
         assert len(result['trends']['periods']) == 5
 
+    def test_grouping_unsorted_transactions(self, analytics, sample_transactions):
+        """Test period grouping merges out-of-order transactions into sorted periods."""
+        shuffled = [sample_transactions[i] for i in (4, 0, 3, 1, 2)]
+        
+        grouped = analytics._group_transactions_by_period(shuffled, 'day')
+        
+        assert list(grouped.keys()) == sorted(grouped.keys())
+        assert len(grouped) == 5
+        assert grouped['2024-01-01']['total_deposits'] == 1000.0
+        assert grouped['2024-01-05']['withdrawal_count'] == 1
+        
+        monthly = analytics._group_transactions_by_period(shuffled, 'month')
+        assert monthly['2024-01']['transaction_count'] == 5
+        assert monthly['2024-01']['net_flow'] == 1050.0
+
     def test_cash_flow_with_tags(self, analytics, mock_db_client, sample_transactions):
         """Test that tags are included in transaction data."""
         mock_db_client.get_all_user_transactions.return_value = sample_transactions
@@ -91,6 +91,19 @@ class TestCategoryAnalytics:
         assert result['summary']['unique_categories'] == 5
         assert result['summary']['transaction_count'] == 5
 
+    def test_category_counts_and_averages(self, analytics, mock_db_client, sample_transactions):
+        """Test per-category totals, counts and averages from the single-pass summary."""
+        mock_db_client.get_all_user_transactions.return_value = sample_transactions
+        
+        result = analytics.analyze('user1', '2024-01-01', '2024-01-31')
+        
+        categories = result['categories']
+        assert categories['totals']['groceries'] == 350.0
+        assert categories['counts']['groceries'] == 2
+        assert categories['averages']['groceries'] == 175.0
+        # Multi-tagged transactions count towards every tag
+        assert categories['totals']['food'] == 250.0
+
     def test_analyze_no_transactions(self, analytics, mock_db_client):
         """Test analysis with no transactions."""
         mock_db_client.get_all_user_transactions.return_value = []
@@ -2,6 +2,7 @@
 
 import pytest
 from datetime import datetime
+from decimal import Decimal
 from src.utils import date_utils
 
 
@@ -36,6 +37,27 @@ class TestTimestampConversion:
         result_ts = date_utils.datetime_to_timestamp(dt)
         
         assert result_ts == original_ts
+    
+    def test_timestamp_conversion_is_memoized(self):
+        """Test equal int, float, Decimal and string timestamps share one cached datetime."""
+        first = date_utils.timestamp_to_datetime(1735689600)
+        
+        assert date_utils.timestamp_to_datetime(1735689600) is first
+        assert date_utils.timestamp_to_datetime(1735689600.0) is first
+        assert date_utils.timestamp_to_datetime(Decimal('1735689600')) is first
+        assert date_utils.timestamp_to_datetime('1735689600') is first
+        assert date_utils.format_date(1735689600) == '2025-01-01'
+    
+    def test_fractional_timestamp_not_truncated(self):
+        """Test fractional timestamps keep their sub-second part."""
+        result = date_utils.timestamp_to_datetime(1735689600.5)
+        
+        assert result.microsecond == 500000
+        assert result.second == 0
+    
+    def test_numeric_string_timestamp(self):
+        """Test numeric strings convert like the numbers they spell."""
+        assert date_utils.timestamp_to_iso('1700000000.5') == '2023-11-14T22:13:20.500000+00:00'
 
 
 class TestISOConversion:
@@ -60,6 +82,24 @@ class TestISOConversion:
         assert "2025" in result
 
 
+class TestBatchISOConversion:
+    """Test vectorized ISO string conversion."""
+    
+    def test_iso_to_timestamps_matches_scalar(self):
+        """Test batch conversion agrees with iso_to_timestamp, including repeats."""
+        iso_strings = ["2025-01-01", "2025-02-15", "2025-01-01", "2025-03-01 12:30:00"]
+        
+        result = date_utils.iso_to_timestamps(iso_strings)
+        
+        assert result.tolist() == [date_utils.iso_to_timestamp(s) for s in iso_strings]
+    
+    def test_iso_to_timestamps_empty(self):
+        """Test batch conversion of an empty list."""
+        result = date_utils.iso_to_timestamps([])
+        
+        assert len(result) == 0
+
+
 class TestDateRange:
     """Test date range functions."""
     
@@ -74,6 +114,14 @@ class TestDateRange:
         assert isinstance(end_ts, int)
         assert end_ts > start_ts
     
+    def test_get_date_range_named_fields(self):
+        """Test the returned range exposes start and end by name."""
+        date_range = date_utils.get_date_range("2025-01-01", "2025-12-31")
+        
+        assert date_range.start == date_utils.iso_to_timestamp("2025-01-01")
+        assert date_range.end == date_utils.iso_to_timestamp("2025-12-31")
+        assert tuple(date_range) == (date_range.start, date_range.end)
+    
     def test_days_between(self):
         """Test calculating days between timestamps."""
         start_ts = 1735689600  # 2025-01-01
@@ -93,6 +141,33 @@ class TestDateRange:
         assert result == 12
 
 
+class TestMonthBoundaries:
+    """Test month boundary calculation."""
+    
+    def test_month_boundaries_leap_february(self):
+        """Test boundaries of a leap-year February from a mid-month timestamp."""
+        timestamp = 1708000000  # 2024-02-15 12:26:40 UTC
+        
+        start_ts, end_ts = date_utils.get_month_boundaries(timestamp)
+        
+        assert start_ts == 1706745600  # 2024-02-01 00:00:00
+        assert end_ts == 1709251199    # 2024-02-29 23:59:59
+    
+    def test_month_boundaries_fractional_timestamp(self):
+        """Test boundaries are whole seconds for fractional timestamps."""
+        start_ts, end_ts = date_utils.get_month_boundaries(1735689600.75)
+        
+        assert (start_ts, end_ts) == (1735689600, 1738367999)
+    
+    def test_date_trunc_month_and_year(self):
+        """Test truncation to calendar month and year starts."""
+        timestamp = 1708000000  # 2024-02-15 12:26:40 UTC
+        
+        assert date_utils.date_trunc_month(timestamp) == 1706745600  # 2024-02-01
+        assert date_utils.date_trunc_year(timestamp) == 1704067200   # 2024-01-01
+        assert date_utils.date_trunc_year(1704067200) == 1704067200
+
+
 class TestGrouping:
     """Test timestamp grouping functions."""
     
@@ -229,6 +304,32 @@ class TestGroupingEdgeCases:
         result = date_utils.group_by_month(timestamps)
         
         assert len(result) == 1
+    
+    def test_group_by_week_matches_strftime(self):
+        """Test week keys agree with strftime('%Y-W%U') around year ends."""
+        timestamps = [
+            1735603200,  # 2024-12-31 (Tue)
+            1735689600,  # 2025-01-01 (Wed)
+            1735948800,  # 2025-01-04 (Sat, last day of week 00)
+            1736035200,  # 2025-01-05 (Sun, first day of week 01)
+            1704067200,  # 2024-01-01 (Mon)
+        ]
+        
+        result = date_utils.group_by_week(timestamps)
+        
+        for key, members in result.items():
+            for ts in members:
+                assert date_utils.timestamp_to_datetime(ts).strftime('%Y-W%U') == key
+        assert len(result) == 4
+    
+    def test_grouping_preserves_first_appearance_order(self):
+        """Test buckets keep first-appearance order and timestamps keep input order."""
+        timestamps = [1738454400, 1735689600, 1738454460, 1735689660]
+        
+        result = date_utils.group_by_day(timestamps)
+        
+        assert list(result) == ["2025-02-02", "2025-01-01"]
+        assert result["2025-02-02"] == [1738454400, 1738454460]
 
 
 class TestDateArithmeticEdgeCases:
@@ -268,6 +369,14 @@ class TestDateArithmeticEdgeCases:
         result = date_utils.add_months(timestamp, 0)
         
         assert result == timestamp
+    
+    def test_add_months_across_years_clamps_day(self):
+        """Test month arithmetic across year boundaries clamps to month end."""
+        timestamp = 1738281600  # 2025-01-31
+        
+        assert date_utils.format_date(date_utils.add_months(timestamp, 1)) == "2025-02-28"
+        assert date_utils.format_date(date_utils.add_months(timestamp, -11)) == "2024-02-29"
+        assert date_utils.format_date(date_utils.add_months(timestamp, 23)) == "2026-12-31"
 
 
 class TestDateRangeEdgeCases:
@@ -319,6 +428,17 @@ class TestFormattingEdgeCases:
         
         assert result == "2025"
     
+    @pytest.mark.parametrize(
+        'format_string',
+        ['%Y-%m-%d', '%Y-%m', '%Y-W%U', '%m/%d/%Y', '%B %d, %Y', '%Y-%m-%dT%H:%M:%S']
+    )
+    def test_format_date_fast_paths_match_strftime(self, format_string):
+        """Test the specialized formats agree with strftime."""
+        for timestamp in [0, 1709164800, 1735603200, 1735689600, 1736035200]:
+            expected = date_utils.timestamp_to_datetime(timestamp).strftime(format_string)
+            
+            assert date_utils.format_date(timestamp, format_string) == expected
+    
     def test_timestamp_to_iso_none(self):
         """Test converting None/null timestamp returns None."""
         # This is expected to raise an error since timestamp_to_iso
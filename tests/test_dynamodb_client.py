@@ -0,0 +1,388 @@
+"""Tests for DynamoDB client module."""
+
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from src.data.dynamodb_client import DynamoDBClient
+from src.data.data_models import Institution, Transaction
+
+
+def make_institution(institution_id):
+    """Create a minimal institution."""
+    return Institution(
+        user_id='user1',
+        institution_id=institution_id,
+        institution_name=institution_id,
+        starting_balance=0.0,
+        current_balance=0.0,
+        created_at=0
+    )
+
+
+def make_transaction(institution_id, transaction_id, transaction_date):
+    """Create a minimal transaction."""
+    return Transaction(
+        institution_id=institution_id,
+        created_at=transaction_date,
+        transaction_id=transaction_id,
+        user_id='user1',
+        type='WITHDRAWAL',
+        amount=10.0,
+        transaction_date=transaction_date
+    )
+
+
+class TestDynamoDBClient:
+    """Test suite for the DynamoDB client."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a client with mocked tables (boto3 makes no calls at construction)."""
+        client = DynamoDBClient(environment='test')
+        client.institutions_table = Mock()
+        client.transactions_table = Mock()
+        client.goals_table = Mock()
+        client.dynamodb_client = Mock()
+        return client
+
+    def test_dax_endpoint_routes_queries_through_dax(self, monkeypatch):
+        """Test DAX_ENDPOINT swaps the query client for a DAX client."""
+        dax = Mock()
+        monkeypatch.setenv('DAX_ENDPOINT', 'daxs://cluster.example')
+        monkeypatch.setattr('src.data.dynamodb_client.amazondax', dax)
+
+        client = DynamoDBClient(environment='test')
+
+        assert client.dynamodb_client is dax.AmazonDaxClient.return_value
+        assert dax.AmazonDaxClient.call_args.kwargs['endpoint_url'] == 'daxs://cluster.example'
+
+    def test_dax_endpoint_without_dax_client_falls_back(self, monkeypatch):
+        """Test a missing amazon-dax-client package falls back to DynamoDB."""
+        monkeypatch.setenv('DAX_ENDPOINT', 'daxs://cluster.example')
+        monkeypatch.setattr('src.data.dynamodb_client.amazondax', None)
+
+        client = DynamoDBClient(environment='test')
+
+        assert client.dynamodb_client.meta.service_model.service_name == 'dynamodb'
+
+    def test_all_user_transactions_queried_concurrently(self, client, concurrent_calls):
+        """Test per-institution queries overlap and results are merged newest first."""
+        institutions = [make_institution('inst1'), make_institution('inst2'), make_institution('inst3')]
+        fetch = concurrent_calls(len(institutions))
+
+        def get_transactions(institution_id, **kwargs):
+            index = int(institution_id[-1])
+            return [
+                make_transaction(institution_id, f'{institution_id}-a', 100 + index),
+                make_transaction(institution_id, f'{institution_id}-b', 100),
+            ]
+
+        client.get_institutions = Mock(return_value=institutions)
+        client.get_transactions = Mock(side_effect=fetch(get_transactions))
+
+        transactions = client.get_all_user_transactions('user1', start_date=1, end_date=2)
+
+        assert [t.transaction_id for t in transactions] == [
+            'inst3-a', 'inst2-a', 'inst1-a',
+            # Equal dates keep institution order
+            'inst1-b', 'inst2-b', 'inst3-b',
+        ]
+        # Ownership comes from the institutions query, so no userId filter is sent
+        client.get_transactions.assert_any_call(institution_id='inst2', start_date=1, end_date=2)
+
+    def test_all_user_transactions_no_institutions(self, client):
+        """Test a user without institutions issues no transaction queries."""
+        client.get_institutions = Mock(return_value=[])
+        client.get_transactions = Mock()
+
+        assert client.get_all_user_transactions('user1') == []
+        client.get_transactions.assert_not_called()
+
+    def test_get_institutions_reads_every_page(self, client):
+        """Test institution queries follow LastEvaluatedKey instead of stopping at page one."""
+        item = {'userId': 'user1', 'institutionName': 'Bank', 'currentBalance': 10}
+        client.institutions_table.query.side_effect = [
+            {'Items': [dict(item, institutionId='inst1')], 'LastEvaluatedKey': {'k': 1}},
+            {'Items': [dict(item, institutionId='inst2')]},
+        ]
+
+        institutions = client.get_institutions('user1')
+
+        assert [i.institution_id for i in institutions] == ['inst1', 'inst2']
+        second_call = client.institutions_table.query.call_args_list[1]
+        assert second_call.kwargs['ExclusiveStartKey'] == {'k': 1}
+
+    def test_get_institutions_and_goals_cached_per_user(self, client):
+        """Test repeat reads within the TTL skip DynamoDB until the user is invalidated."""
+        client.institutions_table.query.return_value = {
+            'Items': [{'userId': 'user1', 'institutionId': 'inst1', 'institutionName': 'Bank'}]
+        }
+        client.goals_table.query.return_value = {
+            'Items': [{'userId': 'user1', 'goalId': 'goal1', 'name': 'Trip'}]
+        }
+
+        first = client.get_institutions('user1')
+        first.clear()  # Callers get their own list
+        assert [i.institution_id for i in client.get_institutions('user1')] == ['inst1']
+        client.get_goals('user1')
+        client.get_goals('user1')
+        assert client.institutions_table.query.call_count == 1
+        assert client.goals_table.query.call_count == 1
+
+        client.get_institutions('user2')
+        assert client.institutions_table.query.call_count == 2
+
+        client.invalidate_user('user1')
+        client.get_institutions('user1')
+        client.get_goals('user1')
+        assert client.institutions_table.query.call_count == 3
+        assert client.goals_table.query.call_count == 2
+
+    def test_invalidate_user_bumps_data_version(self, client):
+        """Test invalidate_user() changes only that user's data version."""
+        assert client.user_data_version('user1') == 0
+
+        client.invalidate_user('user1')
+        client.invalidate_user('user1')
+
+        assert client.user_data_version('user1') == 2
+        assert client.user_data_version('user2') == 0
+
+    def test_get_transactions_stops_paging_at_limit(self, client):
+        """Test paging stops once the post-filter limit is satisfied."""
+        def page(ids, last_key=None):
+            response = {
+                'Items': [
+                    {
+                        'institutionId': {'S': 'inst1'}, 'createdAt': {'N': '1'},
+                        'transactionId': {'S': txn_id}, 'userId': {'S': 'user1'},
+                        'type': {'S': 'DEPOSIT'}, 'amount': {'N': '5'}
+                    }
+                    for txn_id in ids
+                ]
+            }
+            if last_key:
+                response['LastEvaluatedKey'] = last_key
+            return response
+
+        client.dynamodb_client.query.side_effect = [
+            page(['t1'], {'k': 1}),
+            page(['t2', 't3'], {'k': 2}),
+            page(['t4']),
+        ]
+
+        transactions = client.get_transactions('inst1', limit=2)
+
+        assert [t.transaction_id for t in transactions] == ['t1', 't2']
+        assert client.dynamodb_client.query.call_count == 2
+
+    def test_iter_transactions_fetches_pages_lazily(self, client):
+        """Test the next page is only queried once the current one is consumed."""
+        def item(txn_id):
+            return {
+                'institutionId': {'S': 'inst1'}, 'createdAt': {'N': '1'},
+                'transactionId': {'S': txn_id}, 'userId': {'S': 'user1'},
+                'type': {'S': 'DEPOSIT'}, 'amount': {'N': '5'}
+            }
+
+        client.dynamodb_client.query.side_effect = [
+            {'Items': [item('t1'), item('t2')], 'LastEvaluatedKey': {'k': 1}},
+            {'Items': [item('t3')]},
+        ]
+
+        transactions = client.iter_transactions('inst1')
+        assert client.dynamodb_client.query.call_count == 0
+
+        assert [next(transactions).transaction_id, next(transactions).transaction_id] == ['t1', 't2']
+        assert client.dynamodb_client.query.call_count == 1
+
+        assert [t.transaction_id for t in transactions] == ['t3']
+        assert client.dynamodb_client.query.call_count == 2
+
+    def test_get_transactions_unmarshals_low_level_items(self, client):
+        """Test wire-format items become plain floats/ints/lists without Decimal."""
+        client.dynamodb_client.query.return_value = {
+            'Items': [
+                {
+                    'institutionId': {'S': 'inst1'}, 'createdAt': {'N': '200'},
+                    'transactionId': {'S': 't1'}, 'userId': {'S': 'user1'},
+                    'type': {'S': 'WITHDRAWAL'}, 'amount': {'N': '12.5'},
+                    'transactionDate': {'N': '150'},
+                    'tags': {'L': [{'S': 'food'}, {'S': 'rent'}]},
+                    'description': {'NULL': True}
+                },
+                {
+                    'institutionId': {'S': 'inst1'}, 'createdAt': {'N': '100'},
+                    'transactionId': {'S': 't2'}, 'userId': {'S': 'user1'},
+                    'type': {'S': 'DEPOSIT'}, 'amount': {'N': '3'},
+                    'tags': {'SS': ['pay']}, 'description': {'S': 'Salary'}
+                },
+            ]
+        }
+
+        first, second = client.get_transactions('inst1', start_date=10, end_date=300)
+
+        assert first.amount == 12.5 and type(first.amount) is float
+        assert (first.created_at, first.transaction_date) == (200, 150)
+        assert first.tags == ['food', 'rent'] and first.description is None
+        # transactionDate falls back to createdAt
+        assert second.transaction_date == 100
+        assert second.tags == ['pay'] and second.description == 'Salary'
+
+        kwargs = client.dynamodb_client.query.call_args.kwargs
+        assert kwargs['TableName'] == client.transactions_table_name
+        assert kwargs['FilterExpression'] == '#transactionDate >= :startDate AND #transactionDate <= :endDate'
+        assert kwargs['ExpressionAttributeValues'][':startDate'] == {'N': '10'}
+
+    def test_get_transaction_columns(self, client):
+        """Test raw items are laid out as typed NumPy columns from a narrow projection."""
+        client.dynamodb_client.query.return_value = {
+            'Items': [
+                {
+                    'createdAt': {'N': '200'}, 'type': {'S': 'DEPOSIT'},
+                    'amount': {'N': '12.5'}, 'transactionDate': {'N': '150'}
+                },
+                {'createdAt': {'N': '100'}, 'type': {'S': 'WITHDRAWAL'}, 'amount': {'N': '3'}},
+            ]
+        }
+
+        columns = client.get_transaction_columns('inst1', start_date=10)
+
+        assert columns['type'].tolist() == ['DEPOSIT', 'WITHDRAWAL']
+        assert columns['amount'].dtype == np.float64
+        assert columns['amount'].tolist() == [12.5, 3.0]
+        assert columns['transaction_date'].dtype == np.int64
+        # transactionDate falls back to createdAt
+        assert columns['transaction_date'].tolist() == [150, 100]
+
+        kwargs = client.dynamodb_client.query.call_args.kwargs
+        assert kwargs['ProjectionExpression'] == '#createdAt, #type, #amount, #transactionDate'
+        assert kwargs['FilterExpression'] == '#transactionDate >= :startDate'
+
+    def test_get_transaction_columns_empty(self, client):
+        """Test an empty partition yields empty columns."""
+        client.dynamodb_client.query.return_value = {'Items': []}
+
+        columns = client.get_transaction_columns('inst1')
+
+        assert all(len(column) == 0 for column in columns.values())
+
+    def test_get_transactions_projects_consumed_attributes(self, client):
+        """Test queries fetch only modelled attributes, aliasing reserved words."""
+        client.dynamodb_client.query.return_value = {'Items': []}
+
+        client.get_transactions('inst1', start_date=1)
+        client.get_transactions('inst2')
+
+        first, second = client.dynamodb_client.query.call_args_list
+        assert '#type' in first.kwargs['ProjectionExpression'].split(', ')
+        assert first.kwargs['ExpressionAttributeNames']['#type'] == 'type'
+        # Each call gets its own names dict so nothing is shared between queries
+        assert first.kwargs['ExpressionAttributeNames'] is not second.kwargs['ExpressionAttributeNames']
+
+    def test_all_user_transactions_use_user_index(self, client):
+        """Test a configured GSI replaces the institution fan-out with one query."""
+        client.user_transactions_index = 'UserTransactionDateIndex'
+        client.get_institutions = Mock()
+        client.dynamodb_client.query.return_value = {
+            'Items': [
+                {
+                    'institutionId': {'S': 'inst2'}, 'createdAt': {'N': '5'},
+                    'transactionId': {'S': 't1'}, 'userId': {'S': 'user1'},
+                    'type': {'S': 'DEPOSIT'}, 'amount': {'N': '1'},
+                    'transactionDate': {'N': '150'}
+                },
+            ]
+        }
+
+        transactions = client.get_all_user_transactions('user1', start_date=100, end_date=200)
+
+        assert [t.transaction_id for t in transactions] == ['t1']
+        client.get_institutions.assert_not_called()
+        kwargs = client.dynamodb_client.query.call_args.kwargs
+        assert kwargs['IndexName'] == 'UserTransactionDateIndex'
+        assert kwargs['KeyConditionExpression'] == (
+            '#userId = :userId AND #transactionDate BETWEEN :startDate AND :endDate'
+        )
+        assert kwargs['ExpressionAttributeValues'] == {
+            ':userId': {'S': 'user1'}, ':startDate': {'N': '100'}, ':endDate': {'N': '200'}
+        }
+
+    def test_transactions_for_prefetched_institutions(self, client):
+        """Test passing institutions in skips the institutions query."""
+        client.get_institutions = Mock()
+        client.get_transactions = Mock(return_value=[make_transaction('inst1', 't1', 5)])
+
+        transactions = client.get_all_user_transactions_for([make_institution('inst1')], 'user1')
+
+        assert [t.transaction_id for t in transactions] == ['t1']
+        client.get_institutions.assert_not_called()
+
+    def test_user_financials_with_user_index_run_concurrently(self, client, concurrent_calls):
+        """Test all three reads overlap when transactions need no institutions."""
+        client.user_transactions_index = 'UserTransactionDateIndex'
+        fetch = concurrent_calls(3)
+
+        institutions = [make_institution('inst1')]
+        transactions = [make_transaction('inst1', 't1', 5)]
+        client.get_institutions = Mock(side_effect=fetch(institutions))
+        client.get_goals = Mock(side_effect=fetch([]))
+        client._query_user_transactions_index = Mock(side_effect=fetch(transactions))
+
+        result = client.get_user_financials('user1', start_date=1, end_date=10)
+
+        assert result == (institutions, transactions, [])
+        client._query_user_transactions_index.assert_called_once_with('user1', 1, 10)
+
+    def test_user_financials_without_index_reuse_institutions(self, client):
+        """Test the per-institution fan-out reuses the fetched institutions."""
+        institutions = [make_institution('inst1')]
+        client.get_institutions = Mock(return_value=institutions)
+        client.get_goals = Mock(return_value=[])
+        client.get_all_user_transactions_for = Mock(return_value=[])
+
+        result = client.get_user_financials('user1', start_date=1, end_date=10)
+
+        assert result == (institutions, [], [])
+        client.get_institutions.assert_called_once_with('user1')
+        client.get_all_user_transactions_for.assert_called_once_with(institutions, 'user1', 1, 10)
+
+    def test_get_institutions_by_ids_batches_and_retries(self, client):
+        """Test ids are fetched 100 per BatchGetItem and unprocessed keys are retried."""
+        table = client.institutions_table_name
+        ids = [f'inst{i}' for i in range(150)]
+
+        def item(institution_id):
+            return {'userId': 'user1', 'institutionId': institution_id, 'institutionName': institution_id}
+
+        def batch_get_item(RequestItems):
+            keys = [key['institutionId'] for key in RequestItems[table]['Keys']]
+            if len(keys) == 100:
+                # First chunk: return all but one key as unprocessed
+                return {
+                    'Responses': {table: [item(k) for k in keys[:-1]]},
+                    'UnprocessedKeys': {table: {'Keys': [{'userId': 'user1', 'institutionId': keys[-1]}]}}
+                }
+            return {'Responses': {table: [item(k) for k in reversed(keys) if k != 'inst149']}}
+
+        client.dynamodb = Mock()
+        client.dynamodb.batch_get_item.side_effect = batch_get_item
+
+        with patch('src.data.dynamodb_client.time.sleep') as sleep:
+            institutions = client.get_institutions_by_ids('user1', ids + ['inst0'])
+
+        # Requested order, duplicates dropped, missing id skipped
+        assert [i.institution_id for i in institutions] == ids[:-1]
+        assert client.dynamodb.batch_get_item.call_count == 3
+        sleep.assert_called_once()
+
+    def test_get_goals_by_ids_unprocessed_keys_exhausted(self, client):
+        """Test persistent throttling raises instead of silently dropping goals."""
+        table = client.goals_table_name
+        unprocessed = {table: {'Keys': [{'userId': 'user1', 'goalId': 'goal1'}]}}
+        client.dynamodb = Mock()
+        client.dynamodb.batch_get_item.return_value = {'Responses': {}, 'UnprocessedKeys': unprocessed}
+
+        with patch('src.data.dynamodb_client.time.sleep'), pytest.raises(RuntimeError):
+            client.get_goals_by_ids('user1', ['goal1'])
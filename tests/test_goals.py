@@ -96,6 +96,20 @@ class TestGoalAnalytics:
         assert result['summary']['active_goals'] == 2
         assert result['summary']['completed_goals'] == 0
 
+    def test_analyze_fetches_concurrently(
+        self, analytics, mock_db_client, sample_goals, sample_institutions, concurrent_calls
+    ):
+        """Test the goals and institutions queries are in flight at the same time."""
+        fetch = concurrent_calls(2)
+        
+        mock_db_client.get_goals.side_effect = fetch(sample_goals)
+        mock_db_client.get_institutions.side_effect = fetch(sample_institutions)
+        mock_db_client.get_transactions.return_value = []
+        
+        result = analytics.analyze('user1')
+        
+        assert result['summary']['total_goals'] == 2
+
     def test_analyze_no_goals(self, analytics, mock_db_client):
         """Test analysis with no goals."""
         mock_db_client.get_goals.return_value = []
@@ -372,3 +386,14 @@ class TestGoalAnalytics:
         goal_detail = result['goals'][0]
         assert goal_detail['current_amount'] == 2000.0
         assert goal_detail['progress_percent'] >= 100
+
+    def test_current_amount_with_precomputed_balances(self, sample_goals, sample_institutions):
+        """Test passing a prebuilt balance map matches the list-based lookup."""
+        balances = {inst.institution_id: inst.current_balance for inst in sample_institutions}
+        
+        for goal in sample_goals:
+            assert goal.calculate_current_amount(sample_institutions, balances) == \
+                goal.calculate_current_amount(sample_institutions)
+        
+        # 50% of 3000 + 30% of 1500
+        assert sample_goals[0].calculate_current_amount([], balances) == 1950.0
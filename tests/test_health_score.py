@@ -4,6 +4,7 @@ import pytest
 from datetime import datetime, timedelta, timezone
 from src.analytics.health_score import HealthScoreAnalytics
 from src.data.data_models import Transaction, Institution, Goal
+from src.utils.constants import HEALTH_WEIGHTS
 
 
 class TestHealthScoreCalculation:
@@ -147,6 +148,14 @@ class TestHealthScoreCalculation:
             assert 'weight' in comp_data
             assert 'contribution' in comp_data
     
+    def test_health_score_component_weights(self, health_analytics):
+        """Test component weights come from HEALTH_WEIGHTS and sum to 1."""
+        result = health_analytics.calculate_health_score([], [], [])
+        
+        weights = {name: comp['weight'] for name, comp in result['components'].items()}
+        assert weights == HEALTH_WEIGHTS._asdict()
+        assert sum(HEALTH_WEIGHTS) == pytest.approx(1.0)
+    
     def test_health_score_no_data(self, health_analytics):
         """Test health score with no data."""
         result = health_analytics.calculate_health_score([], [], [])
@@ -1,13 +1,24 @@
 """Tests for institution analytics module."""
 
+import numpy as np
 import pytest
 from datetime import datetime, timezone
 from unittest.mock import Mock
 
 from src.analytics.institutions import InstitutionAnalytics
+from src.data.dynamodb_client import DynamoDBClient
 from src.data.data_models import Institution, Transaction, Goal
 
 
+def _columns(transactions):
+    """Build the get_transaction_columns payload for a list of transactions."""
+    return {
+        'type': np.array([t.type for t in transactions], dtype=object),
+        'amount': np.array([t.amount for t in transactions], dtype=np.float64),
+        'transaction_date': np.array([t.transaction_date for t in transactions], dtype=np.int64)
+    }
+
+
 class TestInstitutionAnalytics:
     """Test suite for institution analytics."""
 
@@ -125,7 +136,7 @@ class TestInstitutionAnalytics:
         """Test basic institution analysis metrics."""
         mock_db_client.get_institutions.return_value = sample_institutions
         mock_db_client.get_goals.return_value = sample_goals
-        mock_db_client.get_transactions.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
         
         result = analytics.analyze('user1')
         
@@ -135,6 +146,20 @@ class TestInstitutionAnalytics:
         assert result['summary']['total_starting_balance'] == 16000.0
         assert result['summary']['total_growth'] == 5000.0
 
+    def test_analyze_fetches_concurrently(
+        self, analytics, mock_db_client, sample_institutions, sample_goals, concurrent_calls
+    ):
+        """Test the institutions and goals queries are in flight at the same time."""
+        fetch = concurrent_calls(2)
+        
+        mock_db_client.get_institutions.side_effect = fetch(sample_institutions)
+        mock_db_client.get_goals.side_effect = fetch(sample_goals)
+        mock_db_client.get_transaction_columns.return_value = _columns([])
+        
+        result = analytics.analyze('user1')
+        
+        assert result['summary']['total_institutions'] == 3
+
     def test_analyze_no_institutions(self, analytics, mock_db_client):
         """Test analysis with no institutions."""
         mock_db_client.get_institutions.return_value = []
@@ -150,7 +175,7 @@ class TestInstitutionAnalytics:
         """Test balance growth rate calculation."""
         mock_db_client.get_institutions.return_value = sample_institutions
         mock_db_client.get_goals.return_value = sample_goals
-        mock_db_client.get_transactions.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
         
         result = analytics.analyze('user1')
         
@@ -162,7 +187,7 @@ class TestInstitutionAnalytics:
         """Test transaction volume and metrics."""
         mock_db_client.get_institutions.return_value = sample_institutions[:1]  # Only first institution
         mock_db_client.get_goals.return_value = sample_goals
-        mock_db_client.get_transactions.return_value = sample_transactions
+        mock_db_client.get_transaction_columns.return_value = _columns(sample_transactions)
         
         result = analytics.analyze('user1')
         
@@ -178,7 +203,7 @@ class TestInstitutionAnalytics:
         """Test utilization score calculation."""
         mock_db_client.get_institutions.return_value = sample_institutions
         mock_db_client.get_goals.return_value = sample_goals
-        mock_db_client.get_transactions.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
         
         result = analytics.analyze('user1')
         
@@ -219,7 +244,7 @@ class TestInstitutionAnalytics:
         
         mock_db_client.get_institutions.return_value = [institution]
         mock_db_client.get_goals.return_value = []
-        mock_db_client.get_transactions.return_value = transactions
+        mock_db_client.get_transaction_columns.return_value = _columns(transactions)
         
         result = analytics.analyze('user1')
         
@@ -231,7 +256,7 @@ class TestInstitutionAnalytics:
         """Test institution rankings."""
         mock_db_client.get_institutions.return_value = sample_institutions
         mock_db_client.get_goals.return_value = sample_goals
-        mock_db_client.get_transactions.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
         
         result = analytics.analyze('user1')
         
@@ -267,7 +292,7 @@ class TestInstitutionAnalytics:
         
         mock_db_client.get_institutions.return_value = institutions
         mock_db_client.get_goals.return_value = []
-        mock_db_client.get_transactions.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
         
         result = analytics.analyze('user1')
         
@@ -283,7 +308,7 @@ class TestInstitutionAnalytics:
         """Test portfolio concentration (HHI) calculation."""
         mock_db_client.get_institutions.return_value = sample_institutions
         mock_db_client.get_goals.return_value = sample_goals
-        mock_db_client.get_transactions.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
         
         result = analytics.analyze('user1')
         
@@ -299,7 +324,7 @@ class TestInstitutionAnalytics:
         """Test balance distribution across institutions."""
         mock_db_client.get_institutions.return_value = sample_institutions
         mock_db_client.get_goals.return_value = sample_goals
-        mock_db_client.get_transactions.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
         
         result = analytics.analyze('user1')
         
@@ -318,7 +343,7 @@ class TestInstitutionAnalytics:
             i for i in sample_institutions if i.institution_id == inst_id
         )
         mock_db_client.get_goals.return_value = sample_goals
-        mock_db_client.get_transactions.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
         
         result = analytics.compare_institutions('user1', 'inst1', 'inst2')
         
@@ -354,7 +379,7 @@ class TestInstitutionAnalytics:
         
         mock_db_client.get_institutions.return_value = [institution]
         mock_db_client.get_goals.return_value = []
-        mock_db_client.get_transactions.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
         
         result = analytics.analyze('user1')
         
@@ -367,7 +392,7 @@ class TestInstitutionAnalytics:
         """Test portfolio performance metrics."""
         mock_db_client.get_institutions.return_value = sample_institutions
         mock_db_client.get_goals.return_value = sample_goals
-        mock_db_client.get_transactions.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
         
         result = analytics.analyze('user1')
         
@@ -377,3 +402,77 @@ class TestInstitutionAnalytics:
         assert 'best_performer' in performance
         assert 'worst_performer' in performance
         assert performance['best_performer'] == 'Main Checking'  # 200% growth
+
+    @pytest.mark.parametrize('balance', [2500.0, 0.0])
+    def test_single_institution_matches_general_path(self, analytics, mock_db_client, sample_institutions, balance):
+        """Test single-institution fast path produces the same metrics as the general helpers."""
+        institution = sample_institutions[0]
+        institution.current_balance = balance
+        
+        mock_db_client.get_institutions.return_value = [institution]
+        mock_db_client.get_goals.return_value = []
+        mock_db_client.get_transaction_columns.return_value = _columns([])
+        
+        result = analytics.analyze('user1')
+        
+        details = result['institutions']
+        assert result['rankings'] == analytics._calculate_rankings(details)
+        assert result['portfolio'] == analytics._calculate_portfolio_metrics([institution], details)
+
+    def test_analyze_results_cached(self, analytics, mock_db_client, sample_institutions, sample_goals):
+        """Test repeated analyze() calls reuse the cached result without refetching."""
+        mock_db_client.get_institutions.return_value = sample_institutions
+        mock_db_client.get_goals.return_value = sample_goals
+        mock_db_client.get_transaction_columns.return_value = _columns([])
+        
+        first = analytics.analyze('user1', '2024-01-01', '2024-12-31')
+        first['summary']['total_balance'] = -1  # Caller mutation must not leak into the cache
+        second = analytics.analyze('user1', '2024-01-01', '2024-12-31')
+        
+        assert mock_db_client.get_institutions.call_count == 1
+        assert second['summary']['total_balance'] == 21000.0
+        
+        analytics.analyze('user1', '2024-02-01', '2024-12-31')
+        assert mock_db_client.get_institutions.call_count == 2
+        
+        analytics.clear_cache()
+        analytics.analyze('user1', '2024-01-01', '2024-12-31')
+        assert mock_db_client.get_institutions.call_count == 3
+
+    def test_analyze_sees_data_written_after_cached_read(self):
+        """Test invalidate_user() makes the next analyze() return newly written data."""
+        db_client = DynamoDBClient(environment='test')
+        db_client.institutions_table = Mock()
+        db_client.goals_table = Mock()
+        db_client.goals_table.query.return_value = {'Items': []}
+        db_client.get_transaction_columns = Mock(return_value=_columns([]))
+        analytics = InstitutionAnalytics(db_client)
+        
+        checking = {'userId': 'user1', 'institutionId': 'inst1', 'institutionName': 'Checking', 'currentBalance': 100}
+        db_client.institutions_table.query.return_value = {'Items': [checking]}
+        assert analytics.analyze('user1')['summary']['total_institutions'] == 1
+        
+        savings = {'userId': 'user1', 'institutionId': 'inst2', 'institutionName': 'Savings', 'currentBalance': 50}
+        db_client.institutions_table.query.return_value = {'Items': [checking, savings]}
+        db_client.invalidate_user('user1')
+        
+        result = analytics.analyze('user1')
+        assert result['summary']['total_institutions'] == 2
+        assert result['summary']['total_balance'] == 150.0
+
+    def test_goal_names_optional(self, analytics, mock_db_client, sample_institutions, sample_goals):
+        """Test linked goal names are only built when requested."""
+        mock_db_client.get_institutions.return_value = sample_institutions
+        mock_db_client.get_goals.return_value = sample_goals
+        mock_db_client.get_transaction_columns.return_value = _columns([])
+        
+        with_names = analytics.analyze('user1')
+        without_names = analytics.analyze('user1', include_goal_names=False)
+        
+        savings = next(i for i in with_names['institutions'] if i['institution_id'] == 'inst2')
+        assert savings['goals']['linked_goal_names'] == ['Emergency Fund', 'Vacation']
+        
+        savings = next(i for i in without_names['institutions'] if i['institution_id'] == 'inst2')
+        assert 'linked_goal_names' not in savings['goals']
+        assert savings['goals']['linked_count'] == 2
+        assert savings['goals']['total_allocated_percent'] == 150
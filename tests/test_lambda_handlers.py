@@ -1,18 +1,37 @@
 """Tests for Lambda handler functions."""
 
+import gzip
+import importlib
 import json
+import numpy as np
 import pytest
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch, PropertyMock
 from datetime import datetime, timezone
 
-from src.lambda_handlers.analytics_handler import handler as analytics_handler, _validate_request as validate_analytics
-from src.lambda_handlers.report_handler import handler as report_handler, _validate_request as validate_report
+from src.lambda_handlers.analytics_handler import lambda_handler as analytics_handler, _validate_request as validate_analytics
+from src.lambda_handlers.report_handler import lambda_handler as report_handler, _validate_request as validate_report
+from src.lambda_handlers import common
+from src.data.data_models import Institution
+
+# The package re-exports each lambda_handler under its module's name
+analytics_module = importlib.import_module('src.lambda_handlers.analytics_handler')
+report_module = importlib.import_module('src.lambda_handlers.report_handler')
 
 
 # ---------------------------------------------------------------------------
 # Shared fixtures
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def cold_container(monkeypatch):
+    """Start each test without the clients a previous test left warm."""
+    monkeypatch.setattr(common, '_DB_CLIENT', None)
+    monkeypatch.setattr(analytics_module, '_ANALYTICS_INSTANCES', {})
+    monkeypatch.setattr(report_module, '_S3_UPLOADER', None)
+
+
 @pytest.fixture
 def cognito_event_base():
     """Base API Gateway event with Cognito claims."""
@@ -252,7 +271,7 @@ class TestAnalyticsHandler:
         resp_body = json.loads(response['body'])
         assert 'error' in resp_body
 
-    @patch('src.lambda_handlers.analytics_handler.DynamoDBClient')
+    @patch('src.lambda_handlers.common.DynamoDBClient')
     def test_db_initialization_failure(self, mock_db_cls):
         """Return 500 when DynamoDB client cannot be initialized."""
         mock_db_cls.side_effect = Exception("Connection refused")
@@ -266,7 +285,7 @@ class TestAnalyticsHandler:
         resp_body = json.loads(response['body'])
         assert 'database' in resp_body['error'].lower()
 
-    @patch('src.lambda_handlers.analytics_handler.DynamoDBClient')
+    @patch('src.lambda_handlers.common.DynamoDBClient')
     @patch('src.lambda_handlers.analytics_handler.CashFlowAnalytics')
     def test_cash_flow_success(self, mock_analytics_cls, mock_db_cls):
         """Return 200 with analytics data for cash_flow type."""
@@ -295,14 +314,12 @@ class TestAnalyticsHandler:
         assert 'generatedAt' in resp_body
         assert 'data' in resp_body
 
-    @patch('src.lambda_handlers.analytics_handler.DynamoDBClient')
+    @patch('src.lambda_handlers.common.DynamoDBClient')
     @patch('src.lambda_handlers.analytics_handler.HealthScoreAnalytics')
     def test_health_analytics_success(self, mock_health_cls, mock_db_cls):
         """Return 200 with health score data."""
         mock_db = MagicMock()
-        mock_db.get_all_user_transactions.return_value = []
-        mock_db.get_institutions.return_value = []
-        mock_db.get_goals.return_value = []
+        mock_db.get_user_financials.return_value = ([], [], [])
         mock_db_cls.return_value = mock_db
 
         mock_health = MagicMock()
@@ -326,7 +343,7 @@ class TestAnalyticsHandler:
         assert resp_body['analyticsType'] == 'health'
         assert resp_body['data']['overall_score'] == 75.0
 
-    @patch('src.lambda_handlers.analytics_handler.DynamoDBClient')
+    @patch('src.lambda_handlers.common.DynamoDBClient')
     @patch('src.lambda_handlers.analytics_handler.GoalAnalytics')
     def test_goals_analytics_success(self, mock_analytics_cls, mock_db_cls):
         """Goals handler passes only user_id to GoalAnalytics.analyze() (no date range)."""
@@ -355,7 +372,7 @@ class TestAnalyticsHandler:
         # Verify analyze() was called with ONLY user_id — no start_date/end_date
         mock_analytics.analyze.assert_called_once_with('test-user-123')
 
-    @patch('src.lambda_handlers.analytics_handler.DynamoDBClient')
+    @patch('src.lambda_handlers.common.DynamoDBClient')
     @patch('src.lambda_handlers.analytics_handler.CashFlowAnalytics')
     def test_analytics_computation_failure(self, mock_analytics_cls, mock_db_cls):
         """Return 500 when analytics computation throws unexpected exception."""
@@ -375,7 +392,7 @@ class TestAnalyticsHandler:
 
         assert response['statusCode'] == 500
 
-    @patch('src.lambda_handlers.analytics_handler.DynamoDBClient')
+    @patch('src.lambda_handlers.common.DynamoDBClient')
     @patch('src.lambda_handlers.analytics_handler.CashFlowAnalytics')
     def test_options_passed_to_analytics(self, mock_analytics_cls, mock_db_cls):
         """Verify groupBy option is forwarded to CashFlowAnalytics."""
@@ -435,7 +452,7 @@ class TestReportHandler:
         response = report_handler(event, None)
         assert response['statusCode'] == 400
 
-    @patch('src.lambda_handlers.report_handler.DynamoDBClient')
+    @patch('src.lambda_handlers.common.DynamoDBClient')
     def test_db_initialization_failure(self, mock_db_cls):
         """Return 500 when DynamoDB client cannot be initialized."""
         mock_db_cls.side_effect = Exception("AWS credentials not found")
@@ -448,8 +465,8 @@ class TestReportHandler:
         assert response['statusCode'] == 500
 
     @patch('src.lambda_handlers.report_handler.S3Uploader')
-    @patch('src.lambda_handlers.report_handler.DynamoDBClient')
-    @patch('src.lambda_handlers.report_handler.CashFlowAnalytics')
+    @patch('src.lambda_handlers.common.DynamoDBClient')
+    @patch('src.analytics.cash_flow.CashFlowAnalytics')
     def test_cash_flow_report_success(self, mock_analytics_cls, mock_db_cls, mock_s3_cls):
         """Return 200 with report URL for cash_flow report."""
         mock_db = MagicMock()
@@ -465,6 +482,7 @@ class TestReportHandler:
         mock_analytics_cls.return_value = mock_analytics
 
         mock_s3 = MagicMock()
+        mock_s3.get_cached_report.return_value = None
         mock_s3.upload_report.return_value = {
             'bucket': 'cpsc-analytics-devl',
             'key': 'reports/test-user-123/2025/01/01/cash_flow_report_100000.html',
@@ -489,8 +507,8 @@ class TestReportHandler:
         assert 's3Key' in resp_body
 
     @patch('src.lambda_handlers.report_handler.S3Uploader')
-    @patch('src.lambda_handlers.report_handler.DynamoDBClient')
-    @patch('src.lambda_handlers.report_handler.CashFlowAnalytics')
+    @patch('src.lambda_handlers.common.DynamoDBClient')
+    @patch('src.analytics.cash_flow.CashFlowAnalytics')
     def test_s3_upload_failure(self, mock_analytics_cls, mock_db_cls, mock_s3_cls):
         """Return 500 when S3 upload fails."""
         mock_db = MagicMock()
@@ -506,6 +524,7 @@ class TestReportHandler:
         mock_analytics_cls.return_value = mock_analytics
 
         mock_s3 = MagicMock()
+        mock_s3.get_cached_report.return_value = None
         mock_s3.upload_report.side_effect = Exception("S3 bucket not found")
         mock_s3_cls.return_value = mock_s3
 
@@ -521,14 +540,12 @@ class TestReportHandler:
         assert 'store' in resp_body['error'].lower() or 'Failed' in resp_body['error']
 
     @patch('src.lambda_handlers.report_handler.S3Uploader')
-    @patch('src.lambda_handlers.report_handler.DynamoDBClient')
-    @patch('src.lambda_handlers.report_handler.HealthScoreAnalytics')
+    @patch('src.lambda_handlers.common.DynamoDBClient')
+    @patch('src.analytics.health_score.HealthScoreAnalytics')
     def test_health_score_report_success(self, mock_health_cls, mock_db_cls, mock_s3_cls):
         """Return 200 for health_score report type."""
         mock_db = MagicMock()
-        mock_db.get_all_user_transactions.return_value = []
-        mock_db.get_institutions.return_value = []
-        mock_db.get_goals.return_value = []
+        mock_db.get_user_financials.return_value = ([], [], [])
         mock_db_cls.return_value = mock_db
 
         mock_health = MagicMock()
@@ -545,6 +562,7 @@ class TestReportHandler:
         mock_health_cls.return_value = mock_health
 
         mock_s3 = MagicMock()
+        mock_s3.get_cached_report.return_value = None
         mock_s3.upload_report.return_value = {
             'bucket': 'cpsc-bucket',
             'key': 'reports/test/health.html',
@@ -568,3 +586,258 @@ class TestReportHandler:
         event = {'body': '{}', 'requestContext': {}}
         response = report_handler(event, None)
         assert 'Access-Control-Allow-Origin' in response['headers']
+
+
+# ---------------------------------------------------------------------------
+# Warm-container reuse and report delivery paths
+# ---------------------------------------------------------------------------
+
+class TestSharedDBClient:
+    """Test the DynamoDB client shared across warm invocations."""
+
+    @patch('src.lambda_handlers.common.DynamoDBClient')
+    def test_client_reused_across_invocations(self, mock_db_cls):
+        """Both handlers reuse one client until the environment changes."""
+        mock_db_cls.side_effect = lambda environment: MagicMock(environment=environment)
+
+        first = common.get_db_client('devl')
+        assert common.get_db_client('devl') is first
+        assert mock_db_cls.call_count == 1
+
+        other = common.get_db_client('prod')
+        assert other is not first
+        assert other.environment == 'prod'
+        assert mock_db_cls.call_count == 2
+
+    @patch('src.lambda_handlers.common.DynamoDBClient')
+    @patch('src.lambda_handlers.analytics_handler.GoalAnalytics')
+    def test_analytics_handler_reuses_client(self, mock_analytics_cls, mock_db_cls):
+        """Warm invocations of the analytics handler construct the client once."""
+        mock_db_cls.side_effect = lambda environment: MagicMock(environment=environment)
+        mock_analytics_cls.return_value.analyze.return_value = {'goals': []}
+
+        event = _make_analytics_event({'analyticsType': 'goals'})
+        assert analytics_handler(event, None)['statusCode'] == 200
+        assert analytics_handler(event, None)['statusCode'] == 200
+
+        assert mock_db_cls.call_count == 1
+
+
+class TestAnalyticsInstanceReuse:
+    """Test which analytics instances warm invocations share."""
+
+    @patch('src.lambda_handlers.analytics_handler.CashFlowAnalytics')
+    def test_stateless_analytics_reused(self, mock_analytics_cls):
+        """Classes without per-user state are rebuilt only when the DynamoDB client changes."""
+        mock_analytics_cls.side_effect = lambda db_client: MagicMock(db_client=db_client)
+        db_client = MagicMock()
+
+        first = analytics_module._get_analytics(mock_analytics_cls, db_client)
+        assert analytics_module._get_analytics(mock_analytics_cls, db_client) is first
+        assert analytics_module._get_analytics(mock_analytics_cls, MagicMock()) is not first
+        assert mock_analytics_cls.call_count == 2
+
+    @patch('src.lambda_handlers.common.DynamoDBClient')
+    def test_institution_cache_hits_across_requests(self, mock_db_cls):
+        """The shared InstitutionAnalytics serves a repeat request from its cache, per user."""
+        mock_db = mock_db_cls.return_value
+        mock_db.environment = 'devl'
+        mock_db.user_data_version.return_value = 0
+        mock_db.get_goals.return_value = []
+        mock_db.get_institutions.return_value = [Institution(
+            user_id='test-user-123',
+            institution_id='inst1',
+            institution_name='Main Checking',
+            starting_balance=1000.0,
+            current_balance=3000.0,
+            created_at=1700000000,
+        )]
+        mock_db.get_transaction_columns.return_value = {
+            'type': np.empty(0, dtype=object),
+            'amount': np.empty(0),
+            'transaction_date': np.empty(0, dtype=np.int64),
+        }
+
+        event = _make_analytics_event({'analyticsType': 'institutions'})
+        assert analytics_handler(event, None)['statusCode'] == 200
+        assert analytics_handler(event, None)['statusCode'] == 200
+        other_user = _make_analytics_event({'analyticsType': 'institutions'}, user_id='other-user')
+        assert analytics_handler(other_user, None)['statusCode'] == 200
+
+        assert mock_db.get_institutions.call_count == 2
+
+
+class TestReportSingletons:
+    """Test the report handler's warm-container singletons."""
+
+    @patch('src.lambda_handlers.report_handler.S3Uploader')
+    def test_s3_uploader_built_once_under_concurrency(self, mock_s3_cls):
+        """Concurrent first calls share one uploader; a new bucket replaces it."""
+        def build(bucket_name):
+            time.sleep(0.01)  # Widen the window for a racing second construction
+            return MagicMock(bucket_name=bucket_name)
+        mock_s3_cls.side_effect = build
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            uploaders = list(executor.map(report_module._get_s3_uploader, ['bucket-a'] * 8))
+
+        assert all(uploader is uploaders[0] for uploader in uploaders)
+        assert report_module._get_s3_uploader('bucket-b').bucket_name == 'bucket-b'
+        assert mock_s3_cls.call_count == 2
+
+    def test_generators_built_once_under_concurrency(self, monkeypatch):
+        """Concurrent first calls share one chart/report generator pair."""
+        monkeypatch.setattr(report_module, '_GENERATORS', None)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            generators = list(executor.map(lambda _: report_module._get_generators(), range(8)))
+
+        assert all(pair is generators[0] for pair in generators)
+
+
+class TestReportDelivery:
+    """Test report caching, gzip upload and local saving."""
+
+    @pytest.fixture
+    def mock_s3(self):
+        """Patch the S3 uploader with a cache miss and a successful upload."""
+        with patch('src.lambda_handlers.report_handler.S3Uploader') as mock_s3_cls:
+            mock_s3 = mock_s3_cls.return_value
+            mock_s3.bucket_name = 'cpsc-analytics-devl'
+            mock_s3.get_cached_report.return_value = None
+            mock_s3.upload_report.return_value = {
+                'bucket': 'cpsc-analytics-devl',
+                'key': 'reports/test-user-123/report.html',
+                'presigned_url': 'https://s3.example.com/report'
+            }
+            yield mock_s3
+
+    @pytest.fixture(autouse=True)
+    def mock_db(self):
+        """Patch the DynamoDB client construction."""
+        with patch('src.lambda_handlers.common.DynamoDBClient') as mock_db_cls:
+            yield mock_db_cls.return_value
+
+    def test_cached_report_served_without_rendering(self, mock_s3, monkeypatch):
+        """A fresh cached copy is returned without generating or uploading."""
+        mock_s3.get_cached_report.return_value = {
+            'bucket': 'cpsc-analytics-devl',
+            'key': 'reports/cache/abc.html',
+            'presigned_url': 'https://s3.example.com/cached'
+        }
+        generate = MagicMock()
+        monkeypatch.setattr(report_module, '_generate_single_report', generate)
+
+        body = {'reportType': 'goal'}
+        response = report_handler(_make_report_event(body), None)
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body'])['reportUrl'] == 'https://s3.example.com/cached'
+        generate.assert_not_called()
+        mock_s3.upload_report.assert_not_called()
+
+    def test_rendered_report_is_cached(self, mock_s3, monkeypatch):
+        """A cache miss renders, uploads and records the report under its cache key."""
+        monkeypatch.setattr(report_module, '_generate_single_report', MagicMock(return_value='<html></html>'))
+
+        response = report_handler(_make_report_event({'reportType': 'goal'}), None)
+
+        assert response['statusCode'] == 200
+        cache_key = mock_s3.get_cached_report.call_args.args[0]
+        mock_s3.cache_report.assert_called_once_with('reports/test-user-123/report.html', cache_key)
+
+    def test_comprehensive_report_uploaded_gzipped(self, mock_s3, monkeypatch):
+        """Comprehensive reports are gzipped and uploaded with Content-Encoding: gzip."""
+        monkeypatch.setattr(
+            report_module, '_generate_single_report',
+            lambda report_type, **kwargs: f'<p>{report_type}</p>'
+        )
+        body = {
+            'reportType': 'comprehensive',
+            'dateRange': {'start': '2025-01-01', 'end': '2025-12-31'},
+            'options': {'noCache': True}
+        }
+
+        response = report_handler(_make_report_event(body), None)
+
+        assert response['statusCode'] == 200
+        kwargs = mock_s3.upload_report.call_args.kwargs
+        assert kwargs['content_encoding'] == 'gzip'
+        html = gzip.decompress(kwargs['html_content']).decode('utf-8')
+        positions = [html.index(f'<p>{section}</p>') for section in report_module.COMPREHENSIVE_SECTIONS]
+        assert positions == sorted(positions)
+        mock_s3.get_cached_report.assert_not_called()
+
+    def test_local_reports_dir_saves_file(self, tmp_path, monkeypatch):
+        """LOCAL_REPORTS_DIR writes the HTML to disk and returns a file:// URL."""
+        monkeypatch.setenv('LOCAL_REPORTS_DIR', str(tmp_path))
+        monkeypatch.setattr(report_module, '_generate_single_report', MagicMock(return_value='<html>ok</html>'))
+
+        response = report_handler(_make_report_event({'reportType': 'goal'}), None)
+
+        assert response['statusCode'] == 200
+        resp_body = json.loads(response['body'])
+        assert resp_body['reportUrl'].startswith('file://')
+        assert (tmp_path / resp_body['s3Key']).read_text(encoding='utf-8') == '<html>ok</html>'
+
+    def test_chart_cache_reuses_identical_figures(self, monkeypatch):
+        """Identical chart inputs build one figure; different inputs build another."""
+        monkeypatch.setattr(report_module, '_CHART_CACHE', report_module.TTLCache())
+        chart_gen = MagicMock()
+        chart_gen.create_pie_chart.side_effect = lambda **kwargs: object()
+
+        first = report_module._cached_chart(chart_gen, 'create_pie_chart', labels=['a'], values=[1])
+        second = report_module._cached_chart(chart_gen, 'create_pie_chart', labels=['a'], values=[1])
+        third = report_module._cached_chart(chart_gen, 'create_pie_chart', labels=['a'], values=[2])
+
+        assert first is second
+        assert third is not first
+        assert chart_gen.create_pie_chart.call_count == 2
+
+
+class TestSharedValidation:
+    """Test the dateRange checks shared by both handlers."""
+
+    @pytest.mark.parametrize('value', ['2025-13-01', '2025-02-30', '2025-1-01', '20250101', None, 20250101])
+    def test_is_iso_date_rejects_invalid(self, value):
+        """Only zero-padded YYYY-MM-DD strings naming real dates pass."""
+        assert not common.is_iso_date(value)
+
+    def test_is_iso_date_accepts_leap_day(self):
+        """Real calendar dates pass, including leap days."""
+        assert common.is_iso_date('2024-02-29')
+
+    def test_both_handlers_reject_impossible_dates(self):
+        """Both handlers report the same error for an impossible calendar date."""
+        date_range = {'start': '2025-02-30', 'end': '2025-12-31'}
+        analytics_error = validate_analytics({'analyticsType': 'cash_flow', 'dateRange': date_range})
+        report_error = validate_report({'reportType': 'cash_flow', 'dateRange': date_range})
+        assert analytics_error == report_error == "dateRange dates must be in YYYY-MM-DD format"
+
+
+class TestSharedJSON:
+    """Test the JSON codec shared by both handlers."""
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_json_dumps_numpy_and_int_keys(self, use_orjson, monkeypatch):
+        """NumPy floats and int keys serialize the same with or without orjson."""
+        if not use_orjson:
+            monkeypatch.setattr(common, 'orjson', None)
+        elif common.orjson is None:
+            pytest.skip('orjson not installed')
+
+        body = {'b': np.float64(1.5), 'a': {2024: 3}}
+
+        assert json.loads(common.json_dumps(body)) == {'b': 1.5, 'a': {'2024': 3}}
+        assert list(json.loads(common.json_dumps(body, sort_keys=True))) == ['a', 'b']
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_json_loads_raises_stdlib_error(self, use_orjson, monkeypatch):
+        """Malformed bodies raise json.JSONDecodeError with either codec."""
+        if not use_orjson:
+            monkeypatch.setattr(common, 'orjson', None)
+        elif common.orjson is None:
+            pytest.skip('orjson not installed')
+
+        with pytest.raises(json.JSONDecodeError):
+            common.json_loads('not-json!!!')
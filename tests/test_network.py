@@ -1,12 +1,14 @@
 """Tests for network analytics module."""
 
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 import networkx as nx
 
 from src.analytics.network import NetworkAnalytics
 from src.data.data_models import Transaction, Institution, Goal
+from src.utils import date_utils
 
 
 @pytest.fixture
@@ -363,6 +365,26 @@ class TestGoalInstitutionGraph:
         assert 'goal_goal_unknown_txn' in graph.nodes
         assert graph.degree('goal_goal_unknown_txn') == 0
 
+    def test_inactive_goal_transaction_ids(self, analytics, sample_goals):
+        """Test only transactions referenced by inactive goals are collected."""
+        base_ts = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+        inactive_goal = Goal(
+            user_id='user1',
+            goal_id='goal_done',
+            created_at=base_ts,
+            name='Done Goal',
+            target_amount=1000.0,
+            is_completed=True,
+            is_active=False,
+            linked_institutions={},
+            linked_transactions=['txn2', 'txn5']
+        )
+
+        assert analytics._inactive_goals(sample_goals) == []
+        inactive_goals = analytics._inactive_goals(sample_goals + [inactive_goal])
+        assert inactive_goals == [inactive_goal]
+        assert analytics._inactive_goal_transaction_ids(inactive_goals) == {'txn2', 'txn5'}
+
     def test_transactions_added_as_nodes(self, analytics, sample_institutions, sample_goals, sample_transactions):
         """Tags from transactions are added as tag nodes when transactions are provided."""
         graph = analytics.build_goal_institution_graph(
@@ -558,6 +580,83 @@ class TestCentralityMetrics:
         assert len(centrality['degree_centrality']) > 0
         assert len(centrality['pagerank']) > 0
 
+    
+    @pytest.mark.parametrize('graph', [
+        nx.star_graph(6),
+        nx.path_graph(7),
+        nx.barbell_graph(4, 2),
+        nx.disjoint_union(nx.complete_graph(4), nx.path_graph(3)),
+    ], ids=['star', 'path', 'barbell', 'disconnected'])
+    def test_leaf_reduced_betweenness_matches_networkx(self, analytics, graph):
+        """Test leaf-skipping betweenness equals the full Brandes computation."""
+        graph = graph.copy()
+        graph.add_edges_from([(0, 'leaf_a'), (0, 'leaf_b'), ('pair_x', 'pair_y')])
+        
+        expected = nx.betweenness_centrality(graph)
+        actual = analytics._leaf_reduced_betweenness(graph)
+        
+        assert actual.keys() == expected.keys()
+        for node, value in expected.items():
+            assert actual[node] == pytest.approx(value)
+        assert actual['leaf_a'] == 0.0
+
+    @pytest.mark.parametrize('graph', [
+        nx.star_graph(6),
+        nx.balanced_tree(2, 3),
+        nx.path_graph(2),
+        nx.disjoint_union(nx.path_graph(4), nx.star_graph(3)),
+    ], ids=['star', 'tree', 'edge', 'forest'])
+    def test_forest_centrality_matches_networkx(self, analytics, graph):
+        """Test closed-form tree metrics equal the general NetworkX results."""
+        betweenness, closeness = analytics._forest_centrality(graph)
+
+        if graph.number_of_nodes() > 2:
+            expected = nx.betweenness_centrality(graph)
+            assert betweenness.keys() == expected.keys()
+            for node, value in expected.items():
+                assert betweenness[node] == pytest.approx(value)
+        else:
+            assert betweenness is None
+
+        if nx.is_connected(graph):
+            assert closeness == pytest.approx(nx.closeness_centrality(graph))
+        else:
+            assert closeness is None
+    
+    def test_metrics_cached_by_graph_structure(self, analytics, sample_institutions, sample_goals):
+        """Test identical graphs reuse cached metrics and structural changes recompute them."""
+        graph = analytics.build_goal_institution_graph(sample_institutions, sample_goals)
+        rebuilt = analytics.build_goal_institution_graph(sample_institutions, sample_goals)
+        
+        with patch.object(analytics, '_compute_centrality_metrics', wraps=analytics._compute_centrality_metrics) as compute:
+            first = analytics.calculate_centrality_metrics(graph)
+            first['degree_centrality'].clear()  # Caller mutation must not leak into the cache
+            second = analytics.calculate_centrality_metrics(rebuilt)
+            assert compute.call_count == 1
+            assert second['degree_centrality']
+            
+            rebuilt['inst_inst1']['goal_goal1']['weight'] = 99
+            analytics.calculate_centrality_metrics(rebuilt)
+            assert compute.call_count == 2
+    
+    def test_metrics_cache_accessed_under_lock(self, analytics, sample_institutions, sample_goals):
+        """Test the shared metrics cache is only read and written while its lock is held."""
+        graph = analytics.build_goal_institution_graph(sample_institutions, sample_goals)
+        cache = analytics._metrics_cache
+        
+        def locked(method):
+            def call(*args):
+                assert analytics._metrics_lock.locked()
+                return method(*args)
+            return call
+        
+        with patch.object(cache, 'get', side_effect=locked(cache.get)) as get, \
+                patch.object(cache, 'set', side_effect=locked(cache.set)) as set_:
+            analytics.calculate_centrality_metrics(graph)
+            analytics.calculate_centrality_metrics(graph)
+        
+        assert get.call_count == 2
+        assert set_.call_count == 1
 
 class TestCommunityDetection:
     """Test community detection."""
@@ -595,6 +694,26 @@ class TestCommunityDetection:
             assert 'size' in comm
             assert comm['size'] == len(comm['nodes'])
 
+    
+    def test_louvain_communities_reproducible(self, analytics):
+        """Test seeded Louvain is stable and never mixes connected components."""
+        graph = nx.disjoint_union_all([
+            nx.complete_graph(4),
+            nx.barbell_graph(3, 0),
+            nx.path_graph(2),
+        ])
+        graph.add_node('isolated')
+        
+        result = analytics._compute_communities(graph)
+        
+        assert analytics._compute_communities(graph) == result
+        components = [set(c) for c in nx.connected_components(graph)]
+        for community in result['communities']:
+            assert any(set(community['nodes']) <= component for component in components)
+        assert {'id': result['num_communities'] - 1, 'nodes': ['isolated'], 'size': 1} in result['communities']
+        assert result['modularity'] == pytest.approx(
+            nx.community.modularity(graph, [c['nodes'] for c in result['communities']])
+        )
 
 class TestShortestPath:
     """Test shortest path finding."""
@@ -664,15 +783,24 @@ class TestClusteringCoefficients:
         for coeff in clustering.values():
             assert coeff == 0.0
 
+    def test_clustering_shared_undirected_view(self, analytics):
+        """Test a precomputed undirected view gives the same result as a copy."""
+        graph = nx.DiGraph()
+        graph.add_edges_from([('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'd')])
+
+        view = analytics._as_undirected(graph)
+
+        assert view.is_directed() is False
+        assert analytics.calculate_clustering_coefficients(graph, view) == \
+            nx.clustering(graph.to_undirected())
+
 
 class TestAnalyzeMethod:
     """Test the main analyze method."""
     
     def test_analyze_financial_flow(self, analytics, mock_db_client, sample_transactions, sample_institutions, sample_goals):
         """Test full analysis with financial flow graph."""
-        mock_db_client.get_all_user_transactions.return_value = sample_transactions
-        mock_db_client.get_institutions.return_value = sample_institutions
-        mock_db_client.get_goals.return_value = sample_goals
+        mock_db_client.get_user_financials.return_value = (sample_institutions, sample_transactions, sample_goals)
         
         result = analytics.analyze('user1', '2024-01-01', '2024-01-31', graph_type='financial_flow')
         
@@ -689,9 +817,7 @@ class TestAnalyzeMethod:
     
     def test_analyze_goal_institution(self, analytics, mock_db_client, sample_transactions, sample_institutions, sample_goals):
         """Test full analysis with goal-institution graph (no date filter — all-time)."""
-        mock_db_client.get_all_user_transactions.return_value = sample_transactions
-        mock_db_client.get_institutions.return_value = sample_institutions
-        mock_db_client.get_goals.return_value = sample_goals
+        mock_db_client.get_user_financials.return_value = (sample_institutions, sample_transactions, sample_goals)
 
         # goal_institution does not require dates
         result = analytics.analyze('user1', graph_type='goal_institution')
@@ -701,13 +827,11 @@ class TestAnalyzeMethod:
         assert result['graph_stats']['nodes'] >= 5
         assert 'period' not in result  # no date window for this graph type
         # verify called without date filtering
-        mock_db_client.get_all_user_transactions.assert_called_once_with('user1')
+        mock_db_client.get_user_financials.assert_called_once_with('user1', None, None)
     
     def test_analyze_tag_network(self, analytics, mock_db_client, sample_transactions, sample_institutions, sample_goals):
         """Test full analysis with tag network."""
-        mock_db_client.get_all_user_transactions.return_value = sample_transactions
-        mock_db_client.get_institutions.return_value = sample_institutions
-        mock_db_client.get_goals.return_value = sample_goals
+        mock_db_client.get_user_financials.return_value = (sample_institutions, sample_transactions, sample_goals)
         
         result = analytics.analyze('user1', '2024-01-01', '2024-01-31', graph_type='tag_network')
         
@@ -716,23 +840,65 @@ class TestAnalyzeMethod:
     
     def test_analyze_no_data(self, analytics, mock_db_client):
         """Test analysis with no data."""
-        mock_db_client.get_all_user_transactions.return_value = []
-        mock_db_client.get_institutions.return_value = []
-        mock_db_client.get_goals.return_value = []
+        mock_db_client.get_user_financials.return_value = ([], [], [])
         
         result = analytics.analyze('user1', '2024-01-01', '2024-01-31', graph_type='financial_flow')
         
         assert result['graph_stats']['nodes'] == 0
         assert result['graph_stats']['edges'] == 0
+        assert result['graph_stats']['num_components'] == 0
+        assert result['graph_stats']['is_connected'] is False
+    
+    def test_analyze_empty_graph_skips_metrics(self, analytics, mock_db_client):
+        """Test an empty graph returns the canonical payload without computing metrics."""
+        mock_db_client.get_user_financials.return_value = ([], [], [])
+        
+        with patch.object(analytics, 'calculate_centrality_metrics') as centrality, \
+                patch.object(analytics, 'detect_communities') as communities:
+            result = analytics.analyze('user1', '2024-01-01', '2024-01-31', graph_type='tag_network')
+            result['nodes'].append('mutated')
+            second = analytics.analyze('user1', '2024-01-01', '2024-01-31', graph_type='tag_network')
+        
+        centrality.assert_not_called()
+        communities.assert_not_called()
+        assert second['nodes'] == []
+        assert second['communities'] == {'num_communities': 0, 'communities': [], 'modularity': 0.0}
+        assert second['period'] == {'start': '2024-01-01', 'end': '2024-01-31'}
+    
+    def test_analyze_num_components(self, analytics, mock_db_client, sample_transactions, sample_institutions, sample_goals):
+        """Test graph_stats component count matches NetworkX."""
+        mock_db_client.get_user_financials.return_value = (sample_institutions, sample_transactions, sample_goals)
+        
+        result = analytics.analyze('user1', '2024-01-01', '2024-01-31', graph_type='financial_flow')
+        graph = analytics.build_financial_flow_graph(sample_transactions, sample_institutions, sample_goals)
+        
+        expected = nx.number_weakly_connected_components(graph)
+        assert result['graph_stats']['num_components'] == expected
+        assert result['graph_stats']['is_connected'] == (expected == 1)
     
     def test_analyze_invalid_graph_type(self, analytics, mock_db_client):
         """Test analysis with invalid graph type."""
-        mock_db_client.get_all_user_transactions.return_value = []
-        mock_db_client.get_institutions.return_value = []
-        mock_db_client.get_goals.return_value = []
+        mock_db_client.get_user_financials.return_value = ([], [], [])
         
         with pytest.raises(ValueError):
             analytics.analyze('user1', '2024-01-01', '2024-01-31', graph_type='invalid')
+        
+        mock_db_client.get_user_financials.assert_not_called()
+    
+    def test_analyze_fetches_through_get_user_financials(
+        self, analytics, mock_db_client, sample_transactions, sample_institutions, sample_goals
+    ):
+        """Test the data comes from one get_user_financials call, not separate queries."""
+        mock_db_client.get_user_financials.return_value = (sample_institutions, sample_transactions, sample_goals)
+        
+        result = analytics.analyze('user1', '2024-01-01', '2024-01-31', graph_type='financial_flow')
+        
+        assert result['graph_stats']['nodes'] > 0
+        mock_db_client.get_user_financials.assert_called_once_with(
+            'user1', date_utils.iso_to_timestamp('2024-01-01'), date_utils.iso_to_timestamp('2024-01-31')
+        )
+        mock_db_client.get_institutions.assert_not_called()
+        mock_db_client.get_all_user_transactions.assert_not_called()
 
 
 class TestGraphSerialization:
@@ -782,3 +948,88 @@ class TestGraphSerialization:
         assert 'c' in top_3
         assert 'e' in top_3
         assert list(top_3.keys()) == ['a', 'c', 'e']  # Should be sorted
+
+
+class TestIgraphBackend:
+    """Test the optional igraph metrics backend against NetworkX."""
+    
+    @pytest.fixture
+    def igraph_analytics(self, mock_db_client):
+        """Create network analytics instance using the igraph backend."""
+        pytest.importorskip('igraph')
+        return NetworkAnalytics(mock_db_client, backend='igraph')
+    
+    def test_unknown_backend_rejected(self, mock_db_client):
+        """Test an unsupported backend name raises."""
+        with pytest.raises(ValueError):
+            NetworkAnalytics(mock_db_client, backend='graph-tool')
+    
+    def test_backend_from_environment(self, mock_db_client, monkeypatch):
+        """Test the backend defaults to the NETWORK_BACKEND env variable."""
+        monkeypatch.setenv('NETWORK_BACKEND', 'networkx')
+        assert NetworkAnalytics(mock_db_client).backend == 'networkx'
+    
+    @pytest.mark.parametrize('graph_name', ['goal_institution', 'financial_flow', 'tag_network'])
+    def test_centrality_matches_networkx(
+        self, analytics, igraph_analytics, sample_transactions, sample_institutions, sample_goals, graph_name
+    ):
+        """Test igraph centrality scores match the NetworkX backend."""
+        graph = {
+            'goal_institution': lambda: analytics.build_goal_institution_graph(sample_institutions, sample_goals),
+            'financial_flow': lambda: analytics.build_financial_flow_graph(
+                sample_transactions, sample_institutions, sample_goals
+            ),
+            'tag_network': lambda: analytics.build_tag_network(sample_transactions),
+        }[graph_name]()
+        
+        expected = analytics.calculate_centrality_metrics(graph)
+        actual = igraph_analytics.calculate_centrality_metrics(graph)
+        
+        for metric in ('degree_centrality', 'betweenness_centrality', 'closeness_centrality'):
+            # Top-k selection may break ties differently, so compare scores rather than keys
+            assert sorted(actual[metric].values()) == pytest.approx(sorted(expected[metric].values()))
+            for node in actual[metric].keys() & expected[metric].keys():
+                assert actual[metric][node] == pytest.approx(expected[metric][node])
+    
+    def test_communities_match_networkx(self, analytics, igraph_analytics, sample_institutions, sample_goals):
+        """Test igraph Louvain partitions the same nodes with NetworkX modularity."""
+        graph = analytics.build_goal_institution_graph(sample_institutions, sample_goals)
+        
+        actual = igraph_analytics.detect_communities(graph)
+        partition = [c['nodes'] for c in actual['communities']]
+        
+        assert sorted(node for nodes in partition for node in nodes) == sorted(graph.nodes)
+        assert actual['modularity'] == pytest.approx(nx.community.modularity(graph, partition))
+        assert igraph_analytics._compute_communities(graph) == actual
+    
+    def test_concurrent_communities_deterministic(self, igraph_analytics, monkeypatch):
+        """Test concurrent Louvain runs hold the RNG lock and match a serial run."""
+        import igraph
+        from src.analytics import network
+        
+        graph = nx.karate_club_graph()
+        expected = igraph_analytics._detect_communities_igraph(graph)
+        
+        multilevel = igraph.Graph.community_multilevel
+        
+        def locked_multilevel(self, *args, **kwargs):
+            assert network._IGRAPH_RNG_LOCK.locked()
+            return multilevel(self, *args, **kwargs)
+        monkeypatch.setattr(igraph.Graph, 'community_multilevel', locked_multilevel)
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(igraph_analytics._detect_communities_igraph, [graph] * 16))
+        
+        assert all(result == expected for result in results)
+    
+    def test_igraph_edgeless_graph(self, igraph_analytics):
+        """Test igraph backend handles graphs without edges like NetworkX."""
+        graph = nx.Graph()
+        graph.add_nodes_from(['a', 'b'])
+        
+        communities = igraph_analytics.detect_communities(graph)
+        centrality = igraph_analytics.calculate_centrality_metrics(graph)
+        
+        assert communities['num_communities'] == 0
+        assert centrality['degree_centrality'] == {'a': 0.0, 'b': 0.0}
+        assert centrality['closeness_centrality'] == {}
@@ -0,0 +1,57 @@
+"""Tests for tracing utilities module."""
+
+import pytest
+from unittest.mock import Mock
+
+from src.utils import tracing
+
+
+class TestTraced:
+    """Test the X-Ray tracing decorator."""
+    
+    def test_noop_without_sdk(self, monkeypatch):
+        """Test functions are returned unchanged when the SDK is missing."""
+        monkeypatch.setattr(tracing, 'xray_recorder', None)
+        monkeypatch.setenv('AWS_XRAY_DAEMON_ADDRESS', '127.0.0.1:2000')
+        
+        def func():
+            return 1
+        
+        assert tracing.traced('name')(func) is func
+    
+    def test_noop_without_daemon(self, monkeypatch):
+        """Test functions are returned unchanged when Lambda tracing is off."""
+        monkeypatch.setattr(tracing, 'xray_recorder', Mock())
+        monkeypatch.delenv('AWS_XRAY_DAEMON_ADDRESS', raising=False)
+        
+        def func():
+            return 1
+        
+        assert tracing.traced('name')(func) is func
+    
+    def test_captures_when_enabled(self, monkeypatch):
+        """Test functions are wrapped in a named subsegment when tracing is on."""
+        recorder = Mock()
+        monkeypatch.setattr(tracing, 'xray_recorder', recorder)
+        monkeypatch.setenv('AWS_XRAY_DAEMON_ADDRESS', '127.0.0.1:2000')
+        
+        def func():
+            return 1
+        
+        wrapped = tracing.traced('dynamodb.get_goals')(func)
+        
+        recorder.capture.assert_called_once_with('dynamodb.get_goals')
+        assert wrapped is recorder.capture.return_value.return_value
+    
+    def test_patch_aws_clients_once(self, monkeypatch):
+        """Test boto3/botocore are patched a single time."""
+        patch = Mock()
+        monkeypatch.setattr(tracing, 'patch', patch)
+        monkeypatch.setattr(tracing, 'xray_recorder', Mock())
+        monkeypatch.setattr(tracing, '_patched', False)
+        monkeypatch.setenv('AWS_XRAY_DAEMON_ADDRESS', '127.0.0.1:2000')
+        
+        tracing.patch_aws_clients()
+        tracing.patch_aws_clients()
+        
+        patch.assert_called_once_with(('boto3', 'botocore'))
@@ -1,8 +1,11 @@
 """Tests for visualization modules."""
 
 import pytest
+import numpy as np
 from unittest.mock import Mock, patch, MagicMock
+import networkx as nx
 import plotly.graph_objects as go
+from datetime import datetime, timedelta, timezone
 
 from src.visualization.charts import ChartGenerator
 from src.visualization.reports import ReportGenerator
@@ -154,6 +157,102 @@ class TestChartGenerator:
         assert len(fig.data) == 2
         assert fig.data[0].stackgroup == 'one'
     
+    def test_long_series_use_webgl(self, chart_gen):
+        """Test long line/area series switch to Scattergl; short ones stay SVG."""
+        x_axis = list(range(6000))
+        data = {'Balance': [float(i) for i in x_axis]}
+        
+        line = chart_gen.create_line_chart(data=data, x_axis=x_axis, title='Long')
+        area = chart_gen.create_area_chart(data=data, x_axis=x_axis, title='Long')
+        stacked = chart_gen.create_area_chart(data=data, x_axis=x_axis, title='Long', stacked=True)
+        short = chart_gen.create_line_chart(data={'A': [1, 2]}, x_axis=['a', 'b'], title='Short')
+        
+        assert line.data[0].type == 'scattergl'
+        assert line.data[0].mode == 'lines'
+        assert area.data[0].type == 'scattergl'
+        assert stacked.data[0].type == 'scatter'
+        assert short.data[0].type == 'scatter'
+        assert short.data[0].mode == 'lines+markers'
+    
+    def test_array_and_column_inputs(self, chart_gen):
+        """Test NumPy arrays are accepted and missing values become gaps."""
+        values = np.array([500.0, 200.0, 150.0])
+        
+        bar = chart_gen.create_bar_chart(categories=['A', 'B', 'C'], values=values, title='Bar')
+        line = chart_gen.create_line_chart(
+            data={'Balance': [1, None, 3]}, x_axis=['Jan', 'Feb', 'Mar'], title='Line'
+        )
+        heatmap = chart_gen.create_heatmap(
+            z_data=np.array([[1.0, 2.0], [3.0, 4.0]]), x_labels=['a', 'b'], y_labels=['c', 'd']
+        )
+        sankey = chart_gen.create_sankey_diagram(
+            sources=np.array(['Income', 'Income']), targets=np.array(['Rent', 'Food']),
+            values=values[:2], title='Flow'
+        )
+        
+        assert list(bar.data[0].y) == [500.0, 200.0, 150.0]
+        assert bar.data[0].text == ('$500.00', '$200.00', '$150.00')
+        assert np.isnan(line.data[0].y[1])
+        assert heatmap.data[0].z.shape == (2, 2)
+        assert list(sankey.data[0].node.label) == ['Income', 'Rent', 'Food']
+    
+    def test_resample_keeps_extremes(self, chart_gen):
+        """Test resample=True downsamples long series but keeps spikes and endpoints."""
+        x_axis = np.arange(20000)
+        values = np.zeros(20000)
+        values[12345] = 99.0
+        
+        fig = chart_gen.create_area_chart(
+            data={'A': values, 'B': values * 2}, x_axis=x_axis, title='Long', stacked=True, resample=True
+        )
+        
+        assert len(fig.data[0].x) < 5000
+        assert list(fig.data[0].x) == list(fig.data[1].x)
+        assert fig.data[0].x[0] == 0 and fig.data[0].x[-1] == 19999
+        assert max(fig.data[0].y) == 99.0
+    
+    def test_resample_keeps_line_mode_of_full_series(self, chart_gen):
+        """Test a resampled long line keeps the marker-free mode of the full series."""
+        x_axis = np.arange(20000)
+        values = np.sin(x_axis / 100.0)
+        
+        full = chart_gen.create_line_chart(data={'A': values}, x_axis=x_axis, title='Long')
+        resampled = chart_gen.create_line_chart(data={'A': values}, x_axis=x_axis, title='Long', resample=True)
+        
+        assert len(resampled.data[0].x) < 5000
+        assert resampled.data[0].mode == full.data[0].mode == 'lines'
+        assert resampled.data[0].type == full.data[0].type == 'scattergl'
+    
+    def test_resample_series_shorter_than_x_axis(self, chart_gen):
+        """Test a series shorter than x_axis is resampled within its own length."""
+        x_axis = np.arange(20000)
+        short = np.arange(6000, dtype=float)
+        
+        fig = chart_gen.create_line_chart(
+            data={'Long': np.zeros(20000), 'Short': short}, x_axis=x_axis, title='Mixed', resample=True
+        )
+        
+        long_trace, short_trace = fig.data
+        assert len(short_trace.y) < len(long_trace.y)
+        # Each kept value still pairs with its own x position
+        assert list(short_trace.y) == [float(x) for x in long_trace.x[:len(short_trace.y)]]
+        assert short_trace.y[-1] == 5999.0
+    
+    def test_resample_short_series_unchanged(self, chart_gen):
+        """Test resample=True leaves series under the threshold intact."""
+        fig = chart_gen.create_line_chart(data={'A': [1, 2, 3]}, x_axis=['a', 'b', 'c'], title='Short', resample=True)
+        
+        assert list(fig.data[0].y) == [1.0, 2.0, 3.0]
+    
+    def test_webgl_disabled(self):
+        """Test webgl_min_points=None keeps SVG traces for any length."""
+        chart_gen = ChartGenerator(webgl_min_points=None)
+        x_axis = list(range(2000))
+        
+        fig = chart_gen.create_line_chart(data={'A': x_axis}, x_axis=x_axis, title='Long')
+        
+        assert fig.data[0].type == 'scatter'
+    
     def test_create_scatter_plot(self, chart_gen):
         """Test scatter plot creation."""
         x_data = [100, 200, 300, 400]
@@ -194,6 +293,20 @@ class TestChartGenerator:
         assert len(fig.data) == 1
         assert list(fig.data[0].x) == x_labels
         assert list(fig.data[0].y) == y_labels
+        assert list(fig.data[0].text[1]) == ['$15.00', '$25.00', '$35.00']
+    
+    def test_create_heatmap_large_skips_labels(self, chart_gen):
+        """Test heatmaps above the label limit render without cell text."""
+        z_data = np.ones((60, 60))
+        
+        fig = chart_gen.create_heatmap(
+            z_data=z_data,
+            x_labels=[str(i) for i in range(60)],
+            y_labels=[str(i) for i in range(60)]
+        )
+        
+        assert fig.data[0].text is None
+        assert fig.data[0].texttemplate is None
     
     def test_create_network_graph_empty(self, chart_gen):
         """Test network graph with no data."""
@@ -227,6 +340,23 @@ class TestChartGenerator:
         # Should have edge traces + node traces (one per type)
         assert len(fig.data) >= 2
     
+    def test_network_layout_cached(self, chart_gen):
+        """Test repeated graphs reuse the spring layout; changed weights recompute it."""
+        nodes = [{'id': n, 'attributes': {'type': 'category', 'name': n}} for n in ('a', 'b', 'c')]
+        edges = [
+            {'source': 'a', 'target': 'b', 'attributes': {'weight': 1.0}},
+            {'source': 'b', 'target': 'c', 'attributes': {'weight': 2.0}}
+        ]
+        
+        with patch('src.visualization.charts.nx.spring_layout', wraps=nx.spring_layout) as layout:
+            first = chart_gen.create_network_graph(nodes=nodes, edges=edges)
+            second = chart_gen.create_network_graph(nodes=list(reversed(nodes)), edges=edges)
+            edges[1]['attributes']['weight'] = 3.0
+            chart_gen.create_network_graph(nodes=nodes, edges=edges)
+        
+        assert layout.call_count == 2
+        assert set(first.data[-1].x) == set(second.data[-1].x)
+    
     def test_create_gauge_chart(self, chart_gen):
         """Test gauge chart creation."""
         fig = chart_gen.create_gauge_chart(
@@ -545,6 +675,7 @@ class TestS3Uploader:
         mock_client = Mock()
         mock_client.upload_file = Mock()
         mock_client.put_object = Mock()
+        mock_client.upload_fileobj = Mock()
         mock_client.generate_presigned_url = Mock(return_value='https://example.com/presigned')
         mock_client.list_objects_v2 = Mock(return_value={'Contents': []})
         mock_client.delete_object = Mock()
@@ -571,7 +702,9 @@ class TestS3Uploader:
         assert result['bucket'] == 'test-bucket'
         assert result['key'] == 'test.html'
         assert 'url' in result
-        mock_s3_client.put_object.assert_called_once()
+        mock_s3_client.upload_fileobj.assert_called_once()
+        body = mock_s3_client.upload_fileobj.call_args[0][0]
+        assert body.getvalue() == b'<html>Test</html>'
     
     def test_generate_presigned_url(self, uploader, mock_s3_client):
         """Test presigned URL generation."""
@@ -606,6 +739,66 @@ class TestS3Uploader:
         assert 'reports' in result['key']
         assert 'presigned_url' in result
     
+    def test_upload_report_pre_encoded(self, uploader, mock_s3_client):
+        """Test a pre-gzipped report body is uploaded as-is."""
+        import gzip
+        body = gzip.compress(b'<html>Report</html>')
+        
+        result = uploader.upload_report(
+            html_content=body,
+            user_id='user123',
+            report_type='comprehensive',
+            content_encoding='gzip'
+        )
+        
+        args, kwargs = mock_s3_client.upload_fileobj.call_args
+        assert args[0].getvalue() == body
+        assert kwargs['ExtraArgs']['ContentEncoding'] == 'gzip'
+        assert kwargs['ExtraArgs']['Metadata']['report_type'] == 'comprehensive'
+        assert 'presigned_url' in result
+    
+    def test_get_cached_report_fresh(self, uploader, mock_s3_client):
+        """Test a recently cached report is returned with a presigned URL."""
+        mock_s3_client.head_object = Mock(return_value={
+            'LastModified': datetime.now(timezone.utc) - timedelta(minutes=5)
+        })
+        
+        result = uploader.get_cached_report('abc123', max_age_seconds=3600)
+        
+        assert result['key'] == 'reports/cache/abc123.html'
+        assert result['presigned_url'] == 'https://example.com/presigned'
+    
+    def test_get_cached_report_stale(self, uploader, mock_s3_client):
+        """Test a cached report older than the TTL is ignored."""
+        mock_s3_client.head_object = Mock(return_value={
+            'LastModified': datetime.now(timezone.utc) - timedelta(hours=2)
+        })
+        
+        assert uploader.get_cached_report('abc123', max_age_seconds=3600) is None
+        mock_s3_client.generate_presigned_url.assert_not_called()
+    
+    def test_get_cached_report_missing(self, uploader, mock_s3_client):
+        """Test a missing cache object is a miss, not an error."""
+        from botocore.exceptions import ClientError
+        mock_s3_client.head_object = Mock(side_effect=ClientError(
+            {'Error': {'Code': '404', 'Message': 'Not Found'}},
+            'HeadObject'
+        ))
+        
+        assert uploader.get_cached_report('abc123', max_age_seconds=3600) is None
+    
+    def test_cache_report_copies_server_side(self, uploader, mock_s3_client):
+        """Test caching copies the uploaded object instead of re-uploading it."""
+        mock_s3_client.copy_object = Mock()
+        
+        uploader.cache_report('reports/user123/2024/01/01/cash_flow_report_1.html', 'abc123')
+        
+        mock_s3_client.copy_object.assert_called_once_with(
+            Bucket='test-bucket',
+            Key='reports/cache/abc123.html',
+            CopySource={'Bucket': 'test-bucket', 'Key': 'reports/user123/2024/01/01/cash_flow_report_1.html'}
+        )
+    
     def test_list_user_reports(self, uploader, mock_s3_client):
         """Test listing user reports."""
         mock_s3_client.list_objects_v2.return_value = {